@@ -4,8 +4,14 @@ Point d’entrée de l’application.
 
 - Ajoute le dossier src/ au sys.path pour permettre les imports "ui.*", "core.*", "utils.*", "io_.*"
 - Lance la fenêtre principale (MainWindow)
+- `--headless` : moteur OSC seul, sans Tk ni ui.* (serveurs, machines sans écran)
+- `--bench` : benchmarks hors ligne des chemins chauds (résultats JSON)
+- `--loadgen` : remplaçant local de Max (charge + latence de bout en bout)
+- `--record FILE` / `--replay FILE` : journal binaire du trafic OSC (enregistrement / rejeu)
+- `--alloc-profile` : allocations par phase de tick + pauses GC (tracemalloc)
 """
 
+import argparse
 import sys
 from pathlib import Path
 
@@ -15,8 +21,71 @@ src_path = here.parent / 'src'
 if str(src_path) not in sys.path:
     sys.path.insert(0, str(src_path))
 
-# Démarrer l'app
-from ui.main_window import run_app
+# Chronométrage du démarrage (t0 = ici) ; rapport loggé à la première frame
+from utils.startup import startup
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="InterfaceShowbuddy — Lighting Viz")
+    parser.add_argument("--headless", action="store_true", help="moteur OSC sans interface (pas de Tk)")
+    parser.add_argument("--mode", choices=("read", "write"), help="mode initial (headless)")
+    parser.add_argument("--cue", type=int, help="cue à rappeler au démarrage (headless)")
+    parser.add_argument("--tick-hz", type=float, help="fréquence de l'horloge headless (défaut: max_rate_hz)")
+    parser.add_argument("--playback", metavar="FILE", help="rejoue un enregistrement de show dans l'état (headless)")
+    parser.add_argument("--playback-speed", type=float, default=1.0, help="vitesse de lecture (headless)")
+    parser.add_argument("--record", metavar="FILE", help="enregistre le trafic OSC reçu/envoyé (journal binaire)")
+    parser.add_argument("--replay", metavar="FILE", help="rejoue un journal à la place de l'écoute OSC")
+    parser.add_argument("--replay-speed", type=float,
+                        help="vitesse de rejeu : 1 = temps réel, 0 = aussi vite que possible")
+    parser.add_argument("--alloc-profile", action="store_true",
+                        help="profil d'allocations par phase de tick et pauses GC (lent)")
+    parser.add_argument("--bench", action="store_true", help="benchmarks hors ligne (encode, decode, drain, render…)")
+    parser.add_argument("--bench-fixtures", help="nombres de fixtures, ex. 4,20,100 (bench)")
+    parser.add_argument("--bench-out", default="bench_output.json", help="fichier JSON de résultats (bench)")
+    parser.add_argument("--bench-compare", help="JSON d'un run précédent à comparer (bench)")
+    parser.add_argument("--bench-workers", help="nombres de processus de l'étage réparti, ex. 1,2,4 (bench)")
+    parser.add_argument("--loadgen", action="store_true", help="générateur de charge local (remplace Max)")
+    parser.add_argument("--fixtures", type=int, default=20, help="nombre de fixtures envoyées (loadgen)")
+    parser.add_argument("--rate", type=float, default=60.0, help="frames/s envoyées (loadgen)")
+    parser.add_argument("--duration", type=float, default=10.0, help="durée du test en s (loadgen)")
+    parser.add_argument("--messages", choices=("frame", "fixture"), default="frame",
+                        help="/frame groupés ou messages /fixture/<id>/* (loadgen)")
+    parser.add_argument("--loadgen-out", help="fichier JSON du rapport (loadgen)")
+    return parser.parse_args(argv)
+
 
 if __name__ == '__main__':
-    run_app()
\ No newline at end of file
+    args = parse_args()
+    if args.bench:
+        from tools.bench import main as bench_main
+        counts = [int(x) for x in args.bench_fixtures.split(",")] if args.bench_fixtures else None
+        workers = [int(x) for x in args.bench_workers.split(",")] if args.bench_workers else None
+        sys.exit(bench_main(counts, args.bench_out, args.bench_compare, workers))
+    elif args.loadgen:
+        from core.config import load_io_config
+        from tools.loadgen import main as loadgen_main
+        sys.exit(loadgen_main(load_io_config(), args.fixtures, args.rate, args.duration,
+                              args.messages, args.loadgen_out))
+
+    if args.record or args.replay:
+        from core.config import set_io_overrides
+        set_io_overrides(traffic={"record": args.record, "replay": args.replay, "replay_speed": args.replay_speed})
+
+    if args.alloc_profile:
+        from utils.alloc_profile import alloc_profiler
+        alloc_profiler.enable()
+
+    if args.headless:
+        # Import local : le mode headless ne doit jamais charger tkinter
+        with startup.phase("imports"):
+            from core.headless import run_headless
+        run_headless(mode=args.mode, cue=args.cue, tick_hz=args.tick_hz,
+                     playback=args.playback, playback_speed=args.playback_speed)
+    else:
+        # Démarrer l'app
+        with startup.phase("imports"):
+            from ui.main_window import run_app
+        run_app()
+
+    if args.alloc_profile:
+        alloc_profiler.dump()
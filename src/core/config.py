@@ -0,0 +1,108 @@
+# fichier: src/core/config.py
+"""
+Chargement des fichiers de config/ (io.yml, fixtures.yml).
+Aucune dépendance UI : utilisé par MainWindow et par le mode headless.
+"""
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+CONFIG_DIR = ROOT / "config"
+
+# Surcharges de la ligne de commande (app.py --record / --replay), appliquées par load_io_config
+_io_overrides: dict = {}
+
+
+def set_io_overrides(**sections) -> None:
+    """Ex. set_io_overrides(traffic={"record": "osc.log"}) : fusionné dans la section de io.yml."""
+    for name, values in sections.items():
+        _io_overrides.setdefault(name, {}).update({k: v for k, v in values.items() if v is not None})
+
+
+def _read_yaml(path: Path) -> dict:
+    # Import local + CSafeLoader (libyaml) si disponible : chargement plus rapide
+    import yaml
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with path.open("r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=loader) or {}
+
+
+def load_io_config() -> dict:
+    cfg = _load_io_file()
+    for name, values in _io_overrides.items():
+        cfg[name] = {**(cfg.get(name) or {}), **values}
+    return cfg
+
+
+def _load_io_file() -> dict:
+    path = CONFIG_DIR / "io.yml"
+    defaults = {"listen_port": 9000, "send_port": 9001, "remote_ip": "127.0.0.1", "max_rate_hz": 60}
+    try:
+        if path.exists():
+            data = _read_yaml(path)
+            return {
+                "listen_port": int(data.get("listen_port", defaults["listen_port"])),
+                "send_port": int(data.get("send_port", defaults["send_port"])),
+                "remote_ip": str(data.get("remote_ip", defaults["remote_ip"])),
+                "max_rate_hz": int(data.get("max_rate_hz", defaults["max_rate_hz"])),
+                "min_rate_hz": int(data.get("min_rate_hz", 20)),
+                "io_process": bool(data.get("io_process", False)),
+                "io_process_capacity": int(data.get("io_process_capacity", 1024)),
+                "source_timeout_ms": int(data.get("source_timeout_ms", 3000)),
+                "jitter_latency_ms": int(data.get("jitter_latency_ms", 40)),
+                "multicast": data.get("multicast") or {},
+                "mirror": data.get("mirror") or {},
+                "heartbeat_ms": int(data.get("heartbeat_ms", 1000)),
+                "idle": data.get("idle") or {},
+                "traffic": data.get("traffic") or {},
+                "state_sync": data.get("state_sync") or {},
+            }
+        else:
+            return defaults
+    except Exception:
+        return defaults
+
+
+def _recorder_config(cfg) -> dict:
+    cfg = dict(cfg or {})
+    cfg["dir"] = str(ROOT / cfg.get("dir", "shows/recordings"))
+    return cfg
+
+
+def _pixelmap_config(cfg) -> dict:
+    cfg = dict(cfg or {})
+    if cfg.get("source"):
+        cfg["source"] = str(ROOT / cfg["source"])
+    return cfg
+
+
+def load_fixtures_config() -> dict:
+    path = CONFIG_DIR / "fixtures.yml"
+    defaults = {
+        "count": 4,
+        "defaults": {"color": [0, 0, 0, 0, 0], "dimmer": 0.0, "strobe": 0.0},
+        "show_file": str(ROOT / "shows" / "default.show"),
+        "output": {},
+        "groups": {},
+    }
+    try:
+        if path.exists():
+            data = _read_yaml(path)
+            fx = data.get("fixtures", {}) or {}
+            return {
+                "count": int(fx.get("count", defaults["count"])),
+                "defaults": fx.get("defaults", defaults["defaults"]) or defaults["defaults"],
+                "show_file": str(ROOT / data.get("show_file", "shows/default.show")),
+                "output": data.get("output") or {},
+                "groups": data.get("groups") or {},
+                "recorder": _recorder_config(data.get("recorder")),
+                "fixture_profiles": data.get("fixture_profiles") or {},
+                "patch": data.get("patch") or {},
+                "pixelmap": _pixelmap_config(data.get("pixelmap")),
+                "sharding": data.get("sharding") or {},
+                "history": data.get("history") or {},
+            }
+        else:
+            return defaults
+    except Exception:
+        return defaults
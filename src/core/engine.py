@@ -0,0 +1,464 @@
+# fichier: src/core/engine.py
+
+import queue
+import time
+from typing import Callable, List, Optional, Tuple
+
+from utils.log import ErrorAggregator, get_logger
+from io_.osc_client import OscClient  # IMPORTANT : 'io_' (et non 'io')
+from io_.state_sync import SyncTracker
+from .modes import WRITE, normalize_mode
+from .state import AppState, FixtureState, FRAME_STRIDE
+from .showfile import CueLibrary
+from .output import OutputProcessor
+from .masters import MasterSection
+from .merge import MergeEngine
+from .jitter import JitterBuffer, rows
+from .idle import IdleWatchdog
+from .profiles import Rig
+
+logger = get_logger(__name__)
+
+FIXTURE_COUNT_MIN = 4
+FIXTURE_COUNT_MAX = 20
+
+
+class Engine:
+    """
+    Cœur de l'application, sans aucune dépendance UI :
+    - AppState + OscClient + bibliothèque de cues
+    - drain_events() applique les événements OSC à l'état
+    - send_output() envoie un /frame en WRITE (throttle côté OscClient)
+
+    Utilisé par MainWindow (Tk) et par le mode headless.
+    """
+
+    def __init__(self, io_cfg: dict, fx_cfg: dict):
+        self.io_cfg = io_cfg
+        self.fx_cfg = fx_cfg
+
+        self.state = AppState()
+        self.event_queue: queue.Queue = queue.Queue()
+
+        # Bibliothèque de cues (fichier show mmappé)
+        self.cues = CueLibrary(fx_cfg["show_file"])
+        try:
+            self.cues.open()
+        except Exception as e:
+            logger.error("Show file load failed: %s", e)
+
+        # Client OSC (dans ce processus, ou dans un processus enfant via mémoire partagée)
+        self._io_process = bool(io_cfg.get("io_process", False))
+        if self._io_process:
+            # Import local : multiprocessing/shared_memory seulement si l'option est active
+            from io_.osc_process import OscProcessClient
+            self.osc = OscProcessClient(
+                listen_port=io_cfg["listen_port"],
+                remote_ip=io_cfg["remote_ip"],
+                send_port=io_cfg["send_port"],
+                event_queue=self.event_queue,
+                capacity=io_cfg.get("io_process_capacity", 1024),
+                source_timeout_ms=io_cfg.get("source_timeout_ms", 3000),
+                jitter_latency_ms=io_cfg.get("jitter_latency_ms", 40),
+                multicast=io_cfg.get("multicast"),
+                traffic=io_cfg.get("traffic"),
+            )
+        else:
+            self.osc = OscClient(
+                listen_port=io_cfg["listen_port"],
+                remote_ip=io_cfg["remote_ip"],
+                send_port=io_cfg["send_port"],
+                event_queue=self.event_queue,
+                multicast=io_cfg.get("multicast"),
+                traffic=io_cfg.get("traffic"),
+            )
+        self._inbound_version = 0
+        self._inbound_msgs = 0
+        # Synchro d'état en bloc (/state/query ↔ /state/chunk), à la connexion ou sur demande
+        sync_cfg = io_cfg.get("state_sync") or {}
+        self._sync_on_connect = bool(sync_cfg.get("on_connect", True))
+        self._sync_chunk_bytes = int(sync_cfg.get("chunk_bytes", 1400))
+        self._sync_id = 0
+        self._sync_tracker = SyncTracker()
+        # Fusion HTP (dimmer) / LTP (couleur, strobe) des différentes sources OSC
+        self.merge = MergeEngine.from_config(io_cfg)
+        # /frame horodatés : réordonnés par t et interpolés à latence fixe (jitter_latency_ms)
+        self.jitter = JitterBuffer.from_config(io_cfg)
+        # Fréquence d'envoi : adaptée entre min_rate_hz et max_rate_hz selon la contre-pression
+        try:
+            self.osc._max_rate_hz = int(io_cfg.get("max_rate_hz", 60))
+            self.osc._min_rate_hz = min(int(io_cfg.get("min_rate_hz", 20)), self.osc._max_rate_hz)
+        except Exception:
+            self.osc._max_rate_hz = 60
+            self.osc._min_rate_hz = 20
+
+        # Masters de groupes + grand master (sortie uniquement)
+        self.masters = MasterSection.from_config(fx_cfg.get("groups"))
+
+        # Étage de sortie (courbes, gamma, limites, quantification) entre build_frame et send_frame
+        try:
+            sharding_cfg = fx_cfg.get("sharding") or {}
+            if sharding_cfg.get("enabled"):
+                # Import local : pool de processus seulement pour les très grands rigs
+                from .shard import ShardedOutput
+                self.output = ShardedOutput.from_config(fx_cfg.get("output"), sharding_cfg)
+            else:
+                self.output = OutputProcessor.from_config(fx_cfg.get("output"))
+        except Exception as e:
+            logger.error("Output profiles invalid, output left unprocessed: %s", e)
+            self.output = OutputProcessor.from_config(None)
+
+        # Profils de fixtures + patch DMX (optionnel) : /frame → univers /dmx/<u>
+        try:
+            self.rig = Rig.from_config(fx_cfg.get("fixture_profiles"), fx_cfg.get("patch"))
+        except Exception as e:
+            logger.error("Fixture profiles/patch invalid, DMX output disabled: %s", e)
+            self.rig = None
+
+        self.frames_sent = 0
+        # Échec d'envoi répété à chaque tick : une ligne, puis un résumé par intervalle
+        self._errors = ErrorAggregator(lambda message, _count: logger.error(message))
+
+        # Heartbeat + veille : connected retombe sans /app/hello, sortie coupée/ralentie au repos
+        self.idle = IdleWatchdog.from_config(io_cfg)
+        # Réveil immédiat de l'horloge sur datagramme reçu en veille (thread OSC → scheduler.wake)
+        self.on_wake: Optional[Callable[[], None]] = None
+        self.osc.on_input = self._on_osc_input
+
+        # Miroir WebSocket/HTTP pour tableaux de bord navigateur (optionnel)
+        self.mirror = None
+        mirror_cfg = io_cfg.get("mirror") or {}
+        if mirror_cfg.get("enabled"):
+            # Import local : asyncio seulement si le miroir est activé
+            from io_.ws_mirror import StateMirror
+            self.mirror = StateMirror.from_config(mirror_cfg)
+
+        # Enregistreur de show (frames WRITE, colonnes compressées) et lecture d'un enregistrement
+        self.recorder = None
+        self.player = None
+        recorder_cfg = fx_cfg.get("recorder") or {}
+        if recorder_cfg.get("enabled"):
+            from .recorder import ShowRecorder
+            self.recorder = ShowRecorder.from_config(recorder_cfg)
+
+        # Pixel-mapping (vidéo brute / suite d'images → couleur des fixtures), optionnel
+        self.pixelmap = None
+        pixelmap_cfg = fx_cfg.get("pixelmap") or {}
+        if pixelmap_cfg.get("enabled"):
+            try:
+                from .pixelmap import PixelMapper
+                self.pixelmap = PixelMapper.from_config(pixelmap_cfg)
+            except Exception as e:
+                logger.error("Pixel-map source invalid, pixel-mapping disabled: %s", e)
+
+        # Pré-allouer des fixtures (la grille s'affiche avant même que l'OSC démarre)
+        self.ensure_fixture_count(int(fx_cfg.get("count", FIXTURE_COUNT_MIN)))
+
+    # ----------------------------------------------------------------------
+    # Démarrage / arrêt
+    # ----------------------------------------------------------------------
+    def start(self):
+        self.osc.start()
+        # READY + mode initial
+        self.osc.send_app_ready()
+        self.osc.send_mode(self.state.mode)
+        if self.mirror is not None:
+            self.mirror.start()
+        if self.recorder is not None:
+            try:
+                self.recorder.start()
+            except Exception as e:
+                logger.error("Show recorder start failed: %s", e)
+                self.recorder = None
+        if hasattr(self.output, "start"):
+            try:
+                self.output.start()
+            except Exception as e:
+                logger.error("Output sharding start failed, processing inline: %s", e)
+                self.output.close()
+
+    def stop(self):
+        try:
+            self.osc.stop()
+        except Exception:
+            pass
+        if self.mirror is not None:
+            self.mirror.stop()
+        if self.recorder is not None:
+            self.recorder.stop()
+        if hasattr(self.output, "close"):
+            self.output.close()
+        if self.player is not None:
+            self.player.recording.close()
+            self.player = None
+        if self.pixelmap is not None:
+            self.pixelmap.close()
+            self.pixelmap = None
+        self.cues.close()
+
+    # ----------------------------------------------------------------------
+    # Événements entrants
+    # ----------------------------------------------------------------------
+    def drain_events(self, on_fixture_changed: Optional[Callable[[int, FixtureState], None]] = None):
+        """
+        Vide la file d'événements OSC et les applique à l'état.
+        on_fixture_changed(fid, fx) est appelé pour chaque fixture modifiée.
+        """
+        state = self.state
+        merge = self.merge
+        jitter = self.jitter
+        active = False              # entrée reçue ce tick (hors heartbeat) : réveille la veille
+        self.osc.flush_errors()
+        self._errors.flush()
+        if self._io_process:
+            active = self._pull_shared_state(on_fixture_changed)
+        try:
+            while True:
+                etype, payload = self.event_queue.get_nowait()
+
+                if etype == "hello":
+                    if not state.connected and self._sync_on_connect:
+                        self._on_connect()
+                    state.connected = True
+                    state.last_hello_ts = time.monotonic()
+                    self.idle.note_hello()
+                    state.on_msg_received()
+                    continue
+
+                elif etype == "error":
+                    msg = payload.get("message", "")
+                    state.last_error = msg
+                    logger.error("OSC error: %s", msg)
+
+                elif etype == "state_query":
+                    n = self.push_state()
+                    logger.info("State query from %s: %d chunks sent", payload.get("src", "?"), n)
+
+                elif etype == "state_chunk":
+                    src = payload.get("src", "")
+                    for fid, row in payload["fixtures"]:
+                        merge.feed_values(src, int(fid), row)
+                    done, dropped = self._sync_tracker.add(
+                        src, payload["sync"], payload["seq"], payload["total"],
+                        payload.get("count", len(payload["fixtures"])))
+                    if dropped is not None:
+                        sync_id, received, total = dropped
+                        logger.warning("State sync %s from %s incomplete: %d/%d chunks", sync_id, src,
+                                       received, total)
+                    if done is not None:
+                        logger.info("State sync %s from %s: %d fixtures in %d chunks (%.1f ms)",
+                                    done[0], src, done[2], done[1], done[3] * 1000)
+
+                elif etype == "fixture_color":
+                    merge.feed_color(payload.get("src", ""), int(payload["id"]),
+                                     (payload["r"], payload["g"], payload["b"], payload["a"], payload["w"]))
+
+                elif etype == "fixture_dimmer":
+                    merge.feed_dimmer(payload.get("src", ""), int(payload["id"]), payload["value"])
+
+                elif etype == "fixture_strobe":
+                    merge.feed_strobe(payload.get("src", ""), int(payload["id"]), payload["rate"])
+
+                elif etype == "metrics":
+                    # Métriques d'envoi publiées par OscClient (pas un message reçu)
+                    state.out_rate_hz = payload["rate_hz"]
+                    state.out_effective_hz = payload["effective_hz"]
+                    state.out_drops = payload["drops"]
+                    continue
+
+                elif etype == "replay_done":
+                    logger.info("OSC replay finished: %d datagrams from %s", payload["count"], payload["path"])
+                    continue
+
+                elif etype == "fixture_param":
+                    if self.rig is not None:
+                        self.rig.set_extra(int(payload["id"]), payload["name"], payload["value"])
+
+                elif etype == "dmx":
+                    if self.rig is not None:
+                        src = payload.get("src", "")
+                        decoded = self.rig.decode(int(payload["universe"]), payload["data"], self._current_values)
+                        for fid, row in decoded.items():
+                            merge.feed_values(src, fid, row)
+
+                elif etype == "master":
+                    self.masters.set_level(str(payload["name"]), payload["value"])
+
+                elif etype == "frame":
+                    src = payload.get("src", "")
+                    if jitter.enabled and jitter.push(src, float(payload.get("t", 0.0)), payload.get("fixtures", [])):
+                        state.on_msg_received()
+                        active = True
+                        continue
+                    for item in payload.get("fixtures", []):
+                        merge.feed_values(src, int(item["id"]), (
+                            item["r"], item["g"], item["b"], item["a"], item["w"], item["dimmer"], item["strobe"]
+                        ))
+
+                state.on_msg_received()
+                active = True
+        except queue.Empty:
+            pass
+
+        # Frames tamponnées : état interpolé à now - latence
+        if jitter.enabled:
+            for src, (ids, values) in jitter.sample().items():
+                for fid, row in rows(ids, values):
+                    merge.feed_values(src, fid, row)
+
+        # Une fusion par tick, sur les seules fixtures touchées (ou dont une source a expiré)
+        for fid, values in merge.merge(self._current_values).items():
+            fx = state.ensure_fixture(fid)
+            fx.set_values(values)
+            if on_fixture_changed:
+                on_fixture_changed(fid, fx)
+
+        # Lecture d'un enregistrement : appliquée après l'OSC (la lecture a la priorité)
+        if self.player is not None:
+            self.player.tick(state, on_fixture_changed)
+            active = active or self.player.playing
+
+        # Pixel-mapping : couleur de l'image courante, en dernier (a la priorité sur r, g, b)
+        if self.pixelmap is not None:
+            try:
+                self.pixelmap.apply(state, on_fixture_changed)
+                active = True
+            except Exception as e:
+                logger.error("Pixel-map sampling failed, pixel-mapping disabled: %s", e)
+                self.pixelmap.close()
+                self.pixelmap = None
+
+        if active:
+            self.idle.note_activity()
+        self.idle.update(state)
+
+    def _on_connect(self) -> None:
+        """(Re)connexion de Max : WRITE → on lui pousse tout l'état ; READ → on demande le sien."""
+        if self.state.mode == WRITE:
+            self.push_state()
+        else:
+            self.request_state()
+
+    def push_state(self) -> int:
+        """Envoie l'état complet en tranches /state/chunk ; renvoie le nombre de tranches."""
+        self._sync_id += 1
+        _t, flat = self.build_frame()
+        return self.osc.send_state(self._sync_id, flat, self._sync_chunk_bytes)
+
+    def request_state(self) -> None:
+        """Demande à Max son état complet (/state/query)."""
+        self._sync_id += 1
+        self.osc.send_state_query(self._sync_id)
+
+    def _on_osc_input(self) -> None:
+        # Thread OSC : ne touche pas à l'état, réveille seulement l'horloge si elle est en veille
+        if self.idle.idle and self.on_wake is not None:
+            self.on_wake()
+
+    def _current_values(self, fid: int) -> List[float]:
+        return self.state.ensure_fixture(fid).values()
+
+    def _pull_shared_state(self, on_fixture_changed=None):
+        """Mode io_process : recopie l'état publié par le processus I/O (seqlock)."""
+        res = self.osc.read_inbound(self._inbound_version)
+        if res is None:
+            return False
+        self._inbound_version, msg_count, flat = res
+        self.state.on_msg_received(msg_count - self._inbound_msgs)
+        self._inbound_msgs = msg_count
+        for i in range(0, len(flat), FRAME_STRIDE):
+            fid = int(flat[i])
+            fx = self.state.ensure_fixture(fid)
+            fx.set_values(flat[i + 1:i + FRAME_STRIDE])
+            if on_fixture_changed:
+                on_fixture_changed(fid, fx)
+        return True
+
+    # ----------------------------------------------------------------------
+    # Sortie (App → Max)
+    # ----------------------------------------------------------------------
+    def build_frame(self) -> Tuple[float, List[float]]:
+        """Construit un /frame à partir de l'état : (t, [id, r, g, b, a, w, dimmer, strobe] * N)."""
+        t = time.perf_counter()
+        flat = []
+        fixtures = self.state.fixtures
+        for fid in sorted(fixtures.keys()):
+            fx = fixtures[fid]
+            flat.append(int(fid))
+            flat.extend(fx.values())
+        return t, flat
+
+    def send_output(self, throttle: bool = True) -> None:
+        """
+        WRITE: envoi automatique d'un /frame (throttle côté OscClient, à la fréquence adaptative).
+        throttle=False : envoi inconditionnel (ex. frame de test).
+        """
+        if self.state.mode != WRITE:
+            return
+        try:
+            t, frame = self.build_frame()
+            # Veille : pas de sortie déconnecté, rafraîchissement lent si rien ne change
+            if throttle and not self.idle.allow_output(self.state, frame):
+                return
+            fixtures_flat = self.output.process(self.masters.apply(frame))
+            if fixtures_flat and self.osc.send_frame(t, fixtures_flat, throttle=throttle):
+                self.frames_sent += 1
+                self.idle.note_output()
+                if self.rig is not None:
+                    for universe, data in self.rig.render(fixtures_flat).items():
+                        self.osc.send_dmx(universe, data)
+                if self.recorder is not None:
+                    self.recorder.add_frame(t, frame)
+        except Exception as e:
+            self._errors.report("send_frame", f"send_frame failed: {e}")
+
+    def publish_state(self) -> None:
+        """Publie l'état courant vers le miroir WebSocket (une fois par tick, non bloquant)."""
+        if self.mirror is None:
+            return
+        fixtures = self.state.fixtures
+        ids = sorted(fixtures)
+        self.mirror.publish(ids, [v for fid in ids for v in fixtures[fid].values()])
+
+    # ----------------------------------------------------------------------
+    # Commandes
+    # ----------------------------------------------------------------------
+    def set_mode(self, mode: str) -> str:
+        mode = normalize_mode(mode)
+        if self.state.mode != mode:
+            self.state.mode = mode
+            try:
+                self.osc.send_mode(mode)
+            except Exception as e:
+                logger.exception("Failed to send mode: %s", e)
+        return mode
+
+    def set_master(self, name: str, value: float) -> bool:
+        return self.masters.set_level(name, value)
+
+    def recall_cue(self, cue_id: int) -> bool:
+        if cue_id not in self.cues:
+            return False
+        self.cues.apply(cue_id, self.state)
+        return True
+
+    def open_recording(self, path, speed: float = 1.0, play: bool = True):
+        """Ouvre un enregistrement de show et le rejoue dans l'état (seek() pour scrubber)."""
+        from .recorder import ShowPlayer, ShowRecording
+        if self.player is not None:
+            self.player.recording.close()
+        self.player = ShowPlayer(ShowRecording(path), speed=speed)
+        if play:
+            self.player.play()
+        return self.player
+
+    def ensure_fixture_count(self, count: int) -> int:
+        """Ajuste l'état à `count` fixtures (bornées) et renvoie le nombre retenu."""
+        count = max(FIXTURE_COUNT_MIN, min(FIXTURE_COUNT_MAX, int(count)))
+        # Ajouter les manquantes
+        for fid in range(1, count + 1):
+            self.state.ensure_fixture(fid)
+        # Supprimer celles au-delà
+        for fid in [fid for fid in self.state.fixtures.keys() if fid > count]:
+            self.state.fixtures.pop(fid, None)
+        return count
@@ -0,0 +1,129 @@
+# fichier: src/core/headless.py
+"""
+Mode headless : moteur OSC + état + sortie /frame, sans Tk ni aucun module ui.*.
+Piloté par ClockScheduler, avec un relevé console des KPIs chaque seconde.
+"""
+
+import signal
+import time
+from typing import Optional
+
+from utils.log import get_logger
+from utils.startup import startup
+from utils.alloc_profile import alloc_profiler
+from .config import load_io_config, load_fixtures_config
+from .engine import Engine
+from .scheduler import ClockScheduler
+
+logger = get_logger(__name__)
+
+
+class HeadlessApp:
+    def __init__(self, mode: Optional[str] = None, cue: Optional[int] = None,
+                 tick_hz: Optional[float] = None, report_s: float = 1.0,
+                 playback: Optional[str] = None, playback_speed: float = 1.0):
+        with startup.phase("config"):
+            self._io_cfg = load_io_config()
+            self._fx_cfg = load_fixtures_config()
+        with startup.phase("engine"):
+            self.engine = Engine(self._io_cfg, self._fx_cfg)
+        self.state = self.engine.state
+
+        self._initial_mode = mode
+        self._initial_cue = cue
+        self._playback = playback
+        self._playback_speed = playback_speed
+        self._report_s = max(0.1, float(report_s))
+        self._last_report_ts = 0.0
+        self._last_frames_sent = 0
+
+        # Par défaut, l'horloge suit max_rate_hz ; le throttle d'OscClient (échéancier
+        # tolérant à la gigue) ramène la sortie à la fréquence adaptative courante.
+        hz = float(tick_hz or self._io_cfg.get("max_rate_hz", 60) or 60)
+        self._tick_ms = 1000.0 / hz
+        self.scheduler = ClockScheduler(interval_ms=self._tick_ms, on_tick=self.on_tick)
+
+        # Veille : horloge ralentie au repos, réveillée dès qu'un datagramme arrive
+        self.engine.idle.on_idle_changed = self._on_idle_changed
+        self.engine.on_wake = self.scheduler.wake
+
+    # ----------------------------------------------------------------------
+    # Tick
+    # ----------------------------------------------------------------------
+    def on_tick(self):
+        prof = alloc_profiler
+        with prof.phase("drain"):
+            self.engine.drain_events()
+        with prof.phase("output"):
+            self.engine.send_output()
+            self.engine.publish_state()
+        prof.end_tick()
+
+        startup.mark_first_frame()
+        now = time.monotonic()
+        if now - self._last_report_ts >= self._report_s:
+            self._report(now)
+
+    def _on_idle_changed(self, idle: bool):
+        idle_ms = 1000.0 / self.engine.idle.idle_tick_hz
+        self.scheduler.set_interval(max(self._tick_ms, idle_ms) if idle else self._tick_ms)
+        if not idle:
+            self.scheduler.wake()
+        logger.info("Idle: %s", "on" if idle else "off")
+
+    def _report(self, now: float):
+        dt = now - self._last_report_ts if self._last_report_ts else self._report_s
+        frames = self.engine.frames_sent - self._last_frames_sent
+        self._last_frames_sent = self.engine.frames_sent
+        self._last_report_ts = now
+
+        self.state.fps = self.scheduler.fps
+        connected_text = "Connected" if self.state.connected else "Not connected"
+        if self.engine.idle.idle:
+            connected_text += " (idle)"
+        logger.info(
+            "Mode: %s | %s | FPS: %.0f | Msg/s: %.0f | Out/s: %.0f (target %.0f, drops %d) | Fixtures: %d",
+            self.state.mode.upper(), connected_text, self.state.fps,
+            self.state.msgs_per_sec, frames / max(1e-6, dt), self.state.out_rate_hz,
+            self.state.out_drops, len(self.state.fixtures),
+        )
+
+    # ----------------------------------------------------------------------
+    # Démarrage / arrêt
+    # ----------------------------------------------------------------------
+    def run(self):
+        with startup.phase("osc"):
+            self.engine.start()
+        if self._initial_mode:
+            self.engine.set_mode(self._initial_mode)
+        if self._initial_cue is not None and not self.engine.recall_cue(self._initial_cue):
+            logger.error("Cue %s not found in %s", self._initial_cue, self.engine.cues.path)
+        if self._playback:
+            try:
+                player = self.engine.open_recording(self._playback, speed=self._playback_speed)
+                logger.info("Playing %s (%.1f s)", self._playback, player.recording.duration)
+            except Exception as e:
+                logger.error("Show recording open failed: %s", e)
+
+        # SIGTERM (systemd, docker…) → arrêt propre
+        try:
+            signal.signal(signal.SIGTERM, lambda *_: self.scheduler.stop())
+        except (ValueError, OSError):
+            pass
+
+        logger.info(
+            "Headless engine running (listen %s, send %s:%s) — Ctrl+C to quit",
+            self._io_cfg["listen_port"], self._io_cfg["remote_ip"], self._io_cfg["send_port"],
+        )
+        try:
+            self.scheduler.run()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.scheduler.stop()
+            self.engine.stop()
+
+
+def run_headless(mode: Optional[str] = None, cue: Optional[int] = None, tick_hz: Optional[float] = None,
+                 playback: Optional[str] = None, playback_speed: float = 1.0):
+    HeadlessApp(mode=mode, cue=cue, tick_hz=tick_hz, playback=playback, playback_speed=playback_speed).run()
@@ -0,0 +1,111 @@
+# fichier: src/core/history.py
+"""
+Historique récent des canaux de chaque fixture (vue « scope », section `history:` de fixtures.yml).
+
+- Anneaux préalloués : un array("f") par fixture, canal par canal (canal k = tranche
+  [k × capacité, (k + 1) × capacité[), plus un anneau commun d'horodatages array("d").
+  Mémoire fixe : `seconds` × `rate_hz` échantillons, au plus `max_fixtures` fixtures.
+- sample(state) : un échantillon de tout l'état par tick (7 écritures par fixture).
+- minmax(...) : décimation min/max vers `width` colonnes de pixels. Les limites de
+  colonnes se trouvent par bisect sur les horodatages, min() / max() travaillent sur
+  des tranches d'array (boucle C) : le coût Python dépend de la largeur, pas du nombre
+  d'échantillons. Une colonne sans échantillon vaut None.
+"""
+
+import time
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+from .state import AppState, CHANNELS
+
+_WIDTH = len(CHANNELS)
+
+
+class ChannelHistory:
+    def __init__(self, seconds: float = 60.0, rate_hz: float = 30.0, max_fixtures: int = 64):
+        self.seconds = max(1.0, float(seconds))
+        self.capacity = max(2, int(self.seconds * max(1.0, float(rate_hz))))
+        self.max_fixtures = max(1, int(max_fixtures))
+
+        self._times = array("d", bytes(8 * self.capacity))
+        self._rings: Dict[int, array] = {}
+        self._since: Dict[int, int] = {}     # fid -> numéro du premier échantillon
+        self._count = 0                      # échantillons écrits depuis le début
+
+    @classmethod
+    def from_config(cls, cfg: Optional[dict], rate_hz: float) -> "ChannelHistory":
+        cfg = cfg or {}
+        return cls(seconds=float(cfg.get("seconds", 60)), rate_hz=rate_hz,
+                   max_fixtures=int(cfg.get("max_fixtures", 64)))
+
+    # ------------------------------------------------------------------
+    # Écriture
+    # ------------------------------------------------------------------
+    def sample(self, state: AppState, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        cap = self.capacity
+        pos = self._count % cap
+        self._times[pos] = now
+        rings = self._rings
+        for fid, fx in state.fixtures.items():
+            ring = rings.get(fid)
+            if ring is None:
+                if len(rings) >= self.max_fixtures:
+                    continue
+                ring = rings[fid] = array("f", bytes(4 * cap * _WIDTH))
+                self._since[fid] = self._count
+            for k, v in enumerate(fx.values()):
+                ring[k * cap + pos] = v
+        self._count += 1
+
+    def forget_missing(self, fixtures) -> None:
+        """Libère les anneaux des fixtures disparues (ex. nombre de fixtures réduit)."""
+        for fid in [f for f in self._rings if f not in fixtures]:
+            del self._rings[fid]
+            del self._since[fid]
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+    def fixture_ids(self) -> List[int]:
+        return sorted(self._rings)
+
+    def series(self, fid: int, channel: str) -> Tuple[array, array]:
+        """(horodatages, valeurs) chronologiques disponibles pour ce canal."""
+        ring = self._rings.get(fid)
+        if ring is None or not self._count:
+            return array("d"), array("f")
+        cap = self.capacity
+        n = min(self._count - self._since[fid], cap)
+        pos = self._count % cap
+        start = (pos - n) % cap
+        base = CHANNELS.index(channel) * cap
+        if start + n <= cap:
+            return self._times[start:start + n], ring[base + start:base + start + n]
+        head = cap - start
+        return (self._times[start:] + self._times[:n - head],
+                ring[base + start:base + cap] + ring[base:base + n - head])
+
+    def minmax(self, fid: int, channel: str, width: int, span_s: Optional[float] = None,
+               now: Optional[float] = None) -> List[Optional[Tuple[float, float]]]:
+        """Min / max par colonne sur les `span_s` dernières secondes, `width` colonnes."""
+        width = max(1, int(width))
+        span = min(self.seconds, float(span_s or self.seconds))
+        times, values = self.series(fid, channel)
+        if not values:
+            return [None] * width
+        end = times[-1] if now is None else now
+        t0 = end - span
+        step = span / width
+        out: List[Optional[Tuple[float, float]]] = []
+        lo = bisect_left(times, t0)
+        for c in range(width):
+            hi = bisect_left(times, t0 + (c + 1) * step, lo) if c < width - 1 else len(times)
+            if hi > lo:
+                chunk = values[lo:hi]
+                out.append((min(chunk), max(chunk)))
+            else:
+                out.append(None)
+            lo = hi
+        return out
@@ -0,0 +1,94 @@
+# fichier: src/core/idle.py
+"""
+Veille / économie d'énergie (heartbeat_ms + section `idle:` de io.yml).
+
+- Chien de garde du heartbeat : sans /app/hello depuis `heartbeat_ms` × `misses`,
+  AppState.connected repasse à False.
+- Inactivité : aucune entrée (OSC reçu, geste UI) et aucune frame différente de la
+  précédente depuis `idle_after_ms` → veille : l'horloge descend à `idle_tick_hz`.
+- Sortie en veille : seule une frame de rafraîchissement toutes les `idle_refresh_ms`
+  (Max redémarré, datagramme perdu) ; déconnecté : aucune sortie. Tant qu'aucun
+  hello n'a jamais été reçu, la connexion est inconnue et la sortie n'est pas coupée
+  (patch Max sans heartbeat).
+- Réveil : note_activity() rend immédiatement la fréquence pleine (les schedulers
+  exposent wake() pour ne pas attendre la fin d'un tick lent).
+"""
+
+import time
+from typing import Callable, Optional
+
+from .state import AppState
+
+
+class IdleWatchdog:
+    def __init__(self, heartbeat_ms: int = 1000, misses: int = 3, enabled: bool = True,
+                 idle_after_ms: int = 5000, idle_tick_hz: float = 4.0, idle_refresh_ms: int = 1000):
+        self.heartbeat_timeout_s = max(0, int(heartbeat_ms)) * max(1, int(misses)) / 1000.0
+        self.enabled = bool(enabled)
+        self.idle_after_s = max(0.0, int(idle_after_ms) / 1000.0)
+        self.idle_tick_hz = max(0.5, float(idle_tick_hz))
+        self.idle_refresh_s = max(0.0, int(idle_refresh_ms) / 1000.0)
+
+        self.idle = False
+        self._seen_hello = False
+        self._last_activity = time.monotonic()
+        self._last_output = 0.0
+        self._last_frame = None
+        # Appelé au passage veille ↔ actif (ex. changer la fréquence du scheduler)
+        self.on_idle_changed: Optional[Callable[[bool], None]] = None
+
+    @classmethod
+    def from_config(cls, io_cfg: dict) -> "IdleWatchdog":
+        cfg = io_cfg.get("idle") or {}
+        return cls(
+            heartbeat_ms=int(io_cfg.get("heartbeat_ms", 1000)),
+            misses=int(cfg.get("heartbeat_misses", 3)),
+            enabled=bool(cfg.get("enabled", True)),
+            idle_after_ms=int(cfg.get("idle_after_ms", 5000)),
+            idle_tick_hz=float(cfg.get("idle_tick_hz", 4)),
+            idle_refresh_ms=int(cfg.get("idle_refresh_ms", 1000)),
+        )
+
+    # ------------------------------------------------------------------
+    # Entrées
+    # ------------------------------------------------------------------
+    def note_activity(self, now: Optional[float] = None) -> None:
+        self._last_activity = time.monotonic() if now is None else now
+        if self.idle:
+            self._set_idle(False)
+
+    def note_hello(self) -> None:
+        self._seen_hello = True
+
+    # ------------------------------------------------------------------
+    # Tick
+    # ------------------------------------------------------------------
+    def update(self, state: AppState, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        if (state.connected and self.heartbeat_timeout_s > 0
+                and now - state.last_hello_ts > self.heartbeat_timeout_s):
+            state.connected = False
+        if self.enabled and not self.idle and now - self._last_activity >= self.idle_after_s:
+            self._set_idle(True)
+
+    def allow_output(self, state: AppState, frame, now: Optional[float] = None) -> bool:
+        """Décide si ce /frame part ; une frame qui change compte comme activité."""
+        if not self.enabled:
+            return True
+        now = time.monotonic() if now is None else now
+        if frame != self._last_frame:
+            self._last_frame = frame
+            self.note_activity(now)
+        if self._seen_hello and not state.connected:
+            return False
+        if self.idle and now - self._last_output < self.idle_refresh_s:
+            return False
+        return True
+
+    def note_output(self, now: Optional[float] = None) -> None:
+        self._last_output = time.monotonic() if now is None else now
+
+    def _set_idle(self, idle: bool) -> None:
+        self.idle = idle
+        if self.on_idle_changed:
+            self.on_idle_changed(idle)
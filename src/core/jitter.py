@@ -0,0 +1,133 @@
+# fichier: src/core/jitter.py
+"""
+Tampon de gigue pour les /frame horodatés (READ).
+
+Chaque source a son tampon de frames triées par `t` (horloge de l'expéditeur).
+L'écart d'horloge source → local est estimé par le plus petit (arrivée - t)
+observé récemment (= frame la moins retardée par le réseau). À chaque tick on
+rejoue l'instant local `now - latence` converti en temps source, en interpolant
+linéairement entre les deux frames qui l'encadrent : l'affichage reste fluide
+malgré la gigue UDP, sans dessiner plus souvent.
+
+Une frame sans horodatage exploitable (t <= 0, ou t identique à la précédente)
+est appliquée telle quelle, comme avant le tampon.
+"""
+
+import time
+from bisect import insort
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .state import CHANNELS
+
+_WIDTH = len(CHANNELS)
+_OFFSET_WINDOW = 64      # nb d'écarts (arrivée - t) retenus pour estimer l'offset d'horloge
+_MAX_FRAMES = 32         # frames gardées au plus par source (t en avance, flux interrompu…)
+_IDLE_S = 10.0           # une source muette depuis plus longtemps est oubliée
+_RESET_S = 1.0           # recul de `t` au-delà duquel on considère l'horloge source réinitialisée
+
+
+class _Stream:
+    __slots__ = ("frames", "offsets", "last_t", "emitted", "last_seen")
+
+    def __init__(self):
+        self.frames: List[Tuple[float, Tuple[int, ...], List[float]]] = []   # (t, ids, valeurs 7×N)
+        self.offsets = deque(maxlen=_OFFSET_WINDOW)
+        self.last_t: Optional[float] = None
+        self.emitted: Optional[float] = None      # position (temps source) déjà rejouée
+        self.last_seen = 0.0
+
+
+class JitterBuffer:
+    def __init__(self, latency_s: float = 0.04):
+        self.latency_s = float(latency_s)
+        self._streams: Dict[str, _Stream] = {}
+        self.late_frames = 0
+
+    @classmethod
+    def from_config(cls, io_cfg: Optional[dict]) -> "JitterBuffer":
+        return cls(float((io_cfg or {}).get("jitter_latency_ms", 40)) / 1000.0)
+
+    @property
+    def enabled(self) -> bool:
+        return self.latency_s > 0
+
+    # ------------------------------------------------------------------
+    # Entrée
+    # ------------------------------------------------------------------
+    def push(self, src: str, t: float, fixtures: Sequence[dict], now: Optional[float] = None) -> bool:
+        """
+        Range une frame (payload "fixtures" d'OscClient). Renvoie False si elle n'est pas
+        horodatée : l'appelant l'applique alors directement.
+        """
+        stream = self._streams.get(src)
+        if stream is None:
+            stream = self._streams[src] = _Stream()
+        if t <= 0 or t == stream.last_t:
+            return False
+        stream.last_t = t
+        if stream.emitted is not None and t <= stream.emitted:
+            if stream.emitted - t < _RESET_S:
+                self.late_frames += 1      # arrivée après son instant de rendu : trop tard
+                return True
+            # Grand saut en arrière : l'expéditeur a redémarré son horloge
+            stream = self._streams[src] = _Stream()
+            stream.last_t = t
+
+        now = time.monotonic() if now is None else now
+        stream.last_seen = now
+        stream.offsets.append(now - t)
+        ids = tuple(int(it["id"]) for it in fixtures)
+        values = [float(it[name]) for it in fixtures for name in CHANNELS]
+        insort(stream.frames, (t, ids, values), key=lambda f: f[0])
+        if len(stream.frames) > _MAX_FRAMES:
+            del stream.frames[0]
+        return True
+
+    # ------------------------------------------------------------------
+    # Rendu
+    # ------------------------------------------------------------------
+    def sample(self, now: Optional[float] = None) -> Dict[str, Tuple[Tuple[int, ...], List[float]]]:
+        """src -> (ids, valeurs 7×N) interpolées à now - latence, pour les sources qui ont avancé."""
+        now = time.monotonic() if now is None else now
+        out = {}
+        for src, stream in list(self._streams.items()):
+            frames = stream.frames
+            if not frames:
+                continue
+            if now - stream.last_seen > _IDLE_S:
+                del self._streams[src]
+                continue
+            target = now - self.latency_s - min(stream.offsets)
+
+            # Garder une seule frame antérieure à la cible
+            i = 0
+            while i + 1 < len(frames) and frames[i + 1][0] <= target:
+                i += 1
+            if i:
+                del frames[:i]
+
+            t0, ids0, v0 = frames[0]
+            if target < t0:
+                continue                     # pas encore l'heure de la première frame
+            if len(frames) == 1:
+                # Plus rien derrière : on tient la dernière frame (pas d'extrapolation)
+                if stream.emitted != t0:
+                    stream.emitted = t0
+                    out[src] = (ids0, v0)
+                continue
+
+            t1, ids1, v1 = frames[1]
+            stream.emitted = target
+            if ids0 != ids1:
+                out[src] = (ids0, v0)        # patch différent : pas d'interpolation possible
+                continue
+            u = (target - t0) / (t1 - t0)
+            out[src] = (ids0, [a + (b - a) * u for a, b in zip(v0, v1)])
+        return out
+
+
+def rows(ids: Sequence[int], values: Sequence[float]):
+    """(fid, 7 valeurs) pour chaque fixture d'un échantillon à plat."""
+    for k, fid in enumerate(ids):
+        yield fid, values[k * _WIDTH:(k + 1) * _WIDTH]
@@ -0,0 +1,97 @@
+# fichier: src/core/masters.py
+"""
+Masters de groupes + grand master, appliqués à la sortie uniquement.
+
+L'appartenance aux groupes est une matrice creuse fixtures × groupes, stockée
+ligne par ligne (indices des groupes de chaque fixture). Chaque changement de
+fader recalcule un vecteur de facteurs par fixture ; appliquer les masters à
+une frame = une seule multiplication colonne dimmer × facteurs, sans toucher
+à l'état stocké des fixtures.
+"""
+
+from operator import mul
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from .state import CHANNELS, FRAME_STRIDE
+
+GRAND_MASTER = "grand"
+_DIMMER_COL = 1 + CHANNELS.index("dimmer")
+
+
+class MasterSection:
+    def __init__(self, groups: Optional[Dict[str, Iterable[int]]] = None):
+        self.group_names: List[str] = []
+        self._members: Dict[int, List[int]] = {}    # fid -> indices de groupes (ligne creuse)
+        self._levels: List[float] = []
+        self.grand = 1.0
+
+        for name, fids in (groups or {}).items():
+            g = len(self.group_names)
+            self.group_names.append(str(name))
+            self._levels.append(1.0)
+            for fid in fids:
+                self._members.setdefault(int(fid), []).append(g)
+
+        self._plan_ids: Optional[List[float]] = None
+        self._factors: List[float] = []
+        self._dirty = True
+
+    @classmethod
+    def from_config(cls, groups_cfg: Optional[dict]) -> "MasterSection":
+        return cls({str(k): [int(f) for f in (v or [])] for k, v in (groups_cfg or {}).items()})
+
+    # ------------------------------------------------------------------
+    # Faders
+    # ------------------------------------------------------------------
+    def level(self, name: str) -> float:
+        if name == GRAND_MASTER:
+            return self.grand
+        return self._levels[self.group_names.index(name)]
+
+    def set_level(self, name: str, value: float) -> bool:
+        """Règle un master (GRAND_MASTER ou nom de groupe). Renvoie False si inconnu."""
+        v = max(0.0, min(1.0, float(value)))
+        if name == GRAND_MASTER:
+            self.grand = v
+        elif name in self.group_names:
+            self._levels[self.group_names.index(name)] = v
+        else:
+            return False
+        self._dirty = True
+        return True
+
+    def members(self, name: str) -> List[int]:
+        g = self.group_names.index(name)
+        return sorted(fid for fid, groups in self._members.items() if g in groups)
+
+    @property
+    def is_identity(self) -> bool:
+        return self.grand == 1.0 and all(v == 1.0 for v in self._levels)
+
+    # ------------------------------------------------------------------
+    # Sortie
+    # ------------------------------------------------------------------
+    def apply(self, flat: Sequence[float]) -> List[float]:
+        """Multiplie la colonne dimmer du /frame à plat par le facteur de chaque fixture."""
+        out = list(flat)
+        if not out or self.is_identity:
+            return out
+        ids = out[0::FRAME_STRIDE]
+        if self._dirty or ids != self._plan_ids:
+            self._factors = self._compute_factors(ids)
+            self._plan_ids = ids
+            self._dirty = False
+        out[_DIMMER_COL::FRAME_STRIDE] = list(map(mul, out[_DIMMER_COL::FRAME_STRIDE], self._factors))
+        return out
+
+    def _compute_factors(self, ids: Sequence[float]) -> List[float]:
+        # Produit des masters de chaque groupe de la fixture (× grand master)
+        levels = self._levels
+        grand = self.grand
+        factors = []
+        for fid in ids:
+            f = grand
+            for g in self._members.get(int(fid), ()):
+                f *= levels[g]
+            factors.append(f)
+        return factors
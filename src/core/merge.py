@@ -0,0 +1,157 @@
+# fichier: src/core/merge.py
+"""
+Fusion de plusieurs sources OSC (plusieurs devices Max for Live sur le même rig).
+
+Chaque source (clé = adresse de l'expéditeur "ip:port") a son propre tampon :
+dernières valeurs reçues par fixture + numéro d'ordre d'arrivée par groupe de canaux.
+La fusion se fait par fixture :
+- dimmer : HTP (highest takes precedence) — le plus haut des sources actives
+- couleur (r g b a w) et strobe : LTP (latest takes precedence) — la dernière source arrivée
+Une source muette depuis plus de `timeout_s` est retirée ; ses fixtures sont recalculées.
+
+Seuls les groupes de canaux touchés (nouvelle valeur ou source expirée) sont refusionnés,
+les autres gardent l'état courant (édition locale, cue…). Un index inverse fixture →
+sources qui la pilotent évite de parcourir toutes les sources : le coût par tick dépend
+du trafic, pas du nombre de sources connues.
+"""
+
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+from .state import CHANNELS
+
+_DIMMER = CHANNELS.index("dimmer")
+_STROBE = CHANNELS.index("strobe")
+_COLOR = slice(0, _DIMMER)
+
+# Groupes de canaux horodatés séparément (LTP couleur / HTP dimmer / LTP strobe)
+_G_COLOR, _G_DIMMER, _G_STROBE = 0, 1, 2
+# Masques des groupes à refusionner
+_M_COLOR, _M_DIMMER, _M_STROBE = 1 << _G_COLOR, 1 << _G_DIMMER, 1 << _G_STROBE
+_M_ALL = _M_COLOR | _M_DIMMER | _M_STROBE
+
+
+class _Source:
+    __slots__ = ("name", "last_seen", "values", "stamps")
+
+    def __init__(self, name: str, now: float):
+        self.name = name
+        self.last_seen = now
+        self.values: Dict[int, List[float]] = {}    # fid -> [r, g, b, a, w, dimmer, strobe]
+        self.stamps: Dict[int, List[int]] = {}      # fid -> [n° couleur, n° dimmer, n° strobe] (0 = jamais reçu)
+
+    def row(self, fid: int):
+        vals = self.values.get(fid)
+        if vals is None:
+            vals = self.values[fid] = [0.0] * len(CHANNELS)
+            self.stamps[fid] = [0, 0, 0]
+        return vals, self.stamps[fid]
+
+
+class MergeEngine:
+    def __init__(self, timeout_s: float = 3.0):
+        self.timeout_s = float(timeout_s)
+        self._sources: Dict[str, _Source] = {}
+        self._seq = 0
+        self._dirty: Dict[int, int] = {}                    # fid -> masque des groupes touchés
+        self._drivers: Dict[int, Dict[str, _Source]] = {}   # fid -> sources qui l'ont envoyée
+
+    @classmethod
+    def from_config(cls, io_cfg: Optional[dict]) -> "MergeEngine":
+        return cls(float((io_cfg or {}).get("source_timeout_ms", 3000)) / 1000.0)
+
+    # ------------------------------------------------------------------
+    # Entrées
+    # ------------------------------------------------------------------
+    def _touch(self, src: str, fid: int, now: Optional[float], groups: int):
+        now = time.monotonic() if now is None else now
+        source = self._sources.get(src)
+        if source is None:
+            source = self._sources[src] = _Source(src, now)
+        source.last_seen = now
+        self._seq += 1
+        self._dirty[fid] = self._dirty.get(fid, 0) | groups
+        if fid not in source.values:
+            self._drivers.setdefault(fid, {})[src] = source
+        return source.row(fid)
+
+    def feed_color(self, src: str, fid: int, rgbaw: Sequence[float], now: Optional[float] = None) -> None:
+        vals, stamps = self._touch(src, fid, now, _M_COLOR)
+        vals[_COLOR] = rgbaw
+        stamps[_G_COLOR] = self._seq
+
+    def feed_dimmer(self, src: str, fid: int, value: float, now: Optional[float] = None) -> None:
+        vals, stamps = self._touch(src, fid, now, _M_DIMMER)
+        vals[_DIMMER] = value
+        stamps[_G_DIMMER] = self._seq
+
+    def feed_strobe(self, src: str, fid: int, value: float, now: Optional[float] = None) -> None:
+        vals, stamps = self._touch(src, fid, now, _M_STROBE)
+        vals[_STROBE] = value
+        stamps[_G_STROBE] = self._seq
+
+    def feed_values(self, src: str, fid: int, values: Sequence[float], now: Optional[float] = None) -> None:
+        """Les 7 canaux d'un coup (/frame)."""
+        vals, stamps = self._touch(src, fid, now, _M_ALL)
+        vals[:] = values
+        stamps[:] = (self._seq, self._seq, self._seq)
+
+    # ------------------------------------------------------------------
+    # Fusion
+    # ------------------------------------------------------------------
+    @property
+    def source_names(self) -> List[str]:
+        return sorted(self._sources)
+
+    def expire(self, now: Optional[float] = None) -> List[str]:
+        """Retire les sources muettes depuis plus de timeout_s ; renvoie leurs noms."""
+        if self.timeout_s <= 0 or not self._sources:
+            return []
+        limit = (time.monotonic() if now is None else now) - self.timeout_s
+        stale = [name for name, s in self._sources.items() if s.last_seen < limit]
+        dirty = self._dirty
+        for name in stale:
+            for fid in self._sources.pop(name).values:
+                dirty[fid] = dirty.get(fid, 0) | _M_ALL
+                drivers = self._drivers.get(fid)
+                if drivers is not None:
+                    drivers.pop(name, None)
+                    if not drivers:
+                        del self._drivers[fid]
+        return stale
+
+    def merge(self, base: Callable[[int], Sequence[float]], now: Optional[float] = None) -> Dict[int, List[float]]:
+        """
+        Fusionne les groupes de canaux touchés depuis le dernier appel.
+        base(fid) donne l'état courant : les groupes non touchés, ou qu'aucune source active
+        n'a envoyés, le gardent. Renvoie fid -> 7 valeurs fusionnées (les fixtures qu'aucune
+        source active ne pilote plus sont omises : elles gardent leur dernier état).
+        """
+        self.expire(now)
+        if not self._dirty:
+            return {}
+        drivers = self._drivers
+        out: Dict[int, List[float]] = {}
+        for fid, groups in self._dirty.items():
+            sources = drivers.get(fid)
+            if not sources:
+                continue
+            rows = [(s.values[fid], s.stamps[fid]) for s in sources.values()]
+            merged = list(base(fid))
+            # LTP : la source au n° d'arrivée le plus récent l'emporte
+            if groups & _M_COLOR:
+                vals, stamps = max(rows, key=lambda r: r[1][_G_COLOR])
+                if stamps[_G_COLOR]:
+                    merged[_COLOR] = vals[_COLOR]
+            if groups & _M_STROBE:
+                vals, stamps = max(rows, key=lambda r: r[1][_G_STROBE])
+                if stamps[_G_STROBE]:
+                    merged[_STROBE] = vals[_STROBE]
+            # HTP : le plus haut des dimmers reçus
+            if groups & _M_DIMMER:
+                dimmers = [vals[_DIMMER] for vals, stamps in rows if stamps[_G_DIMMER]]
+                if dimmers:
+                    merged[_DIMMER] = max(dimmers)
+            out[fid] = merged
+        self._dirty.clear()
+        return out
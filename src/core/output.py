@@ -0,0 +1,169 @@
+# fichier: src/core/output.py
+"""
+Étage de sortie entre build_frame() et send_frame() :
+courbe de dimmer, gamma couleur, limites min/max et quantification 8/16 bits.
+
+Chaque profil est compilé une fois en tables de correspondance (LUT), une par
+canal, et les LUT de tous les profils sont concaténées par canal. Traiter une
+frame = une compréhension par colonne : lut[int(x * échelle + base_fixture)],
+sans calcul de courbe ni bornage valeur par valeur (des zones de garde de part
+et d'autre de [0, 1] absorbent les valeurs hors plage).
+
+Limite connue : ~1 µs par fixture en Python pur (7 colonnes), soit ~1 ms pour
+1000 fixtures, au-dessus du budget visé pour plusieurs milliers ; pour les très
+grands rigs, répartir l'étage sur plusieurs cœurs (core.shard, section `sharding:`).
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .state import CHANNELS, FRAME_STRIDE
+
+DEFAULT_LUT_SIZE = 4096
+
+# Courbes de dimmer : x ∈ [0, 1] → [0, 1]
+DIMMER_CURVES = {
+    "linear": lambda x: x,
+    "square": lambda x: x * x,
+    "inverse_square": lambda x: 1.0 - (1.0 - x) * (1.0 - x),
+    "s_curve": lambda x: x * x * (3.0 - 2.0 * x),
+}
+
+_COLOR_CHANNELS = ("r", "g", "b", "a", "w")
+
+
+class OutputProfile:
+    """Profil de sortie d'une fixture (réglages bruts, avant compilation)."""
+
+    def __init__(self, name: str, dimmer_curve: str = "linear", gamma: float = 1.0,
+                 min: float = 0.0, max: float = 1.0, bits: int = 0):
+        if dimmer_curve not in DIMMER_CURVES:
+            raise ValueError(f"profil {name}: courbe de dimmer inconnue '{dimmer_curve}'")
+        if bits not in (0, 8, 16):
+            raise ValueError(f"profil {name}: bits doit valoir 0, 8 ou 16")
+        self.name = name
+        self.dimmer_curve = dimmer_curve
+        self.gamma = float(gamma)
+        self.min = float(min)
+        self.max = float(max)
+        self.bits = int(bits)
+
+    @classmethod
+    def from_config(cls, name: str, cfg: Optional[dict]) -> "OutputProfile":
+        cfg = cfg or {}
+        return cls(
+            name,
+            dimmer_curve=str(cfg.get("dimmer_curve", "linear")),
+            gamma=float(cfg.get("gamma", 1.0)),
+            min=float(cfg.get("min", 0.0)),
+            max=float(cfg.get("max", 1.0)),
+            bits=int(cfg.get("bits", 0)),
+        )
+
+    @property
+    def is_identity(self) -> bool:
+        return (self.dimmer_curve == "linear" and self.gamma == 1.0
+                and self.min <= 0.0 and self.max >= 1.0 and self.bits == 0)
+
+    def compile(self, n: int) -> Tuple[List[float], ...]:
+        """LUT de `n` entrées par canal, dans l'ordre de CHANNELS."""
+        steps = (1 << self.bits) - 1 if self.bits else 0
+        lo, hi = self.min, self.max
+        xs = [i / (n - 1) for i in range(n)]
+
+        def finish(values):
+            out = []
+            for v in values:
+                v = lo if v < lo else hi if v > hi else v
+                if steps:
+                    v = round(v * steps) / steps
+                out.append(v)
+            return out
+
+        gamma = self.gamma
+        color = finish([x ** gamma for x in xs]) if gamma != 1.0 else finish(xs)
+        curve = DIMMER_CURVES[self.dimmer_curve]
+        dimmer = finish([curve(x) for x in xs])
+        strobe = [round(x * steps) / steps for x in xs] if steps else xs
+
+        luts = {name: color for name in _COLOR_CHANNELS}
+        luts["dimmer"] = dimmer
+        luts["strobe"] = strobe
+        return tuple(luts[name] for name in CHANNELS)
+
+
+class OutputProcessor:
+    """
+    Applique les profils compilés à un /frame à plat [id, r, g, b, a, w, dimmer, strobe] * N.
+    Les bases d'indice par fixture sont recalculées seulement si la liste d'ids change.
+    """
+
+    def __init__(self, profiles: Dict[str, OutputProfile], patch: Dict[int, str],
+                 default_profile: str = "default", lut_size: int = DEFAULT_LUT_SIZE):
+        self._patch = {int(fid): name for fid, name in patch.items()}
+        self._default = default_profile
+        self._active = not all(p.is_identity for p in profiles.values())
+
+        # En 16 bits la LUT doit couvrir chaque pas de sortie
+        n = 65536 if any(p.bits == 16 for p in profiles.values()) else int(lut_size)
+        self._n = n
+        self._scale = float(n - 1)
+
+        # Par profil et par canal : [garde < 0 | n entrées sur [0, 1] | garde > 1]
+        # → tout x ∈ [-1, 2] tombe dans la LUT et se lit borné.
+        self._profile_base = {}
+        per_channel: List[List[float]] = [[] for _ in CHANNELS]
+        if self._active:
+            for i, (name, prof) in enumerate(profiles.items()):
+                # +0.5 : int() tronque, on arrondit ainsi au pas le plus proche
+                self._profile_base[name] = i * 3 * n + n + 0.5
+                for k, lut in enumerate(prof.compile(n)):
+                    per_channel[k].extend([lut[0]] * n)
+                    per_channel[k].extend(lut)
+                    per_channel[k].extend([lut[-1]] * n)
+        self._luts = per_channel
+
+        self._plan_ids: Optional[List[float]] = None
+        self._bases: List[float] = []
+
+    @classmethod
+    def from_config(cls, cfg: Optional[dict]) -> "OutputProcessor":
+        cfg = cfg or {}
+        profiles = {
+            str(name): OutputProfile.from_config(str(name), pcfg)
+            for name, pcfg in (cfg.get("profiles") or {}).items()
+        }
+        default = str(cfg.get("default_profile", "default"))
+        profiles.setdefault(default, OutputProfile(default))
+        patch = {int(fid): str(name) for fid, name in (cfg.get("fixtures") or {}).items()}
+        for fid, name in patch.items():
+            if name not in profiles:
+                raise ValueError(f"fixture {fid}: profil de sortie inconnu '{name}'")
+        return cls(profiles, patch, default, int(cfg.get("lut_size", DEFAULT_LUT_SIZE)))
+
+    @property
+    def active(self) -> bool:
+        return self._active
+
+    def process(self, flat: Sequence[float]) -> List[float]:
+        out = list(flat)
+        if not self._active or not out:
+            return out
+        ids = out[0::FRAME_STRIDE]
+        if ids != self._plan_ids:
+            self._build_plan(ids)
+
+        # Hors des zones de garde [-1, 2] (valeurs aberrantes), colonne par colonne : bornage
+        # explicite, sinon l'indice tomberait dans la LUT du profil voisin (ou hors table)
+        s = self._scale
+        bases = self._bases
+        for k, lut in enumerate(self._luts, start=1):
+            col = out[k::FRAME_STRIDE]
+            if min(col) < -1.0 or max(col) > 2.0:
+                col = [0.0 if x < 0.0 else 1.0 if x > 1.0 else x for x in col]
+            out[k::FRAME_STRIDE] = [lut[int(x * s + b)] for x, b in zip(col, bases)]
+        return out
+
+    def _build_plan(self, ids: List[float]) -> None:
+        base = self._profile_base
+        self._bases = [base[self._patch.get(int(fid), self._default)] for fid in ids]
+        self._plan_ids = ids
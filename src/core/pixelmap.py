@@ -0,0 +1,225 @@
+# fichier: src/core/pixelmap.py
+"""
+Pixel-mapping : couleur des fixtures échantillonnée dans une vidéo ou une suite d'images
+(section `pixelmap:` de fixtures.yml).
+
+Sources (lues via mmap, aucune copie des images) :
+- vidéo brute RGB24 (`.rgb`, ex. `ffmpeg -i in.mp4 -f rawvideo -pix_fmt rgb24 out.rgb`) :
+  largeur / hauteur / fps dans la config, images bout à bout
+- dossier d'images PPM binaires (P6, 8 bits), jouées dans l'ordre des noms
+
+Chaque fixture a une position (x, y) ∈ [0, 1]² : par défaut le centre de sa cellule dans
+la grille de FixturesView (GRID_COLS colonnes, ids triés), sinon `positions:`. Autour de
+cette position, un carré de `sample` × `sample` pixels est moyenné.
+
+Les offsets de tous les octets à lire (fixtures × points × RGB) sont précalculés en un
+seul operator.itemgetter : échantillonner une image = un appel C sur la memoryview de
+l'image, puis une somme par fixture. Recalculé seulement si la liste des fixtures change.
+"""
+
+import mmap
+import time
+from operator import itemgetter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .state import AppState, GRID_COLS
+
+
+# ----------------------------------------------------------------------
+# Sources
+# ----------------------------------------------------------------------
+class RawVideo:
+    """Fichier RGB24 brut mmappé : image k = octets [k × w × h × 3, (k + 1) × w × h × 3[."""
+
+    def __init__(self, path, width: int, height: int):
+        self.path = Path(path)
+        self.width, self.height = int(width), int(height)
+        self.frame_size = self.width * self.height * 3
+        if self.frame_size <= 0:
+            raise ValueError("pixelmap: largeur et hauteur requises pour une vidéo brute")
+        self._file = self.path.open("rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mm)
+        self.frame_count = len(self._mm) // self.frame_size
+        if not self.frame_count:
+            self.close()
+            raise ValueError(f"{self.path}: plus petit qu'une image {self.width}x{self.height}")
+
+    def frame(self, k: int) -> memoryview:
+        start = k * self.frame_size
+        return self._view[start:start + self.frame_size]
+
+    def close(self) -> None:
+        try:
+            self._view.release()
+            self._mm.close()
+        except Exception:
+            pass
+        self._file.close()
+
+
+def _ppm_header(mm) -> Tuple[int, int, int]:
+    """(largeur, hauteur, offset des pixels) d'un PPM binaire P6 8 bits."""
+    fields: List[bytes] = []
+    pos = 0
+    end = min(len(mm), 512)
+    while len(fields) < 4 and pos < end:
+        c = mm[pos:pos + 1]
+        if c == b"#":                               # commentaire jusqu'à la fin de ligne
+            while pos < end and mm[pos:pos + 1] != b"\n":
+                pos += 1
+        elif c.isspace():
+            pos += 1
+            continue
+        else:
+            start = pos
+            while pos < end and not mm[pos:pos + 1].isspace():
+                pos += 1
+            fields.append(bytes(mm[start:pos]))
+            continue
+        pos += 1
+    if len(fields) < 4 or fields[0] != b"P6" or int(fields[3]) != 255:
+        raise ValueError("PPM binaire P6 8 bits attendu")
+    return int(fields[1]), int(fields[2]), pos + 1     # un seul blanc après maxval
+
+
+class ImageSequence:
+    """Dossier de .ppm ; une seule image mmappée à la fois."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.files = sorted(self.path.glob("*.ppm"))
+        if not self.files:
+            raise ValueError(f"{self.path}: aucune image .ppm")
+        self.frame_count = len(self.files)
+        self._current = -1
+        self._file = None
+        self._mm = None
+        self._view: Optional[memoryview] = None
+        self.width, self.height, _ = self._open(0)
+
+    def _open(self, k: int) -> Tuple[int, int, int]:
+        self.close()
+        self._file = self.files[k].open("rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        w, h, offset = _ppm_header(self._mm)
+        self._view = memoryview(self._mm)[offset:offset + w * h * 3]
+        self._current = k
+        return w, h, offset
+
+    def frame(self, k: int) -> memoryview:
+        if k != self._current:
+            w, h, _ = self._open(k)
+            if (w, h) != (self.width, self.height):
+                raise ValueError(f"{self.files[k]}: {w}x{h}, attendu {self.width}x{self.height}")
+        return self._view
+
+    def close(self) -> None:
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._current = -1
+
+
+def open_source(path, width: int = 0, height: int = 0):
+    path = Path(path)
+    if path.is_dir():
+        return ImageSequence(path)
+    return RawVideo(path, width, height)
+
+
+# ----------------------------------------------------------------------
+# Mapping
+# ----------------------------------------------------------------------
+def grid_positions(fixture_ids: Sequence[int], cols: int = GRID_COLS) -> Dict[int, Tuple[float, float]]:
+    """Centre de la cellule de chaque fixture dans la grille de FixturesView, en [0, 1]²."""
+    cols = max(1, cols)
+    rows = max(1, (len(fixture_ids) + cols - 1) // cols)
+    return {fid: ((idx % cols + 0.5) / cols, (idx // cols + 0.5) / rows)
+            for idx, fid in enumerate(fixture_ids)}
+
+
+class PixelMapper:
+    def __init__(self, source, fps: float = 30.0, sample: int = 1, loop: bool = True,
+                 positions: Optional[Dict[int, Tuple[float, float]]] = None):
+        self.source = source
+        self.fps = max(0.1, float(fps))
+        self.sample = max(1, int(sample))
+        self.loop = bool(loop)
+        self.positions = {int(k): (float(v[0]), float(v[1])) for k, v in (positions or {}).items()}
+
+        self._t0: Optional[float] = None
+        self._ids: Tuple[int, ...] = ()
+        self._getter: Optional[Callable] = None
+        self._frame_index = -1
+        self._colors: List[Tuple[float, float, float]] = []
+
+    @classmethod
+    def from_config(cls, cfg: dict) -> "PixelMapper":
+        source = open_source(cfg["source"], int(cfg.get("width", 0)), int(cfg.get("height", 0)))
+        return cls(source, fps=float(cfg.get("fps", 30)), sample=int(cfg.get("sample", 1)),
+                   loop=bool(cfg.get("loop", True)), positions=cfg.get("positions"))
+
+    def _compile(self, ids: Tuple[int, ...]) -> None:
+        """Offsets des octets R, G, B de chaque point de chaque fixture → un itemgetter."""
+        w, h, s = self.source.width, self.source.height, self.sample
+        pos = {**grid_positions(ids), **self.positions}
+        offsets: List[int] = []
+        for fid in ids:
+            x, y = pos[fid]
+            cx = min(w - 1, max(0, int(x * w)))
+            cy = min(h - 1, max(0, int(y * h)))
+            for dy in range(s):
+                py = min(h - 1, max(0, cy - s // 2 + dy))
+                for dx in range(s):
+                    px = min(w - 1, max(0, cx - s // 2 + dx))
+                    o = (py * w + px) * 3
+                    offsets.extend((o, o + 1, o + 2))
+        self._ids = ids
+        self._getter = itemgetter(*offsets) if len(offsets) > 1 else (lambda buf, o=offsets[0]: (buf[o],))
+        self._frame_index = -1
+
+    def _sample(self, frame) -> None:
+        raw = self._getter(frame)
+        n = 3 * self.sample * self.sample
+        scale = 1.0 / (255.0 * self.sample * self.sample)
+        self._colors = [
+            (sum(raw[i:i + n:3]) * scale, sum(raw[i + 1:i + n:3]) * scale, sum(raw[i + 2:i + n:3]) * scale)
+            for i in range(0, len(raw), n)
+        ]
+
+    def apply(self, state: AppState, on_fixture_changed: Optional[Callable] = None,
+              now: Optional[float] = None) -> None:
+        """Écrit la couleur échantillonnée de l'image courante dans l'état (a et w inchangés)."""
+        now = time.monotonic() if now is None else now
+        if self._t0 is None:
+            self._t0 = now
+        ids = tuple(sorted(state.fixtures))
+        if not ids:
+            return
+        if ids != self._ids:
+            self._compile(ids)
+
+        k = int((now - self._t0) * self.fps)
+        count = self.source.frame_count
+        k = k % count if self.loop else min(k, count - 1)
+        if k != self._frame_index:
+            self._sample(self.source.frame(k))
+            self._frame_index = k
+
+        fixtures = state.fixtures
+        for fid, (r, g, b) in zip(ids, self._colors):
+            fx = fixtures[fid]
+            fx.set_color(r, g, b, fx.a, fx.w)
+            if on_fixture_changed:
+                on_fixture_changed(fid, fx)
+
+    def close(self) -> None:
+        self.source.close()
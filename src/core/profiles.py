@@ -0,0 +1,225 @@
+# fichier: src/core/profiles.py
+"""
+Bibliothèque de profils de fixtures (section `fixture_profiles:` + `patch:` de fixtures.yml).
+
+Un profil liste les canaux DMX de l'appareil, dans l'ordre, en 8 ou 16 bits :
+
+    fixture_profiles:
+      rgbw: [dimmer, r, g, b, w]
+      spot: [pan:16, tilt:16, dimmer, r, g, b, strobe]
+
+Les canaux de CHANNELS viennent du /frame ; les autres (pan, tilt, zoom…) sont
+des paramètres supplémentaires stockés par profil dans un array("f") ligne par
+fixture (Rig.set_extra, OSC /fixture/<id>/param nom valeur).
+
+Chaque profil est compilé une fois :
+- struct big-endian (B = 8 bits, H = 16 bits gros/fin comme en DMX), répété
+  pour les K fixtures du profil : un seul pack / unpack_from par groupe
+- table d'indices de collecte : ligne source (7 canaux + extras) → ordre DMX,
+  étendue aux K fixtures ; encoder = map() sur les indices puis quantification
+
+Rendre une frame = par profil, une collecte + une quantification + un pack ;
+puis une copie de tranche par fixture vers son univers (adresses quelconques).
+Relire un univers = par série de fixtures contiguës du même profil (calculées une
+fois au patch), un seul unpack_from du struct k fixtures.
+"""
+
+import struct
+from array import array
+from operator import truediv
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .state import CHANNELS, FRAME_STRIDE
+
+UNIVERSE_SIZE = 512
+_WIDTH = len(CHANNELS)
+_CANONICAL = {name: i for i, name in enumerate(CHANNELS)}
+# Valeur de repos des paramètres supplémentaires (pan/tilt au centre)
+EXTRA_DEFAULTS = {"pan": 0.5, "tilt": 0.5}
+
+
+class FixtureProfile:
+    """Profil compilé : layout DMX figé + encodeur/décodeur groupés."""
+
+    def __init__(self, name: str, channels: Sequence[str]):
+        self.name = name
+        names: List[str] = []
+        bits: List[int] = []
+        for spec in channels:
+            cname, _, b = str(spec).partition(":")
+            b = int(b or 8)
+            if b not in (8, 16):
+                raise ValueError(f"profil {name}: canal '{spec}' en {b} bits (8 ou 16)")
+            if cname in names:
+                raise ValueError(f"profil {name}: canal '{cname}' en double")
+            names.append(cname)
+            bits.append(b)
+        if not names:
+            raise ValueError(f"profil {name}: aucun canal")
+
+        self.channels: Tuple[str, ...] = tuple(names)
+        self.bits: Tuple[int, ...] = tuple(bits)
+        self.extras: Tuple[str, ...] = tuple(n for n in names if n not in _CANONICAL)
+        self.extra_defaults = tuple(EXTRA_DEFAULTS.get(n, 0.0) for n in self.extras)
+        self.fmt = "".join("H" if b == 16 else "B" for b in bits)
+        self.footprint = struct.calcsize(">" + self.fmt)
+
+        # Ligne source d'une fixture : 7 canaux du /frame puis ses extras
+        self.src_width = _WIDTH + len(self.extras)
+        self._gather = tuple(_CANONICAL[n] if n in _CANONICAL else _WIDTH + self.extras.index(n)
+                             for n in names)
+        # Inverse pour le décodage : (7 valeurs de base + canaux décodés) → ligne source
+        self._scatter = tuple(
+            [_WIDTH + names.index(c) if c in names else i for i, c in enumerate(CHANNELS)]
+            + [_WIDTH + names.index(e) for e in self.extras]
+        )
+        self._scale = tuple(65535.0 if b == 16 else 255.0 for b in bits)
+        self._plans: Dict[int, tuple] = {}
+
+    def _plan(self, k: int) -> tuple:
+        """(struct, indices de collecte, échelles) pour k fixtures, mis en cache."""
+        plan = self._plans.get(k)
+        if plan is None:
+            sw = self.src_width
+            gather = [i * sw + g for i in range(k) for g in self._gather]
+            plan = (struct.Struct(">" + self.fmt * k), gather, self._scale * k)
+            self._plans[k] = plan
+        return plan
+
+    def encode_many(self, src: Sequence[float], k: int) -> bytes:
+        """src : k lignes source concaténées (src_width valeurs chacune) → k × footprint octets."""
+        packer, gather, scale = self._plan(k)
+        # Une compréhension pour tout le groupe : bornage [0, 1] + arrondi 8/16 bits
+        return packer.pack(*[0 if v <= 0.0 else int(s) if v >= 1.0 else int(v * s + 0.5)
+                             for v, s in zip(map(src.__getitem__, gather), scale)])
+
+    def decode_many(self, data, k: int, offset: int = 0) -> List[float]:
+        """Inverse d'encode_many : valeurs [0, 1] dans l'ordre des canaux du profil, k fixtures."""
+        packer, _gather, scale = self._plan(k)
+        return list(map(truediv, packer.unpack_from(data, offset), scale))
+
+    def to_source(self, base: Sequence[float], decoded: Sequence[float]) -> List[float]:
+        """Ligne source (7 canaux + extras) : canaux décodés, sinon valeurs de `base`."""
+        combined = list(base[:_WIDTH])
+        combined.extend(decoded)
+        return list(map(combined.__getitem__, self._scatter))
+
+
+class Rig:
+    """Patch des fixtures : profil, univers, adresse ; rend / relit des univers DMX."""
+
+    def __init__(self, profiles: Dict[str, FixtureProfile],
+                 patch: Dict[int, Tuple[str, int, int]]):
+        self.profiles = profiles
+        self.patch = {}
+        for fid, (pname, universe, address) in patch.items():
+            prof = profiles.get(pname)
+            if prof is None:
+                raise ValueError(f"fixture {fid}: profil inconnu '{pname}'")
+            if not 1 <= address <= UNIVERSE_SIZE - prof.footprint + 1:
+                raise ValueError(f"fixture {fid}: adresse {address} hors univers ({prof.footprint} canaux)")
+            self.patch[int(fid)] = (pname, int(universe), int(address))
+
+        # Groupes par profil : ids (ordre fixe) + extras ligne par fixture
+        self._groups: Dict[str, List[int]] = {}
+        for fid in sorted(self.patch):
+            self._groups.setdefault(self.patch[fid][0], []).append(fid)
+        self._row: Dict[int, int] = {}
+        self.extras: Dict[str, array] = {}
+        for pname, fids in self._groups.items():
+            prof = profiles[pname]
+            self.extras[pname] = array("f", prof.extra_defaults * len(fids))
+            for k, fid in enumerate(fids):
+                self._row[fid] = k
+        self.universes = sorted({u for _p, u, _a in self.patch.values()})
+
+        # Décodage : par univers, séries (profil, offset, [(ligne, fid)…]) de fixtures
+        # du même profil à adresses contiguës
+        self._runs: Dict[int, List[Tuple[str, int, List[Tuple[int, int]]]]] = {}
+        for pname, fids in self._groups.items():
+            fp = profiles[pname].footprint
+            run = None
+            for fid in sorted(fids, key=lambda f: self.patch[f][1:]):
+                _p, universe, address = self.patch[fid]
+                if run is not None and run[0] == universe and run[1] + len(run[2]) * fp == address - 1:
+                    run[2].append((self._row[fid], fid))
+                    continue
+                run = (universe, address - 1, [(self._row[fid], fid)])
+                self._runs.setdefault(universe, []).append((pname, run[1], run[2]))
+
+    @classmethod
+    def from_config(cls, profiles_cfg: Optional[dict], patch_cfg: Optional[dict]) -> Optional["Rig"]:
+        """None si aucun patch n'est déclaré."""
+        if not patch_cfg:
+            return None
+        profiles = {str(name): FixtureProfile(str(name), chans or ())
+                    for name, chans in (profiles_cfg or {}).items()}
+        patch = {}
+        for fid, entry in patch_cfg.items():
+            pname, universe, address = entry
+            patch[int(fid)] = (str(pname), int(universe), int(address))
+        return cls(profiles, patch)
+
+    # ------------------------------------------------------------------
+    # Paramètres supplémentaires (pan, tilt…)
+    # ------------------------------------------------------------------
+    def set_extra(self, fid: int, name: str, value: float) -> bool:
+        entry = self.patch.get(fid)
+        if entry is None:
+            return False
+        prof = self.profiles[entry[0]]
+        try:
+            col = prof.extras.index(name)
+        except ValueError:
+            return False
+        self.extras[entry[0]][self._row[fid] * len(prof.extras) + col] = float(value)
+        return True
+
+    # ------------------------------------------------------------------
+    # Encodage (/frame → univers)
+    # ------------------------------------------------------------------
+    def render(self, flat: Sequence[float]) -> Dict[int, bytearray]:
+        """/frame à plat (après masters et étage de sortie) → {univers: 512 octets}."""
+        pos = {int(flat[i]): i + 1 for i in range(0, len(flat), FRAME_STRIDE)}
+        zero = (0.0,) * _WIDTH
+        out = {u: bytearray(UNIVERSE_SIZE) for u in self.universes}
+        for pname, fids in self._groups.items():
+            prof = self.profiles[pname]
+            ne = len(prof.extras)
+            extras = self.extras[pname]
+            src: List[float] = []
+            for k, fid in enumerate(fids):
+                p = pos.get(fid)
+                src.extend(flat[p:p + _WIDTH] if p is not None else zero)
+                if ne:
+                    src.extend(extras[k * ne:(k + 1) * ne])
+            packed = prof.encode_many(src, len(fids))
+            fp = prof.footprint
+            for k, fid in enumerate(fids):
+                _p, universe, address = self.patch[fid]
+                out[universe][address - 1:address - 1 + fp] = packed[k * fp:(k + 1) * fp]
+        return out
+
+    # ------------------------------------------------------------------
+    # Décodage (univers reçu → état)
+    # ------------------------------------------------------------------
+    def decode(self, universe: int, data, base: Callable[[int], Sequence[float]]) -> Dict[int, List[float]]:
+        """
+        Univers DMX reçu → {fid: 7 valeurs de CHANNELS}. Les canaux absents du profil
+        gardent leur valeur `base(fid)` ; les extras sont rangés dans le rig.
+        """
+        if len(data) < UNIVERSE_SIZE:
+            data = bytes(data).ljust(UNIVERSE_SIZE, b"\0")
+        out: Dict[int, List[float]] = {}
+        for pname, offset, run in self._runs.get(universe, ()):
+            prof = self.profiles[pname]
+            ne = len(prof.extras)
+            extras = self.extras[pname]
+            nc = len(prof.channels)
+            values = prof.decode_many(data, len(run), offset)
+            for i, (k, fid) in enumerate(run):
+                src = prof.to_source(base(fid), values[i * nc:(i + 1) * nc])
+                if ne:
+                    extras[k * ne:(k + 1) * ne] = array("f", src[_WIDTH:])
+                out[fid] = src[:_WIDTH]
+        return out
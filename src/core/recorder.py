@@ -0,0 +1,344 @@
+# fichier: src/core/recorder.py
+"""
+Enregistreur de show en colonnes compressées (section `recorder:` de fixtures.yml).
+
+Chaque /frame construit en WRITE (Engine.build_frame, avant masters et étage de
+sortie) est ajouté au bloc courant ; un bloc couvre `chunk_s` secondes (ou
+`max_frames` frames, ou s'arrête quand la liste des fixtures change). Un thread
+l'encode puis l'écrit : la boucle principale ne fait qu'un array("f") par frame.
+
+Format (little-endian) :
+
+    header  : magic "SBRC", version u16, channels u16, codec u8 (0 zlib, 1 lzma), pad
+    bloc    : "CHNK", frames u32, fixtures u32, t0 f64, t1 f64, taille u32, charge compressée
+    charge  : temps  frames x u32 (µs depuis t0, delta avec la frame précédente)
+              ids    fixtures x u32
+              colonnes (fixture x canal) : frames x u32 = bits float32 XOR valeur précédente
+    index   : blocs x (t0 f64, t1 f64, offset u64)
+    footer  : "SBIX", offset de l'index u64, nb de blocs u32 (fin de fichier)
+
+Une colonne qui ne bouge pas devient une suite de zéros : zlib/lzma la réduisent
+à presque rien. Le XOR des bits float32 est sans perte. Les temps sont relatifs
+au début de l'enregistrement.
+
+Mémoire bornée : un bloc en cours + au plus QUEUE_CHUNKS blocs en attente
+d'écriture ; côté lecture, seul le dernier bloc décodé est gardé. Sans footer
+(arrêt brutal), l'index est reconstruit en parcourant les en-têtes de blocs,
+sans rien décompresser.
+"""
+
+import lzma
+import mmap
+import queue
+import struct
+import threading
+import time
+import zlib
+from array import array
+from bisect import bisect_right
+from itertools import accumulate, chain
+from operator import sub, xor
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from utils.log import get_logger
+from .state import AppState, CHANNELS, FRAME_STRIDE
+
+logger = get_logger(__name__)
+
+MAGIC = b"SBRC"
+VERSION = 1
+_FILE_HEADER = struct.Struct("<4sHHB7x")
+_CHUNK = struct.Struct("<4sIIddI")
+_INDEX_ENTRY = struct.Struct("<ddQ")
+_FOOTER = struct.Struct("<4sQI")
+CODECS = {"zlib": 0, "lzma": 1}
+QUEUE_CHUNKS = 4
+_WIDTH = len(CHANNELS)
+
+
+# ----------------------------------------------------------------------
+# Encodage d'un bloc
+# ----------------------------------------------------------------------
+def _compress(codec: int, data: bytes, level: Optional[int]) -> bytes:
+    if codec == CODECS["lzma"]:
+        return lzma.compress(data, preset=6 if level is None else level)
+    return zlib.compress(data, 6 if level is None else level)
+
+
+def _decompress(codec: int, data) -> bytes:
+    if codec == CODECS["lzma"]:
+        return lzma.decompress(data)
+    return zlib.decompress(data)
+
+
+def encode_chunk(times: Sequence[float], ids: Sequence[int], rows: Sequence[array]) -> bytes:
+    """
+    times: temps relatifs (s) ; rows: un array("f") par frame, au format /frame
+    [id, r, g, b, a, w, dimmer, strobe] * N. Renvoie la charge non compressée.
+    """
+    t0 = times[0]
+    us = array("I", (int(round((t - t0) * 1e6)) for t in times))
+    out = bytearray(array("I", map(sub, us, chain((0,), us))).tobytes())
+    out += array("I", ids).tobytes()
+
+    # Vue "bits" de toutes les frames, ligne par ligne
+    bits = array("I")
+    for row in rows:
+        bits.frombytes(row.tobytes())
+    stride = len(ids) * FRAME_STRIDE
+    for j in range(stride):
+        if j % FRAME_STRIDE == 0:                  # colonne des ids : constante dans le bloc
+            continue
+        col = bits[j::stride]
+        out += array("I", map(xor, col, chain((0,), col))).tobytes()
+    return bytes(out)
+
+
+def decode_chunk(payload: bytes, frames: int, fixtures: int) -> Tuple[array, List[int], array]:
+    """Inverse d'encode_chunk : (temps en µs, ids, valeurs float32 ligne par ligne, 7 par fixture)."""
+    view = memoryview(payload)
+    pos = 4 * frames
+    us = array("I", accumulate(view[:pos].cast("I")))
+    ids = view[pos:pos + 4 * fixtures].cast("I").tolist()
+    pos += 4 * fixtures
+
+    width = fixtures * _WIDTH
+    bits = array("I", bytes(4 * frames * width))
+    for c in range(width):
+        deltas = view[pos:pos + 4 * frames].cast("I")
+        bits[c::width] = array("I", accumulate(deltas, xor))
+        pos += 4 * frames
+    values = array("f")
+    values.frombytes(bits.tobytes())
+    return us, ids, values
+
+
+# ----------------------------------------------------------------------
+# Écriture
+# ----------------------------------------------------------------------
+class ShowRecorder:
+    def __init__(self, path, chunk_s: float = 2.0, codec: str = "zlib",
+                 level: Optional[int] = None, max_frames: int = 1024):
+        if codec not in CODECS:
+            raise ValueError(f"codec inconnu: {codec} (zlib | lzma)")
+        self.path = Path(path)
+        self.chunk_s = max(0.1, float(chunk_s))
+        self.codec = CODECS[codec]
+        self.level = level
+        self.max_frames = max(1, int(max_frames))
+
+        self._t_start: Optional[float] = None
+        self._ids: List[float] = []
+        self._times: List[float] = []
+        self._rows: List[array] = []
+        self._pending: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=QUEUE_CHUNKS)
+        self._thread: Optional[threading.Thread] = None
+        self._file = None
+        self._index: List[Tuple[float, float, int]] = []
+        self.frames = 0
+        self.bytes_written = 0
+
+    @classmethod
+    def from_config(cls, cfg: Optional[dict]) -> "ShowRecorder":
+        """Un fichier par session : <dir>/show_AAAAMMJJ-HHMMSS.sbrec"""
+        cfg = cfg or {}
+        name = time.strftime("show_%Y%m%d-%H%M%S.sbrec")
+        return cls(
+            Path(cfg.get("dir", "shows/recordings")) / name,
+            chunk_s=float(cfg.get("chunk_s", 2.0)),
+            codec=str(cfg.get("codec", "zlib")),
+            level=cfg.get("level"),
+        )
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("wb")
+        self._file.write(_FILE_HEADER.pack(MAGIC, VERSION, _WIDTH, self.codec))
+        self._thread = threading.Thread(target=self._writer_loop, name="ShowRecorder", daemon=True)
+        self._thread.start()
+        logger.info("Recording show to %s", self.path)
+
+    def add_frame(self, t: float, flat: Sequence[float]) -> None:
+        """Frame de build_frame : t (perf_counter) + [id, r, g, b, a, w, dimmer, strobe] * N."""
+        if self._thread is None or not flat:
+            return
+        if self._t_start is None:
+            self._t_start = t
+        ids = flat[0::FRAME_STRIDE]
+        if self._rows and (ids != self._ids or len(self._rows) >= self.max_frames
+                           or t - self._t_start - self._times[0] >= self.chunk_s):
+            self._seal()
+        if not self._rows:
+            self._ids = ids
+        self._times.append(t - self._t_start)
+        self._rows.append(array("f", flat))
+        self.frames += 1
+
+    def _seal(self) -> None:
+        chunk = (self._times, [int(i) for i in self._ids], self._rows)
+        self._times, self._rows = [], []
+        # File bornée : si l'écriture ne suit pas, la boucle attend (la mémoire ne grossit pas)
+        self._pending.put(chunk)
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        if self._rows:
+            self._seal()
+        self._pending.put(None)
+        self._thread.join()
+        self._thread = None
+        index_offset = self._file.tell()
+        for entry in self._index:
+            self._file.write(_INDEX_ENTRY.pack(*entry))
+        self._file.write(_FOOTER.pack(b"SBIX", index_offset, len(self._index)))
+        self._file.close()
+        self._file = None
+        logger.info("Show recording closed: %d frames, %d chunks, %d bytes",
+                    self.frames, len(self._index), self.bytes_written)
+
+    def _writer_loop(self) -> None:
+        while True:
+            chunk = self._pending.get()
+            if chunk is None:
+                return
+            times, ids, rows = chunk
+            try:
+                payload = _compress(self.codec, encode_chunk(times, ids, rows), self.level)
+                offset = self._file.tell()
+                self._file.write(_CHUNK.pack(b"CHNK", len(rows), len(ids), times[0], times[-1], len(payload)))
+                self._file.write(payload)
+                self._file.flush()
+                self._index.append((times[0], times[-1], offset))
+                self.bytes_written = offset + _CHUNK.size + len(payload)
+            except Exception as e:
+                logger.error("Show recorder write failed: %s", e)
+
+
+# ----------------------------------------------------------------------
+# Lecture / scrub
+# ----------------------------------------------------------------------
+class ShowRecording:
+    """Enregistrement ouvert en lecture (mmap) ; frame_at(t) ne décode que le bloc concerné."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = self.path.open("rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, channels, codec = _FILE_HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION or channels != _WIDTH:
+            self.close()
+            raise ValueError(f"{self.path}: enregistrement invalide ou incompatible")
+        self.codec = codec
+        self._index = self._read_index()
+        self._starts = [entry[0] for entry in self._index]
+        self._cached: Optional[Tuple[int, array, List[int], array]] = None
+
+    def _read_index(self) -> List[Tuple[float, float, int]]:
+        mm = self._mm
+        end = len(mm)
+        if end >= _FILE_HEADER.size + _FOOTER.size:
+            tag, offset, count = _FOOTER.unpack_from(mm, end - _FOOTER.size)
+            if tag == b"SBIX" and offset + count * _INDEX_ENTRY.size == end - _FOOTER.size:
+                return [_INDEX_ENTRY.unpack_from(mm, offset + k * _INDEX_ENTRY.size) for k in range(count)]
+        # Pas de footer (enregistrement interrompu) : parcours des en-têtes de blocs
+        index = []
+        pos = _FILE_HEADER.size
+        while pos + _CHUNK.size <= end:
+            tag, _frames, _fixtures, t0, t1, size = _CHUNK.unpack_from(mm, pos)
+            if tag != b"CHNK" or pos + _CHUNK.size + size > end:
+                break
+            index.append((t0, t1, pos))
+            pos += _CHUNK.size + size
+        return index
+
+    @property
+    def duration(self) -> float:
+        return self._index[-1][1] if self._index else 0.0
+
+    @property
+    def chunk_count(self) -> int:
+        return len(self._index)
+
+    def _chunk(self, k: int) -> Tuple[array, List[int], array]:
+        cached = self._cached
+        if cached is not None and cached[0] == k:
+            return cached[1:]
+        offset = self._index[k][2]
+        _tag, frames, fixtures, _t0, _t1, size = _CHUNK.unpack_from(self._mm, offset)
+        start = offset + _CHUNK.size
+        us, ids, values = decode_chunk(_decompress(self.codec, self._mm[start:start + size]), frames, fixtures)
+        self._cached = (k, us, ids, values)
+        return us, ids, values
+
+    def frame_at(self, t: float) -> Tuple[List[int], array]:
+        """Dernière frame enregistrée à t (s depuis le début) : (ids, 7 valeurs par fixture)."""
+        if not self._index:
+            return [], array("f")
+        k = max(0, bisect_right(self._starts, t) - 1)
+        us, ids, values = self._chunk(k)
+        i = max(0, bisect_right(us, int(round((t - self._index[k][0]) * 1e6))) - 1)
+        width = len(ids) * _WIDTH
+        return ids, values[i * width:(i + 1) * width]
+
+    def apply(self, t: float, state: AppState,
+              on_fixture_changed: Optional[Callable] = None) -> None:
+        """Recopie la frame à t dans AppState (scrub)."""
+        ids, values = self.frame_at(t)
+        for k, fid in enumerate(ids):
+            fx = state.ensure_fixture(fid)
+            fx.set_values(values[k * _WIDTH:(k + 1) * _WIDTH])
+            if on_fixture_changed:
+                on_fixture_changed(fid, fx)
+
+    def close(self) -> None:
+        self._cached = None
+        try:
+            self._mm.close()
+        except Exception:
+            pass
+        self._file.close()
+
+
+class ShowPlayer:
+    """Lecture d'un enregistrement dans AppState : play/pause, vitesse, seek (scrub)."""
+
+    def __init__(self, recording: ShowRecording, speed: float = 1.0):
+        self.recording = recording
+        self.speed = float(speed)
+        self.position = 0.0
+        self.playing = False
+        self._last: Optional[float] = None
+        self._dirty = True
+
+    def play(self) -> None:
+        self.playing = True
+        self._last = None
+
+    def pause(self) -> None:
+        self.playing = False
+
+    def seek(self, t: float) -> None:
+        self.position = max(0.0, min(float(t), self.recording.duration))
+        self._dirty = True
+
+    @property
+    def finished(self) -> bool:
+        return self.position >= self.recording.duration
+
+    def tick(self, state: AppState, on_fixture_changed: Optional[Callable] = None,
+             now: Optional[float] = None) -> None:
+        """À appeler une fois par tick : avance (si lecture) et applique la frame courante."""
+        now = time.monotonic() if now is None else now
+        if self.playing:
+            if self._last is not None:
+                self.seek(self.position + (now - self._last) * self.speed)
+            self._last = now
+            if self.finished:
+                self.playing = False
+        if self._dirty:
+            self._dirty = False
+            self.recording.apply(self.position, state, on_fixture_changed)
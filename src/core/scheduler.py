@@ -1,3 +1,4 @@
+import threading
 import time
 
 class Scheduler:
@@ -13,6 +14,9 @@ class Scheduler:
         self._fps = 0.0
         self._sec_accum = 0.0
         self._sec_frames = 0
+        self._after_id = None
+        self._in_tick = False
+        self._wake_pending = False
 
     @property
     def fps(self) -> float:
@@ -23,11 +27,27 @@ class Scheduler:
             return
         self._running = True
         self._last_tick_time = time.monotonic()
-        self.root.after(self.interval_ms, self._tick)
+        self._after_id = self.root.after(self.interval_ms, self._tick)
 
     def stop(self):
         self._running = False
 
+    def set_interval(self, interval_ms):
+        """Nouvelle période, prise en compte au tick suivant (veille / réveil)."""
+        self.interval_ms = max(1, int(interval_ms))
+
+    def wake(self):
+        """Tick immédiat au lieu d'attendre la fin de la période courante (thread Tk uniquement)."""
+        if not self._running:
+            return
+        if self._in_tick:
+            # Réveil demandé pendant le tick : c'est la fin du tick qui replanifie
+            self._wake_pending = True
+            return
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+        self._after_id = self.root.after_idle(self._tick)
+
     def _tick(self):
         if not self._running:
             return
@@ -44,10 +64,90 @@ class Scheduler:
             self._sec_frames = 0
 
         if callable(self.on_tick):
+            self._in_tick = True
             try:
                 self.on_tick()
             except Exception:
                 # Keep UI alive even if callback errors
                 pass
+            finally:
+                self._in_tick = False
+
+        if self._wake_pending:
+            self._wake_pending = False
+            self._after_id = self.root.after_idle(self._tick)
+        else:
+            self._after_id = self.root.after(self.interval_ms, self._tick)
+
+class ClockScheduler:
+    """
+    Scheduler autonome (sans Tk) pour le mode headless : même API que Scheduler
+    (fps, start, stop), mais piloté par son propre thread et une horloge
+    monotone à échéances fixes (pas de dérive cumulée).
+    """
+    def __init__(self, interval_ms=33, on_tick=None):
+        self.interval_ms = float(interval_ms)
+        self.on_tick = on_tick
+        self._running = False
+        self._thread = None
+        self._fps = 0.0
+        self._wake = threading.Event()
+
+    @property
+    def fps(self) -> float:
+        return self._fps
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self.run, name="Clock-Scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+
+    def set_interval(self, interval_ms):
+        """Nouvelle période, prise en compte dès l'attente en cours (veille / réveil)."""
+        self.interval_ms = float(interval_ms)
+
+    def wake(self):
+        """Interrompt l'attente en cours : tick immédiat. Appelable depuis n'importe quel thread."""
+        self._wake.set()
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def run(self):
+        """Boucle d'horloge (bloquante). Appelée par start() dans un thread dédié."""
+        self._running = True
+        interval = self.interval_ms / 1000.0
+        next_tick = time.monotonic() + interval
+        sec_start = time.monotonic()
+        sec_frames = 0
+        while self._running:
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                # Attente interruptible : wake() (entrée OSC en veille) n'attend pas la fin d'un tick lent
+                if self._wake.wait(delay):
+                    self._wake.clear()
+                    next_tick = time.monotonic()
+            interval = self.interval_ms / 1000.0
+            now = time.monotonic()
+            # En retard de plus d'une période : on se recale plutôt que de rattraper
+            next_tick = max(next_tick + interval, now)
+
+            sec_frames += 1
+            if now - sec_start >= 1.0:
+                self._fps = sec_frames / (now - sec_start)
+                sec_start = now
+                sec_frames = 0
 
-        self.root.after(self.interval_ms, self._tick)
\ No newline at end of file
+            if callable(self.on_tick):
+                try:
+                    self.on_tick()
+                except Exception:
+                    # Garder l'horloge vivante même si le callback échoue
+                    pass
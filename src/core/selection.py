@@ -0,0 +1,109 @@
+# fichier: src/core/selection.py
+
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class Selection:
+    """
+    Sélection multiple de fixtures, tenue comme un index :
+    - ids triés (insertion/retrait par bisect) + ensemble pour l'appartenance en O(1)
+    - `primary` : fixture de référence (panneau sliders, /ui/select)
+    - jeux de sélection enregistrés par slot
+    - `version` s'incrémente à chaque changement (rafraîchissements paresseux)
+    """
+
+    def __init__(self):
+        self._ids: List[int] = []
+        self._members = set()
+        self.primary: Optional[int] = None
+        self.version = 0
+        self._saved: Dict[int, Tuple[Tuple[int, ...], Optional[int]]] = {}
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+    @property
+    def ids(self) -> List[int]:
+        return self._ids
+
+    def __contains__(self, fid) -> bool:
+        return fid in self._members
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    # ------------------------------------------------------------------
+    # Modifications
+    # ------------------------------------------------------------------
+    def set(self, ids: Iterable[int], primary: Optional[int] = None) -> None:
+        self._members = {int(f) for f in ids}
+        self._ids = sorted(self._members)
+        if primary is None or primary not in self._members:
+            primary = self._ids[0] if self._ids else None
+        self.primary = primary
+        self.version += 1
+
+    def add(self, ids: Iterable[int]) -> None:
+        for fid in ids:
+            fid = int(fid)
+            if fid not in self._members:
+                self._members.add(fid)
+                insort(self._ids, fid)
+        if self.primary is None and self._ids:
+            self.primary = self._ids[0]
+        self.version += 1
+
+    def toggle(self, fid: int) -> None:
+        fid = int(fid)
+        if fid in self._members:
+            self._members.discard(fid)
+            del self._ids[bisect_left(self._ids, fid)]
+            if self.primary == fid:
+                self.primary = self._ids[-1] if self._ids else None
+        else:
+            self._members.add(fid)
+            insort(self._ids, fid)
+            self.primary = fid
+        self.version += 1
+
+    def select_range(self, fid: int, order: Sequence[int]) -> None:
+        """Ajoute la plage primary → fid selon l'ordre d'affichage `order`."""
+        fid = int(fid)
+        if self.primary is None or self.primary not in order or fid not in order:
+            self.set([fid], fid)
+            return
+        a, b = order.index(self.primary), order.index(fid)
+        if a > b:
+            a, b = b, a
+        primary = self.primary
+        self.add(order[a:b + 1])
+        self.primary = primary
+
+    def clear(self) -> None:
+        self.set(())
+
+    def discard_missing(self, existing) -> None:
+        """Retire les ids qui n'existent plus (ex. après changement du nombre de fixtures)."""
+        if any(fid not in existing for fid in self._ids):
+            self.set([fid for fid in self._ids if fid in existing], self.primary)
+
+    # ------------------------------------------------------------------
+    # Jeux enregistrés
+    # ------------------------------------------------------------------
+    def store(self, slot: int) -> None:
+        self._saved[int(slot)] = (tuple(self._ids), self.primary)
+
+    def recall(self, slot: int) -> bool:
+        saved = self._saved.get(int(slot))
+        if saved is None:
+            return False
+        ids, primary = saved
+        self.set(ids, primary)
+        return True
+
+    def saved_slots(self) -> List[int]:
+        return sorted(self._saved)
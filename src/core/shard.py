@@ -0,0 +1,215 @@
+# fichier: src/core/shard.py
+"""
+Étage de sortie réparti sur plusieurs processus (section `sharding:` de fixtures.yml),
+pour les très grands rigs où les LUT de sortie dépassent le budget d'un cœur.
+
+- Les fixtures du /frame sont découpées en `workers` tranches contiguës ; chaque
+  processus du ProcessPoolExecutor (spawn) compile ses propres LUT une fois, lit
+  sa tranche dans un bloc shared_memory d'entrée et écrit le résultat dans le bloc
+  de sortie (float64 : mêmes valeurs que l'étage en ligne, ids exacts).
+- Échéance par frame (`deadline_ms`) : une tranche en retard n'est pas attendue,
+  ses valeurs de la frame précédente sont réutilisées (ou calculées en ligne s'il
+  n'y en a pas encore) ; elle n'est pas resoumise tant qu'elle n'a pas fini, donc
+  une seule écriture en cours par zone des blocs partagés.
+- En dessous de `min_fixtures` (ou au-delà de `capacity`), tout reste en ligne :
+  l'aller-retour vers les processus coûte plus cher que les LUT elles-mêmes.
+"""
+
+import copy
+import multiprocessing as mp
+import signal
+import time
+from array import array
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from utils.log import get_logger
+from .output import OutputProcessor
+from .state import FRAME_STRIDE
+
+logger = get_logger(__name__)
+
+_ITEM = array("d").itemsize
+
+
+# ----------------------------------------------------------------------
+# Processus de calcul
+# ----------------------------------------------------------------------
+_worker: dict = {}
+
+
+def _init_worker(output_cfg: Optional[dict], in_name: str, out_name: str) -> None:
+    # Ctrl+C atteint tout le groupe de processus : c'est le parent qui pilote l'arrêt
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    shm_in = shared_memory.SharedMemory(name=in_name)
+    shm_out = shared_memory.SharedMemory(name=out_name)
+    _worker.update(
+        shms=(shm_in, shm_out),
+        inp=shm_in.buf.cast("d"),
+        out=shm_out.buf.cast("d"),
+        output=OutputProcessor.from_config(output_cfg),
+        procs={},
+    )
+
+
+def _run_shard(shard: int, start: int, stop: int) -> int:
+    """Traite les valeurs [start, stop[ du bloc d'entrée (lignes entières) vers le bloc de sortie."""
+    procs = _worker["procs"]
+    proc = procs.get(shard)
+    if proc is None:
+        # Copie légère : LUT partagées, plan d'indices propre à la tranche (pas de recalcul
+        # quand le même processus enchaîne des tranches différentes)
+        proc = procs[shard] = copy.copy(_worker["output"])
+    _worker["out"][start:stop] = array("d", proc.process(_worker["inp"][start:stop].tolist()))
+    return shard
+
+
+def _ping() -> int:
+    return 0
+
+
+# ----------------------------------------------------------------------
+# Côté moteur
+# ----------------------------------------------------------------------
+class ShardedOutput:
+    """Même interface que OutputProcessor (process, active) ; start() / close() en plus."""
+
+    def __init__(self, output_cfg: Optional[dict], workers: int = 0, deadline_ms: float = 8.0,
+                 capacity: int = 4096, min_fixtures: int = 512):
+        self._output_cfg = output_cfg
+        self.output = OutputProcessor.from_config(output_cfg)      # chemin en ligne / repli
+        self.workers = int(workers) or (mp.cpu_count() or 1)
+        self.deadline_s = max(0.0, float(deadline_ms)) / 1000.0
+        self.capacity = max(1, int(capacity))
+        self.min_fixtures = max(1, int(min_fixtures))
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._shm_in: Optional[shared_memory.SharedMemory] = None
+        self._shm_out: Optional[shared_memory.SharedMemory] = None
+        self._in = None
+        self._out = None
+
+        self._layout: Tuple[int, ...] = ()                # ids de la dernière découpe
+        self._ranges: List[Tuple[int, int]] = []         # (début, fin) en valeurs, par tranche
+        self._pending: Dict[int, object] = {}            # tranche -> future en cours
+        self._last: List[float] = []                     # dernière sortie complète
+
+        self.frames = 0
+        self.late_shards = 0
+
+    @classmethod
+    def from_config(cls, output_cfg: Optional[dict], cfg: Optional[dict]) -> "ShardedOutput":
+        cfg = cfg or {}
+        return cls(
+            output_cfg,
+            workers=int(cfg.get("workers", 0)),
+            deadline_ms=float(cfg.get("deadline_ms", 8)),
+            capacity=int(cfg.get("capacity", 4096)),
+            min_fixtures=int(cfg.get("min_fixtures", 512)),
+        )
+
+    @property
+    def active(self) -> bool:
+        return self.output.active
+
+    # ------------------------------------------------------------------
+    # Démarrage / arrêt
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        if self._pool is not None or not self.output.active:
+            return
+        size = self.capacity * FRAME_STRIDE * _ITEM
+        self._shm_in = shared_memory.SharedMemory(create=True, size=size)
+        self._shm_out = shared_memory.SharedMemory(create=True, size=size)
+        self._in = self._shm_in.buf.cast("d")
+        self._out = self._shm_out.buf.cast("d")
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=mp.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self._output_cfg, self._shm_in.name, self._shm_out.name),
+        )
+        # Lancer les processus maintenant plutôt qu'à la première grosse frame
+        for _ in range(self.workers):
+            self._pool.submit(_ping)
+        logger.info("Output sharding: %d workers, deadline %.1f ms", self.workers, self.deadline_s * 1000)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        self._pending.clear()
+        for view in (self._in, self._out):
+            if view is not None:
+                view.release()
+        self._in = self._out = None
+        for shm in (self._shm_in, self._shm_out):
+            if shm is not None:
+                try:
+                    shm.close()
+                    shm.unlink()
+                except Exception:
+                    pass
+        self._shm_in = self._shm_out = None
+
+    # ------------------------------------------------------------------
+    # Frame
+    # ------------------------------------------------------------------
+    def process(self, flat: Sequence[float]) -> List[float]:
+        n = len(flat) // FRAME_STRIDE
+        if self._pool is None or not self.output.active or not self.min_fixtures <= n <= self.capacity:
+            return self.output.process(flat)
+        try:
+            return self._process_sharded(flat)
+        except Exception as e:
+            # Pool cassé (processus tué…) : retour définitif au calcul en ligne
+            logger.error("Output sharding failed, processing inline: %s", e)
+            self.close()
+            return self.output.process(flat)
+
+    def _process_sharded(self, flat: Sequence[float]) -> List[float]:
+        deadline = time.perf_counter() + self.deadline_s
+        ids = tuple(flat[0::FRAME_STRIDE])
+        if ids != self._layout:
+            self._relayout(ids)
+
+        # Soumettre les tranches libres ; une tranche encore en cours garde sa zone
+        inp = self._in
+        for shard, (a, b) in enumerate(self._ranges):
+            if shard in self._pending:
+                continue
+            inp[a:b] = array("d", flat[a:b])
+            self._pending[shard] = self._pool.submit(_run_shard, shard, a, b)
+
+        wait(self._pending.values(), timeout=max(0.0, deadline - time.perf_counter()),
+             return_when=FIRST_EXCEPTION)
+
+        out = self._last if len(self._last) == len(flat) else None
+        result = list(flat) if out is None else out
+        for shard, (a, b) in enumerate(self._ranges):
+            fut = self._pending.get(shard)
+            if fut is not None and fut.done():
+                del self._pending[shard]
+                fut.result()                                      # propage une erreur du processus
+                result[a:b] = self._out[a:b].tolist()
+            elif out is None:
+                # Pas encore de frame précédente pour cette découpe : calcul en ligne
+                result[a:b] = self.output.process(flat[a:b])
+            else:
+                self.late_shards += 1                             # valeurs précédentes conservées
+        self._last = result
+        self.frames += 1
+        return list(result)
+
+    def _relayout(self, ids: Tuple[float, ...]) -> None:
+        """Nouvelle liste de fixtures : attendre les tranches en cours, puis redécouper."""
+        if self._pending:
+            wait(self._pending.values())
+            self._pending.clear()
+        n = len(ids)
+        k = max(1, min(self.workers, n))
+        bounds = [n * i // k for i in range(k + 1)]
+        self._ranges = [(bounds[i] * FRAME_STRIDE, bounds[i + 1] * FRAME_STRIDE) for i in range(k)]
+        self._layout = ids
+        self._last = []
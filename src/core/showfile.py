@@ -0,0 +1,199 @@
+# fichier: src/core/showfile.py
+"""
+Bibliothèque de cues binaire (fichier show), lue via mmap.
+
+Format (little-endian, sections alignées sur 8 octets) :
+
+    header   : magic "SBSH", version u16, channels u16, fixture_count u32,
+               cue_count u32, ids_offset u64, index_offset u64, data_offset u64
+    ids      : fixture_count x u32            (ids des fixtures, ordre des records)
+    index    : cue_count x u32 (cue id)  +  cue_count x u64 (offset du record)
+    records  : cue_count x (fixture_count x channels x float32)
+
+Rappeler une cue = découper une memoryview sur le mmap (aucune copie).
+"""
+
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+from .state import AppState, CHANNELS
+
+MAGIC = b"SBSH"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHIIQQQ")
+
+
+def _align8(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def snapshot_state(state: AppState, fixture_ids: Sequence[int]) -> array:
+    """Capture l'état des fixtures (ordre `fixture_ids`) en float32 à plat."""
+    out = array("f")
+    for fid in fixture_ids:
+        fx = state.fixtures.get(fid)
+        out.extend(fx.values() if fx is not None else (0.0,) * len(CHANNELS))
+    return out
+
+
+def write_show_file(path, fixture_ids: Sequence[int], cues: Mapping[int, Sequence[float]]) -> None:
+    """
+    Écrit un fichier show complet (écriture atomique via fichier temporaire).
+    `cues`: cue_id -> valeurs à plat (len = len(fixture_ids) * channels).
+    """
+    path = Path(path)
+    channels = len(CHANNELS)
+    stride = len(fixture_ids) * channels
+    cue_ids = sorted(int(c) for c in cues.keys())
+
+    ids_offset = _align8(_HEADER.size)
+    index_offset = _align8(ids_offset + 4 * len(fixture_ids))
+    data_offset = _align8(index_offset + 12 * len(cue_ids))
+    record_size = 4 * stride
+
+    offsets = array("Q", (data_offset + i * record_size for i in range(len(cue_ids))))
+    header = _HEADER.pack(
+        MAGIC, VERSION, channels, len(fixture_ids), len(cue_ids),
+        ids_offset, index_offset, data_offset,
+    )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(header)
+        f.write(b"\0" * (ids_offset - _HEADER.size))
+        f.write(array("I", (int(fid) for fid in fixture_ids)).tobytes())
+        f.write(b"\0" * (index_offset - ids_offset - 4 * len(fixture_ids)))
+        f.write(array("I", cue_ids).tobytes())
+        f.write(offsets.tobytes())
+        f.write(b"\0" * (data_offset - index_offset - 12 * len(cue_ids)))
+        for cid in cue_ids:
+            rec = cues[cid]
+            if not isinstance(rec, array) or rec.typecode != "f":
+                rec = array("f", rec)
+            if len(rec) != stride:
+                raise ValueError(f"cue {cid}: {len(rec)} valeurs, attendu {stride}")
+            f.write(rec.tobytes())
+    os.replace(tmp, path)
+
+
+class CueLibrary:
+    """
+    Bibliothèque de cues adossée à un fichier show mmappé.
+    - recall(cue_id) renvoie une memoryview float32 (zéro copie) sur le fichier
+    - apply(cue_id, state) recopie une cue dans AppState
+    - store(cue_id, state) capture l'état courant (en mémoire jusqu'à save())
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.fixture_ids: List[int] = []
+        self._index: Dict[int, int] = {}
+        self._record_len = 0
+        self._pending: Dict[int, array] = {}
+        self._file = None
+        self._mm: Optional[mmap.mmap] = None
+        self._view: Optional[memoryview] = None
+
+    # ------------------------------------------------------------------
+    # Ouverture / fermeture
+    # ------------------------------------------------------------------
+    def open(self) -> "CueLibrary":
+        self.close()
+        if not self.path.exists() or self.path.stat().st_size < _HEADER.size:
+            return self
+        self._file = self.path.open("rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mm)
+
+        magic, version, channels, fx_count, cue_count, ids_off, idx_off, _data_off = \
+            _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION or channels != len(CHANNELS):
+            self.close()
+            raise ValueError(f"{self.path}: fichier show invalide ou incompatible")
+
+        self.fixture_ids = list(self._view[ids_off:ids_off + 4 * fx_count].cast("I"))
+        cue_ids = self._view[idx_off:idx_off + 4 * cue_count].cast("I")
+        off_start = idx_off + 4 * cue_count
+        offsets = self._view[off_start:off_start + 8 * cue_count].cast("Q")
+        self._index = dict(zip(cue_ids.tolist(), offsets.tolist()))
+        self._record_len = fx_count * channels
+        return self
+
+    def close(self) -> None:
+        """Ferme le mmap ; l'index n'est vidé qu'une fois le fichier réellement fermé
+        (une vue encore exportée lève BufferError et laisse la bibliothèque intacte)."""
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._index = {}
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+    def cue_ids(self) -> List[int]:
+        return sorted(set(self._index) | set(self._pending))
+
+    def __contains__(self, cue_id) -> bool:
+        return int(cue_id) in self._pending or int(cue_id) in self._index
+
+    def recall(self, cue_id: int):
+        """Valeurs de la cue (float32 à plat, ordre fixture_ids x CHANNELS)."""
+        cid = int(cue_id)
+        if cid in self._pending:
+            return self._pending[cid]
+        off = self._index.get(cid)
+        if off is None:
+            raise KeyError(cid)
+        return self._view[off:off + 4 * self._record_len].cast("f")
+
+    def apply(self, cue_id: int, state: AppState) -> None:
+        values = self.recall(cue_id)
+        n = len(CHANNELS)
+        for i, fid in enumerate(self.fixture_ids):
+            state.ensure_fixture(fid).set_values(values[i * n:(i + 1) * n])
+
+    def store(self, cue_id: int, state: AppState) -> None:
+        """Capture l'état courant sous `cue_id` (écrit sur disque par save())."""
+        ids = sorted(state.fixtures.keys())
+        if ids != self.fixture_ids:
+            # Le patch a changé : on ré-échantillonne les cues existantes
+            self._rebase(ids)
+        self._pending[int(cue_id)] = snapshot_state(state, ids)
+
+    def save(self) -> None:
+        cues: Dict[int, Iterable[float]] = {cid: array("f", self.recall(cid)) for cid in self._index}
+        cues.update(self._pending)
+        self.close()
+        write_show_file(self.path, self.fixture_ids, cues)
+        self._pending.clear()
+        self.open()
+
+    # ------------------------------------------------------------------
+    # Internes
+    # ------------------------------------------------------------------
+    def _rebase(self, new_ids: List[int]) -> None:
+        n = len(CHANNELS)
+        old_pos = {fid: i for i, fid in enumerate(self.fixture_ids)}
+        rebased: Dict[int, array] = {}
+        for cid in self.cue_ids():
+            # Copie : aucune vue sur le mmap ne doit survivre au close() ci-dessous
+            src = array("f", self.recall(cid))
+            out = array("f")
+            for fid in new_ids:
+                i = old_pos.get(fid)
+                out.extend(src[i * n:(i + 1) * n] if i is not None else (0.0,) * n)
+            rebased[cid] = out
+        self.close()
+        self._pending = rebased
+        self.fixture_ids = list(new_ids)
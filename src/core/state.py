@@ -2,8 +2,15 @@
 
 import time
 from dataclasses import dataclass, field
-from typing import Optional, Dict
+from typing import Optional, Dict, Iterable, Sequence, Tuple
 from .modes import READ
+from .selection import Selection
+
+# Ordre canonique des canaux d'une fixture (celui de /frame, après l'id)
+CHANNELS = ("r", "g", "b", "a", "w", "dimmer", "strobe")
+FRAME_STRIDE = 1 + len(CHANNELS)   # id + canaux
+# Colonnes de la grille des fixtures (FixturesView, positions par défaut du pixel-mapping)
+GRID_COLS = 5
 
 @dataclass
 class FixtureState:
@@ -24,6 +31,15 @@ class FixtureState:
     def set_strobe(self, value: float):
         self.strobe = float(value)
 
+    def values(self) -> Tuple[float, ...]:
+        """Valeurs dans l'ordre de CHANNELS."""
+        return (self.r, self.g, self.b, self.a, self.w, self.dimmer, self.strobe)
+
+    def set_values(self, values: Sequence[float]):
+        """Affecte les 7 canaux d'un coup (ordre de CHANNELS)."""
+        (self.r, self.g, self.b, self.a, self.w,
+         self.dimmer, self.strobe) = (float(v) for v in values[:7])
+
 @dataclass
 class AppState:
     """État global de l’application."""
@@ -32,10 +48,14 @@ class AppState:
     last_hello_ts: float = 0.0
     fps: float = 0.0
     msgs_per_sec: float = 0.0
+    # Sortie : fréquence visée (adaptative), fréquence effective, frames perdues (cumul)
+    out_rate_hz: float = 0.0
+    out_effective_hz: float = 0.0
+    out_drops: int = 0
     last_error: Optional[str] = None
 
-    # Sélection courante dans l’UI (None = rien)
-    selected_fixture: Optional[int] = None
+    # Sélection courante dans l’UI (multi-sélection ; voir selected_fixture)
+    selection: Selection = field(default_factory=Selection)
 
     # État des fixtures (clé = id de fixture)
     fixtures: Dict[int, FixtureState] = field(default_factory=dict)
@@ -44,15 +64,35 @@ class AppState:
     _count_msgs: int = field(default=0, init=False, repr=False)
     _last_msg_window_ts: float = field(default_factory=time.monotonic, init=False, repr=False)
 
-    def on_msg_received(self):
-        """Appelé à chaque message OSC reçu — calcule Msg/s."""
-        self._count_msgs += 1
+    def on_msg_received(self, count: int = 1):
+        """Appelé à chaque message OSC reçu (ou lot de `count`) — calcule Msg/s."""
+        self._count_msgs += count
         now = time.monotonic()
         if now - self._last_msg_window_ts >= 1.0:
             self.msgs_per_sec = self._count_msgs / (now - self._last_msg_window_ts)
             self._count_msgs = 0
             self._last_msg_window_ts = now
 
+    @property
+    def selected_fixture(self) -> Optional[int]:
+        """Fixture de référence de la sélection (None = rien)."""
+        return self.selection.primary
+
+    @selected_fixture.setter
+    def selected_fixture(self, fid: Optional[int]):
+        self.selection.set(() if fid is None else (fid,), fid)
+
+    def set_param(self, ids: Iterable[int], name: str, value: float) -> None:
+        """Écrit un même canal sur un lot de fixtures (ex. toute la sélection)."""
+        if name not in CHANNELS:
+            raise ValueError(f"unknown channel '{name}'")
+        v = float(value)
+        fixtures = self.fixtures
+        for fid in ids:
+            fx = fixtures.get(fid)
+            if fx is not None:
+                setattr(fx, name, v)
+
     def ensure_fixture(self, fid: int) -> FixtureState:
         if fid not in self.fixtures:
             self.fixtures[fid] = FixtureState()
@@ -0,0 +1,68 @@
+# fichier: src/io_/multicast.py
+"""
+UDP multicast pour OscClient (section `multicast:` de io.yml).
+
+- Émission : un seul datagramme par message vers le groupe, reçu par autant de
+  consoles / visualiseurs que nécessaire (au lieu de dupliquer chaque envoi).
+- Réception : le serveur OSC rejoint un groupe ; SO_REUSEADDR/SO_REUSEPORT
+  permettent à plusieurs récepteurs d'écouter le même port sur une machine.
+
+`loopback: true` (défaut) garde les datagrammes visibles sur la machine émettrice :
+émetteur et récepteurs peuvent être testés en local.
+"""
+
+import socket
+import struct
+from typing import Optional
+
+
+def parse_config(cfg: Optional[dict]) -> dict:
+    cfg = cfg or {}
+    return {
+        "send_group": cfg.get("send_group") or None,
+        "listen_group": cfg.get("listen_group") or None,
+        "interface": str(cfg.get("interface") or "0.0.0.0"),
+        "ttl": int(cfg.get("ttl", 1)),
+        "loopback": bool(cfg.get("loopback", True)),
+    }
+
+
+def configure_sender(sock: socket.socket, ttl: int = 1, loopback: bool = True,
+                     interface: str = "0.0.0.0") -> None:
+    """Prépare une socket UDP existante pour émettre vers un groupe multicast."""
+    sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, struct.pack("b", max(0, min(255, ttl))))
+    sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1 if loopback else 0)
+    if interface and interface != "0.0.0.0":
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(interface))
+
+
+def allow_shared_port(sock: socket.socket) -> None:
+    """Plusieurs récepteurs du même groupe sur une machine (tous reçoivent chaque datagramme)."""
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if hasattr(socket, "SO_REUSEPORT"):
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        except OSError:
+            pass
+
+
+def join_group(sock: socket.socket, group: str, interface: str = "0.0.0.0") -> None:
+    mreq = socket.inet_aton(group) + socket.inet_aton(interface or "0.0.0.0")
+    sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, mreq)
+
+
+def make_listen_server(server_cls, port: int, dispatcher, group: str, interface: str = "0.0.0.0"):
+    """
+    Instancie un serveur python-osc (ex. ThreadingOSCUDPServer) qui écoute `port`
+    et reçoit les datagrammes envoyés au groupe `group`.
+    """
+    server = server_cls(("", port), dispatcher, bind_and_activate=False)
+    try:
+        allow_shared_port(server.socket)
+        server.server_bind()
+        join_group(server.socket, group, interface)
+        server.server_activate()
+    except Exception:
+        server.server_close()
+        raise
+    return server
@@ -3,8 +3,12 @@
 import threading
 import queue
 import time
-from typing import Optional, List, Any, Tuple
-from pythonosc import dispatcher, osc_server, udp_client
+from typing import Callable, Optional, List, Any, Tuple
+
+from utils.log import ErrorAggregator
+from .rate_control import AdaptiveRate
+
+# python-osc (et asyncio qu'il tire) est importé au start() : démarrage plus rapide
 
 
 class OscClient:
@@ -15,23 +19,38 @@ class OscClient:
     - pousser des événements vers l’UI via une Queue thread-safe
     """
 
-    def __init__(self, listen_port: int, remote_ip: str, send_port: int, event_queue: queue.Queue):
+    def __init__(self, listen_port: int, remote_ip: str, send_port: int, event_queue: queue.Queue,
+                 multicast: Optional[dict] = None, traffic: Optional[dict] = None):
         self.listen_port = listen_port
         self.remote_ip = remote_ip
         self.send_port = send_port
         self._event_queue = event_queue
-
-        self._server: Optional[osc_server.ThreadingOSCUDPServer] = None
+        # Erreurs répétées (datagrammes malformés…) : une par clé, puis un résumé par intervalle
+        self._errors = ErrorAggregator(self._emit_error)
+        # Section `multicast:` de io.yml (send_group / listen_group) ; vide = unicast
+        self.multicast = multicast or {}
+        # Section `traffic:` de io.yml : record (journal du trafic) / replay (rejeu d'un journal)
+        self.traffic = traffic or {}
+        self._recorder = None
+        self._replay_thread: Optional[threading.Thread] = None
+        self._replay_stop = threading.Event()
+
+        self._server = None   # pythonosc.osc_server.ThreadingOSCUDPServer
         self._server_thread: Optional[threading.Thread] = None
 
-        # Client OSC pour envoyer vers Max
-        self._client = udp_client.SimpleUDPClient(remote_ip, send_port)
+        # Client OSC pour envoyer vers Max (créé au start())
+        self._client = None
 
         # Envoi non-bloquant
         self._outbox: "queue.Queue[Tuple[str, List[Any]]]" = queue.Queue(maxsize=1000)
         self._sender_thread: Optional[threading.Thread] = None
         self._max_rate_hz: int = 60
-        self._last_frame_sent_ts: float = 0.0
+        self._min_rate_hz: int = 20
+        self._next_frame_ts: float = 0.0
+        # Fréquence effective des /frame, ajustée par le thread expéditeur (créée au start())
+        self.rate: Optional[AdaptiveRate] = None
+        # Appelé (thread de réception) à chaque datagramme reçu : réveil de la veille
+        self.on_input: Optional[Callable[[], None]] = None
 
         self._running = False
 
@@ -43,6 +62,9 @@ class OscClient:
         try:
             self._outbox.put_nowait((addr, args))
         except queue.Full:
+            # Le plus ancien est écarté : compté comme perte (et signal de congestion)
+            if self.rate is not None:
+                self.rate.note_drop()
             try:
                 self._outbox.get_nowait()
                 self._outbox.put_nowait((addr, args))
@@ -58,6 +80,10 @@ class OscClient:
     def send_select(self, fixture_id: int):
         self._enqueue("/ui/select", [int(fixture_id)])
 
+    def send_selection(self, fixture_ids: List[int]):
+        """Sélection multiple complète : /ui/selection id id id ..."""
+        self._enqueue("/ui/selection", [int(f) for f in fixture_ids])
+
     def send_fixture_values(
         self,
         fixture_id: int,
@@ -70,66 +96,124 @@ class OscClient:
         self._enqueue(f"/fixture/{int(fixture_id)}/dimmer", [float(dimmer)])
         self._enqueue(f"/fixture/{int(fixture_id)}/strobe", [float(strobe)])
 
-    def send_frame(self, t: float, fixtures_flat: List[float], throttle: bool = True) -> None:
+    def send_dmx(self, universe: int, data: bytes) -> None:
+        """Univers DMX rendu par les profils de fixtures : /dmx/<univers> blob (512 octets, un datagramme)."""
+        self._enqueue(f"/dmx/{int(universe)}", [bytes(data)])
+
+    def send_state(self, sync_id: int, fixtures_flat: List[float], chunk_bytes: int = 1400) -> int:
+        """État complet en tranches binaires : /state/chunk sync_id seq total blob. Renvoie total."""
+        from .state_sync import encode_chunks
+        blobs = encode_chunks(fixtures_flat, chunk_bytes)
+        total = len(blobs)
+        for seq, blob in enumerate(blobs):
+            self._enqueue("/state/chunk", [int(sync_id), seq, total, blob])
+        return total
+
+    def send_state_query(self, sync_id: int) -> None:
+        """Demande l'état complet de Max (réponse : /state/chunk)."""
+        self._enqueue("/state/query", [int(sync_id)])
+
+    def send_frame(self, t: float, fixtures_flat: List[float], throttle: bool = True) -> bool:
         """
         Envoi groupé: /frame t (id r g b a w dimmer strobe) * N
         fixtures_flat: concaténation de blocs de 8 valeurs:
             [id, r, g, b, a, w, dimmer, strobe, id, r, g, ...]
+        Renvoie False si la frame a été écartée par le throttle.
         """
         if throttle:
+            # Échéancier plutôt que "now - dernier envoi" : tolère une demi-période de gigue,
+            # sans repliement à la moitié de la fréquence quand l'appelant tourne au même rythme.
             now = time.perf_counter()
-            min_dt = 1.0 / float(max(1, self._max_rate_hz))
-            if (now - self._last_frame_sent_ts) < min_dt:
-                return
-            self._last_frame_sent_ts = now
+            hz = self.rate.rate_hz if self.rate is not None else float(max(1, self._max_rate_hz))
+            min_dt = 1.0 / hz
+            if now < self._next_frame_ts - 0.5 * min_dt:
+                return False
+            self._next_frame_ts = max(self._next_frame_ts, now - 0.5 * min_dt) + min_dt
 
         self._enqueue("/frame", [float(t), *fixtures_flat])
+        return True
 
     # --------------------------------------------------------------------------
     # RÉCEPTION (Max → App)
     # --------------------------------------------------------------------------
 
-    def _setup_dispatcher(self) -> dispatcher.Dispatcher:
+    def _setup_dispatcher(self):
+        from pythonosc import dispatcher
+
         disp = dispatcher.Dispatcher()
 
         def on_hello(addr, *args):
             self._event_queue.put(("hello", {}))
 
+        # Handlers d'état : `client` = (ip, port) de l'expéditeur → clé de source pour la fusion HTP/LTP
+        def source_of(client) -> str:
+            return f"{client[0]}:{client[1]}"
+
         # /fixture/<id>/color r g b a w
-        def on_color(addr, *args):
+        def on_color(client, addr, *args):
             try:
                 parts = addr.split("/")
                 fixture_id = int(parts[2])
                 r, g, b, a, w = (float(x) for x in args[:5])
                 self._event_queue.put((
                     "fixture_color",
-                    {"id": fixture_id, "r": r, "g": g, "b": b, "a": a, "w": w}
+                    {"id": fixture_id, "r": r, "g": g, "b": b, "a": a, "w": w, "src": source_of(client)}
                 ))
             except Exception as e:
                 self._push_error(f"on_color error: {e}")
 
         # /fixture/<id>/dimmer value
-        def on_dimmer(addr, *args):
+        def on_dimmer(client, addr, *args):
             try:
                 parts = addr.split("/")
                 fixture_id = int(parts[2])
                 value = float(args[0])
-                self._event_queue.put(("fixture_dimmer", {"id": fixture_id, "value": value}))
+                self._event_queue.put(("fixture_dimmer", {"id": fixture_id, "value": value, "src": source_of(client)}))
             except Exception as e:
                 self._push_error(f"on_dimmer error: {e}")
 
         # /fixture/<id>/strobe rate
-        def on_strobe(addr, *args):
+        def on_strobe(client, addr, *args):
             try:
                 parts = addr.split("/")
                 fixture_id = int(parts[2])
                 rate = float(args[0])
-                self._event_queue.put(("fixture_strobe", {"id": fixture_id, "rate": rate}))
+                self._event_queue.put(("fixture_strobe", {"id": fixture_id, "rate": rate, "src": source_of(client)}))
             except Exception as e:
                 self._push_error(f"on_strobe error: {e}")
 
+        # /fixture/<id>/param nom valeur : paramètre hors /frame (pan, tilt… selon le profil)
+        def on_param(addr, *args):
+            try:
+                fixture_id = int(addr.split("/")[2])
+                self._event_queue.put(("fixture_param", {"id": fixture_id, "name": str(args[0]),
+                                                         "value": float(args[1])}))
+            except Exception as e:
+                self._push_error(f"on_param error: {e}")
+
+        # /dmx/<univers> blob : univers DMX décodé selon les profils du patch
+        # (ancienne forme v1 v2 ... en entiers encore acceptée)
+        def on_dmx(client, addr, *args):
+            try:
+                universe = int(addr.split("/")[2])
+                if len(args) == 1 and isinstance(args[0], (bytes, bytearray)):
+                    data = bytes(args[0])
+                else:
+                    data = bytes(max(0, min(255, int(v))) for v in args)
+                self._event_queue.put(("dmx", {"universe": universe, "data": data, "src": source_of(client)}))
+            except Exception as e:
+                self._push_error(f"on_dmx error: {e}")
+
+        # /master/<grand|groupe> value
+        def on_master(addr, *args):
+            try:
+                name = addr.split("/")[2]
+                self._event_queue.put(("master", {"name": name, "value": float(args[0])}))
+            except Exception as e:
+                self._push_error(f"on_master error: {e}")
+
         # /frame t id r g b a w dimmer strobe [id r g ...]
-        def on_frame(addr, *args):
+        def on_frame(client, addr, *args):
             try:
                 if not args:
                     return
@@ -154,15 +238,38 @@ class OscClient:
                     fixtures.append(
                         {"id": fid, "r": r, "g": g, "b": b, "a": a, "w": w, "dimmer": dimmer, "strobe": strobe}
                     )
-                self._event_queue.put(("frame", {"t": t, "fixtures": fixtures}))
+                self._event_queue.put(("frame", {"t": t, "fixtures": fixtures, "src": source_of(client)}))
             except Exception as e:
                 self._push_error(f"on_frame error: {e}")
 
+        # /state/query [sync_id] : l'expéditeur demande tout l'état
+        def on_state_query(client, addr, *args):
+            try:
+                sync_id = int(args[0]) if args else 0
+                self._event_queue.put(("state_query", {"sync": sync_id, "src": source_of(client)}))
+            except Exception as e:
+                self._push_error(f"on_state_query error: {e}")
+
+        # /state/chunk sync_id seq total blob : tranche d'état, décodée ici (hors thread UI)
+        def on_state_chunk(client, addr, *args):
+            try:
+                from .state_sync import decode_chunk
+                sync_id, seq, total, blob = int(args[0]), int(args[1]), int(args[2]), args[3]
+                self._event_queue.put(("state_chunk", {"sync": sync_id, "seq": seq, "total": total,
+                                                       "fixtures": decode_chunk(blob), "src": source_of(client)}))
+            except Exception as e:
+                self._push_error(f"on_state_chunk error: {e}")
+
         disp.map("/app/hello", on_hello)
-        disp.map("/fixture/*/color", on_color)
-        disp.map("/fixture/*/dimmer", on_dimmer)
-        disp.map("/fixture/*/strobe", on_strobe)
-        disp.map("/frame", on_frame)
+        disp.map("/fixture/*/color", on_color, needs_reply_address=True)
+        disp.map("/fixture/*/dimmer", on_dimmer, needs_reply_address=True)
+        disp.map("/fixture/*/strobe", on_strobe, needs_reply_address=True)
+        disp.map("/frame", on_frame, needs_reply_address=True)
+        disp.map("/master/*", on_master)
+        disp.map("/fixture/*/param", on_param)
+        disp.map("/dmx/*", on_dmx, needs_reply_address=True)
+        disp.map("/state/query", on_state_query, needs_reply_address=True)
+        disp.map("/state/chunk", on_state_chunk, needs_reply_address=True)
 
         disp.set_default_handler(lambda addr, *args: None)
         return disp
@@ -178,10 +285,42 @@ class OscClient:
 
         # Serveur réception
         try:
+            from pythonosc import osc_server, udp_client
+            from . import multicast
+
+            mc = multicast.parse_config(self.multicast)
             disp = self._setup_dispatcher()
-            self._server = osc_server.ThreadingOSCUDPServer(
-                ("0.0.0.0", self.listen_port), disp
-            )
+            if mc["send_group"]:
+                # Un datagramme vers le groupe, quel que soit le nombre de récepteurs
+                self._client = udp_client.SimpleUDPClient(mc["send_group"], self.send_port)
+                multicast.configure_sender(self._client._sock, mc["ttl"], mc["loopback"], mc["interface"])
+            else:
+                self._client = udp_client.SimpleUDPClient(self.remote_ip, self.send_port)
+            if self.traffic.get("record"):
+                from .traffic_log import TrafficRecorder, attach
+                self._recorder = TrafficRecorder(self.traffic["record"])
+                # En rejeu, seul l'envoi est enregistré (les entrées sont déjà dans le journal rejoué)
+                attach(self._recorder, dispatcher=None if self.traffic.get("replay") else disp,
+                       client=self._client)
+            if self.on_input is not None:
+                handle = disp.call_handlers_for_packet
+                on_input = self.on_input
+
+                def call_handlers_for_packet(data, client_address):
+                    handle(data, client_address)
+                    on_input()
+
+                disp.call_handlers_for_packet = call_handlers_for_packet
+            if self.traffic.get("replay"):
+                pass                            # rejeu : le journal remplace l'écoute réseau
+            elif mc["listen_group"]:
+                self._server = multicast.make_listen_server(
+                    osc_server.ThreadingOSCUDPServer, self.listen_port, disp, mc["listen_group"], mc["interface"]
+                )
+            else:
+                self._server = osc_server.ThreadingOSCUDPServer(
+                    ("0.0.0.0", self.listen_port), disp
+                )
         except Exception as e:
             self._push_error(f"OSC server start error: {e}")
             self._running = False
@@ -193,31 +332,59 @@ class OscClient:
             except Exception as e:
                 self._push_error(f"OSC server fatal error: {e}")
 
-        self._server_thread = threading.Thread(target=server_loop, name="OSC-Server", daemon=True)
-        self._server_thread.start()
+        def replay_loop():
+            from .traffic_log import replay
+            path = self.traffic["replay"]
+            try:
+                n = replay(path, disp.call_handlers_for_packet,
+                           speed=float(self.traffic.get("replay_speed", 1.0)), stop=self._replay_stop)
+                self._event_queue.put(("replay_done", {"path": str(path), "count": n}))
+            except Exception as e:
+                self._push_error(f"OSC replay failed ({path}): {e}")
+
+        if self._server is not None:
+            self._server_thread = threading.Thread(target=server_loop, name="OSC-Server", daemon=True)
+            self._server_thread.start()
+        else:
+            self._replay_thread = threading.Thread(target=replay_loop, name="OSC-Replay", daemon=True)
+            self._replay_thread.start()
+
+        # Thread d'envoi (non-bloquant) : mesure aussi la contre-pression pour AdaptiveRate
+        rate = self.rate = AdaptiveRate(self._min_rate_hz, self._max_rate_hz)
 
-        # Thread d'envoi (non-bloquant)
         def sender_loop():
             while self._running:
+                metrics = rate.tick(self._outbox.qsize())
+                if metrics is not None:
+                    self._event_queue.put(("metrics", metrics))
                 try:
                     addr, args = self._outbox.get(timeout=0.1)
                 except queue.Empty:
                     continue
+                t0 = time.perf_counter()
                 try:
                     self._client.send_message(addr, args)
                 except Exception as e:
+                    rate.note_error()
                     self._push_error(f"send_message({addr}) failed: {e}")
+                    continue
+                if addr == "/frame":
+                    rate.note_sent(time.perf_counter() - t0)
 
         self._sender_thread = threading.Thread(target=sender_loop, name="OSC-Sender", daemon=True)
         self._sender_thread.start()
 
     def stop(self):
         self._running = False
+        self._replay_stop.set()
         try:
             if self._server:
                 self._server.shutdown()
         except Exception:
             pass
+        if self._recorder is not None:
+            # Le thread expéditeur peut encore écrire : close() est protégé par le verrou
+            self._recorder.close()
 
         # On purge rapidement la file pour ne pas bloquer la fermeture
         try:
@@ -234,4 +401,13 @@ class OscClient:
     # UTILITAIRES
     # --------------------------------------------------------------------------
     def _push_error(self, message: str):
-        self._event_queue.put(("error", {"message": message}))
\ No newline at end of file
+        self._errors.report(message.split(":", 1)[0], message)
+
+    def _emit_error(self, message: str, count: int):
+        self._event_queue.put(("error", {"message": message, "count": count}))
+
+    def flush_errors(self):
+        """Résumé des erreurs répétées (appelé à chaque tick par Engine.drain_events)."""
+        self._errors.flush()
+        if self._recorder is not None:
+            self._recorder.flush_due()
\ No newline at end of file
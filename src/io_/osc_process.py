@@ -0,0 +1,366 @@
+# fichier: src/io_/osc_process.py
+"""
+OscClient dans un processus enfant : la réception/l'envoi OSC ne partagent plus
+le GIL avec le rendu Tk.
+
+- L'état des fixtures transite par deux blocs multiprocessing.shared_memory
+  protégés par un compteur de version type seqlock (impair = écriture en cours) :
+    inbound  : enfant → parent (état reçu de Max)
+    outbound : parent → enfant (état à envoyer en WRITE)
+- Un petit canal de contrôle (Pipe) porte mode / select / ready ; les événements
+  hors état (hello, error) remontent par une multiprocessing.Queue.
+"""
+
+import multiprocessing as mp
+import queue
+import signal
+import struct
+import time
+from array import array
+from multiprocessing import shared_memory
+from typing import Any, List, Optional, Tuple
+
+from utils.log import ErrorAggregator
+
+# version u64 | stamp u64 | fixture_count u32 | pad
+# stamp : nb de messages reçus (inbound) ou t du /frame en µs (outbound)
+_HEADER = struct.Struct("<QQI4x")
+_VERSION = struct.Struct("<Q")
+STRIDE = 8                       # id r g b a w dimmer strobe (float32 natifs)
+_RECORD_BYTES = 4 * STRIDE
+_ZERO_ROW = (0.0,) * (STRIDE - 1)
+
+
+class SharedFixtureBlock:
+    """Bloc mémoire partagé : en-tête + `capacity` records float32 de 8 valeurs."""
+
+    def __init__(self, capacity: int, name: Optional[str] = None):
+        self.capacity = int(capacity)
+        size = _HEADER.size + self.capacity * _RECORD_BYTES
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.shm.buf[:_HEADER.size] = b"\0" * _HEADER.size
+        else:
+            # Enfant "spawn" : même resource_tracker que le parent, qui reste seul à unlink()
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self._buf = self.shm.buf
+        self._version = 0
+
+    # ------------------------------------------------------------------
+    # Écriture (un seul écrivain par bloc)
+    # ------------------------------------------------------------------
+    def write(self, flat: List[float], stamp: int = 0) -> None:
+        """flat: [id, r, g, b, a, w, dimmer, strobe] * N (tronqué à capacity)."""
+        n = min(len(flat) // STRIDE, self.capacity)
+        v = self._version + 1
+        _VERSION.pack_into(self._buf, 0, v)                      # impair : écriture
+        data = array("f", flat[:n * STRIDE]).tobytes()
+        self._buf[_HEADER.size:_HEADER.size + len(data)] = data
+        _HEADER.pack_into(self._buf, 0, v, stamp, n)
+        _VERSION.pack_into(self._buf, 0, v + 1)                  # pair : cohérent
+        self._version = v + 1
+
+    # ------------------------------------------------------------------
+    # Lecture (seqlock : on relit tant qu'une écriture a eu lieu entre-temps)
+    # ------------------------------------------------------------------
+    def read(self, last_version: int, retries: int = 100) -> Optional[Tuple[int, int, array]]:
+        """Renvoie (version, stamp, flat) si le bloc a changé depuis `last_version`, sinon None."""
+        buf = self._buf
+        for _ in range(retries):
+            v1 = _VERSION.unpack_from(buf, 0)[0]
+            if v1 == last_version:
+                return None
+            if v1 & 1:
+                continue
+            _, stamp, n = _HEADER.unpack_from(buf, 0)
+            n = min(n, self.capacity)
+            flat = array("f")
+            flat.frombytes(buf[_HEADER.size:_HEADER.size + n * _RECORD_BYTES])
+            if _VERSION.unpack_from(buf, 0)[0] == v1:
+                return v1, stamp, flat
+        return None
+
+    def close(self, unlink: bool = False) -> None:
+        self._buf = None
+        try:
+            self.shm.close()
+            if unlink:
+                self.shm.unlink()
+        except Exception:
+            pass
+
+
+# ----------------------------------------------------------------------
+# Processus enfant
+# ----------------------------------------------------------------------
+def _child_main(cfg: dict, inbound_name: str, outbound_name: str, capacity: int, ctrl, events) -> None:
+    from io_.osc_client import OscClient
+    from core.merge import MergeEngine
+    from core.jitter import JitterBuffer, rows
+
+    # Ctrl+C atteint tout le groupe de processus : c'est le parent qui pilote l'arrêt
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    inbound = SharedFixtureBlock(capacity, name=inbound_name)
+    outbound = SharedFixtureBlock(capacity, name=outbound_name)
+    local_q: "queue.Queue[Tuple[str, dict]]" = queue.Queue()
+    osc = OscClient(cfg["listen_port"], cfg["remote_ip"], cfg["send_port"], local_q, cfg.get("multicast"),
+                    cfg.get("traffic"))
+    osc._max_rate_hz = int(cfg.get("max_rate_hz", 60))
+    osc._min_rate_hz = int(cfg.get("min_rate_hz", 20))
+    osc.start()
+
+    fixtures = {}            # fid -> [r, g, b, a, w, dimmer, strobe] (après fusion des sources)
+    merge = MergeEngine.from_config(cfg)
+    jitter = JitterBuffer.from_config(cfg)
+    msg_count = 0
+    out_version = 0
+    interval = 1.0 / float(max(1, osc._max_rate_hz))
+    running = True
+
+    while running:
+        deadline = time.monotonic() + interval
+
+        # Contrôle (parent → enfant)
+        while ctrl.poll():
+            cmd, *args = ctrl.recv()
+            if cmd == "stop":
+                running = False
+            elif cmd == "mode":
+                osc.send_mode(args[0])
+            elif cmd == "select":
+                osc.send_select(args[0])
+            elif cmd == "selection":
+                osc.send_selection(args[0])
+            elif cmd == "ready":
+                osc.send_app_ready()
+            elif cmd == "fixture_values":
+                osc.send_fixture_values(*args)
+            elif cmd == "dmx":
+                osc.send_dmx(*args)
+            elif cmd == "state":
+                osc.send_state(*args)
+            elif cmd == "state_query":
+                osc.send_state_query(*args)
+
+        # Réception (Max → enfant) : état → inbound, le reste → parent
+        try:
+            while True:
+                etype, p = local_q.get_nowait()
+                msg_count += 1
+                src = p.get("src", "")
+                if etype == "fixture_color":
+                    merge.feed_color(src, p["id"], (p["r"], p["g"], p["b"], p["a"], p["w"]))
+                elif etype == "fixture_dimmer":
+                    merge.feed_dimmer(src, p["id"], p["value"])
+                elif etype == "fixture_strobe":
+                    merge.feed_strobe(src, p["id"], p["rate"])
+                elif etype == "frame":
+                    if jitter.enabled and jitter.push(src, p["t"], p["fixtures"]):
+                        continue
+                    for it in p["fixtures"]:
+                        merge.feed_values(src, it["id"], (it["r"], it["g"], it["b"], it["a"], it["w"],
+                                                          it["dimmer"], it["strobe"]))
+                elif etype == "state_chunk":
+                    # Appliquée ici comme un /frame ; le parent ne reçoit que le suivi des tranches
+                    for fid, row in p["fixtures"]:
+                        merge.feed_values(src, fid, row)
+                    events.put((etype, {**p, "fixtures": [], "count": len(p["fixtures"])}))
+                else:
+                    events.put((etype, p))
+        except queue.Empty:
+            pass
+        if jitter.enabled:
+            for src, (ids, values) in jitter.sample().items():
+                for fid, row in rows(ids, values):
+                    merge.feed_values(src, fid, row)
+        merged = merge.merge(lambda fid: fixtures.get(fid, _ZERO_ROW))
+        if merged:
+            fixtures.update(merged)
+            flat: List[float] = []
+            for fid in sorted(fixtures):
+                flat.append(fid)
+                flat.extend(fixtures[fid])
+            inbound.write(flat, msg_count)
+
+        # Émission (parent → Max) : nouvel état outbound → /frame
+        res = outbound.read(out_version)
+        if res is not None:
+            out_version, t_us, flat = res
+            if flat:
+                osc.send_frame(t_us / 1e6, [int(v) if i % STRIDE == 0 else v for i, v in enumerate(flat)])
+
+        osc.flush_errors()
+        delay = deadline - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    osc.stop()
+    inbound.close()
+    outbound.close()
+
+
+# ----------------------------------------------------------------------
+# Côté parent : même API d'envoi qu'OscClient
+# ----------------------------------------------------------------------
+class OscProcessClient:
+    """
+    Remplaçant d'OscClient côté parent : les envois passent par le canal de
+    contrôle / le bloc outbound, la réception par read_inbound() + la file d'événements.
+    """
+
+    def __init__(self, listen_port: int, remote_ip: str, send_port: int, event_queue: queue.Queue,
+                 capacity: int = 1024, source_timeout_ms: int = 3000, jitter_latency_ms: int = 40,
+                 multicast: Optional[dict] = None, traffic: Optional[dict] = None):
+        self.listen_port = listen_port
+        self.remote_ip = remote_ip
+        self.send_port = send_port
+        self._event_queue = event_queue
+        # Erreurs répétées (datagrammes malformés…) : une par clé, puis un résumé par intervalle
+        self._errors = ErrorAggregator(self._emit_error)
+        self._max_rate_hz: int = 60
+        self._min_rate_hz: int = 20
+        self._capacity = int(capacity)
+        self.source_timeout_ms = int(source_timeout_ms)
+        self.jitter_latency_ms = int(jitter_latency_ms)
+        self.multicast = multicast or {}
+        self.traffic = traffic or {}
+        self.on_input = None      # pas de réveil immédiat : l'état arrive par mémoire partagée
+
+        self._inbound: Optional[SharedFixtureBlock] = None
+        self._outbound: Optional[SharedFixtureBlock] = None
+        self._ctrl = None
+        self._events = None
+        self._proc: Optional[mp.Process] = None
+        self._running = False
+
+    # ------------------------------------------------------------------
+    # ENVOIS (App → enfant → Max)
+    # ------------------------------------------------------------------
+    def _command(self, *cmd: Any) -> None:
+        if self._ctrl is None:
+            return
+        try:
+            self._ctrl.send(cmd)
+        except Exception as e:
+            self._push_error(f"I/O process control error: {e}")
+
+    def send_app_ready(self):
+        self._command("ready")
+
+    def send_mode(self, mode: str):
+        self._command("mode", mode)
+
+    def send_select(self, fixture_id: int):
+        self._command("select", int(fixture_id))
+
+    def send_selection(self, fixture_ids: List[int]):
+        self._command("selection", [int(f) for f in fixture_ids])
+
+    def send_fixture_values(self, fixture_id: int, r: float, g: float, b: float, a: float, w: float,
+                            dimmer: float, strobe: float) -> None:
+        self._command("fixture_values", int(fixture_id), r, g, b, a, w, dimmer, strobe)
+
+    def send_dmx(self, universe: int, data: bytes) -> None:
+        self._command("dmx", int(universe), bytes(data))
+
+    def send_state(self, sync_id: int, fixtures_flat: List[float], chunk_bytes: int = 1400) -> int:
+        from .state_sync import RECORD
+        self._command("state", int(sync_id), list(fixtures_flat), int(chunk_bytes))
+        per_chunk = max(1, int(chunk_bytes) // RECORD.size)
+        return -(-(len(fixtures_flat) // STRIDE) // per_chunk)
+
+    def send_state_query(self, sync_id: int) -> None:
+        self._command("state_query", int(sync_id))
+
+    def send_frame(self, t: float, fixtures_flat: List[float], throttle: bool = True) -> bool:
+        """Publie l'état dans le bloc outbound ; l'enfant l'envoie à son propre rythme."""
+        if self._outbound is None:
+            return False
+        self._outbound.write(fixtures_flat, int(t * 1e6))
+        return True
+
+    # ------------------------------------------------------------------
+    # RÉCEPTION
+    # ------------------------------------------------------------------
+    def read_inbound(self, last_version: int):
+        """(version, nb_messages, flat) si l'état reçu a changé depuis last_version, sinon None."""
+        self._pump_events()
+        if self._inbound is None:
+            return None
+        return self._inbound.read(last_version)
+
+    def _pump_events(self) -> None:
+        if self._events is None:
+            return
+        try:
+            while True:
+                self._event_queue.put(self._events.get_nowait())
+        except queue.Empty:
+            pass
+        except Exception:
+            pass
+
+    # ------------------------------------------------------------------
+    # DÉMARRAGE / ARRÊT
+    # ------------------------------------------------------------------
+    def start(self):
+        if self._running:
+            return
+        ctx = mp.get_context("spawn")
+        try:
+            self._inbound = SharedFixtureBlock(self._capacity)
+            self._outbound = SharedFixtureBlock(self._capacity)
+            self._ctrl, child_ctrl = ctx.Pipe()
+            self._events = ctx.Queue()
+            cfg = {
+                "listen_port": self.listen_port,
+                "remote_ip": self.remote_ip,
+                "send_port": self.send_port,
+                "max_rate_hz": self._max_rate_hz,
+                "min_rate_hz": self._min_rate_hz,
+                "source_timeout_ms": self.source_timeout_ms,
+                "jitter_latency_ms": self.jitter_latency_ms,
+                "multicast": self.multicast,
+                "traffic": self.traffic,
+            }
+            self._proc = ctx.Process(
+                target=_child_main,
+                args=(cfg, self._inbound.name, self._outbound.name, self._capacity, child_ctrl, self._events),
+                name="OSC-IO",
+                daemon=True,
+            )
+            self._proc.start()
+        except Exception as e:
+            self._push_error(f"I/O process start error: {e}")
+            self.stop()
+            return
+        self._running = True
+
+    def stop(self):
+        self._running = False
+        self._command("stop")
+        if self._proc is not None:
+            self._proc.join(timeout=1.0)
+            if self._proc.is_alive():
+                self._proc.terminate()
+            self._proc = None
+        for block in (self._inbound, self._outbound):
+            if block is not None:
+                block.close(unlink=True)
+        self._inbound = self._outbound = None
+        self._ctrl = None
+
+    # ------------------------------------------------------------------
+    # UTILITAIRES
+    # ------------------------------------------------------------------
+    def _push_error(self, message: str):
+        self._errors.report(message.split(":", 1)[0], message)
+
+    def _emit_error(self, message: str, count: int):
+        self._event_queue.put(("error", {"message": message, "count": count}))
+
+    def flush_errors(self):
+        """Résumé des erreurs répétées (appelé à chaque tick par Engine.drain_events)."""
+        self._errors.flush()
@@ -0,0 +1,99 @@
+# fichier: src/io_/rate_control.py
+"""
+Fréquence d'envoi des /frame adaptée à la contre-pression du réseau.
+
+Le thread expéditeur d'OscClient mesure, par fenêtre (0,5 s par défaut) :
+profondeur de la file d'envoi, durée des send_message(), erreurs socket et
+éléments écartés faute de place. En fin de fenêtre :
+- signe de congestion → baisse multiplicative (×0,75), bornée par min_hz
+- fenêtre propre et file vide → hausse additive (+step_hz), bornée par max_hz
+Sur un réseau de salle chargé on obtient ainsi un 30 Hz régulier plutôt
+qu'un 60 Hz en rafales avec des pertes silencieuses.
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class AdaptiveRate:
+    DECREASE = 0.75
+    QUEUE_HIGH = 8          # éléments en attente au-delà desquels on considère la file engorgée
+    SEND_BUDGET = 0.5       # durée d'envoi moyenne max, en fraction de l'intervalle entre frames
+
+    def __init__(self, min_hz: float, max_hz: float, step_hz: float = 2.0, window_s: float = 0.5):
+        self.max_hz = max(1.0, float(max_hz))
+        self.min_hz = max(1.0, min(float(min_hz), self.max_hz))
+        self.step_hz = float(step_hz)
+        self.window_s = float(window_s)
+        self.rate_hz = self.max_hz
+
+        self._lock = threading.Lock()
+        self._window_start = time.perf_counter()
+        self._sent = 0
+        self._send_time = 0.0
+        self._errors = 0
+        self._drops = 0
+        self._max_depth = 0
+
+        # Métriques publiées (cumulées ou sur la dernière fenêtre)
+        self.effective_hz = 0.0
+        self.total_drops = 0
+        self.total_errors = 0
+
+    # ------------------------------------------------------------------
+    # Mesures (thread expéditeur / appelant de _enqueue)
+    # ------------------------------------------------------------------
+    def note_sent(self, duration_s: float) -> None:
+        with self._lock:
+            self._sent += 1
+            self._send_time += duration_s
+
+    def note_error(self) -> None:
+        with self._lock:
+            self._errors += 1
+            self.total_errors += 1
+
+    def note_drop(self) -> None:
+        with self._lock:
+            self._drops += 1
+            self.total_drops += 1
+
+    # ------------------------------------------------------------------
+    # Ajustement
+    # ------------------------------------------------------------------
+    def tick(self, queue_depth: int, now: Optional[float] = None) -> Optional[dict]:
+        """
+        À appeler régulièrement depuis le thread expéditeur.
+        Renvoie les métriques quand une fenêtre se termine (sinon None).
+        """
+        now = time.perf_counter() if now is None else now
+        with self._lock:
+            if queue_depth > self._max_depth:
+                self._max_depth = queue_depth
+            elapsed = now - self._window_start
+            if elapsed < self.window_s:
+                return None
+            sent, send_time = self._sent, self._send_time
+            errors, drops, depth = self._errors, self._drops, self._max_depth
+            self._window_start = now
+            self._sent = self._errors = self._drops = self._max_depth = 0
+            self._send_time = 0.0
+
+        self.effective_hz = sent / elapsed
+        avg_send = send_time / sent if sent else 0.0
+        congested = (errors or drops or depth > self.QUEUE_HIGH
+                     or avg_send > self.SEND_BUDGET / self.rate_hz)
+        if congested:
+            self.rate_hz = max(self.min_hz, self.rate_hz * self.DECREASE)
+        elif depth <= 1:
+            self.rate_hz = min(self.max_hz, self.rate_hz + self.step_hz)
+        return self.metrics()
+
+    def metrics(self) -> dict:
+        return {
+            "rate_hz": self.rate_hz,
+            "effective_hz": self.effective_hz,
+            "drops": self.total_drops,
+            "errors": self.total_errors,
+        }
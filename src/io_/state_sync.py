@@ -0,0 +1,73 @@
+# fichier: src/io_/state_sync.py
+"""
+Synchronisation de l'état complet en bloc (section `state_sync:` de io.yml) :
+
+    /state/query [sync_id]                 → l'autre côté renvoie tout son état
+    /state/chunk sync_id seq total blob    → tranche seq (0..total-1) de l'envoi sync_id
+
+blob = records little-endian "<I7f" (id u32, r g b a w dimmer strobe float32),
+32 octets par fixture, au plus `chunk_bytes` octets par blob : un datagramme par
+tranche, sous le MTU Ethernet (1500 − en-têtes IP/UDP/OSC), sans fragmentation IP.
+Chaque tranche est appliquée dès réception ; SyncTracker ne fait que compter les
+tranches reçues (tranches manquantes, durée de la synchro).
+"""
+
+import struct
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from core.state import FRAME_STRIDE
+
+RECORD = struct.Struct("<I7f")
+# 1500 (Ethernet) − 28 (IP + UDP) − ~40 (adresse, type tags, 3 entiers, taille du blob)
+DEFAULT_CHUNK_BYTES = 1400
+
+
+def encode_chunks(flat: Sequence[float], chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> List[bytes]:
+    """/frame à plat [id, r, g, b, a, w, dimmer, strobe] * N → blobs de records."""
+    per_chunk = max(1, int(chunk_bytes) // RECORD.size)
+    values = list(flat)
+    values[0::FRAME_STRIDE] = [int(v) for v in values[0::FRAME_STRIDE]]
+    n = len(values) // FRAME_STRIDE
+    full = struct.Struct("<" + "I7f" * per_chunk)
+    blobs = []
+    for start in range(0, n, per_chunk):
+        k = min(per_chunk, n - start)
+        packer = full if k == per_chunk else struct.Struct("<" + "I7f" * k)
+        blobs.append(packer.pack(*values[start * FRAME_STRIDE:(start + k) * FRAME_STRIDE]))
+    return blobs
+
+
+def decode_chunk(blob: bytes) -> List[Tuple[int, Tuple[float, ...]]]:
+    """Blob → [(id, (r, g, b, a, w, dimmer, strobe)), ...] (octets en trop ignorés)."""
+    usable = len(blob) - len(blob) % RECORD.size
+    return [(rec[0], rec[1:]) for rec in RECORD.iter_unpack(memoryview(blob)[:usable])]
+
+
+class SyncTracker:
+    """Suivi des envois en cours par source : tranches reçues / attendues."""
+
+    def __init__(self):
+        self._pending: Dict[str, list] = {}      # src -> [sync_id, total, seqs reçus, t0, fixtures]
+
+    def add(self, src: str, sync_id: int, seq: int, total: int, fixtures: int,
+            now: Optional[float] = None) -> Tuple[Optional[tuple], Optional[tuple]]:
+        """
+        Enregistre une tranche. Renvoie (terminé, abandonné) :
+        terminé = (sync_id, total, fixtures, durée_s) quand toutes les tranches sont là,
+        abandonné = (sync_id, reçues, total) si un nouvel envoi remplace un envoi incomplet.
+        """
+        now = time.monotonic() if now is None else now
+        dropped = None
+        entry = self._pending.get(src)
+        if entry is not None and entry[0] != sync_id:
+            dropped = (entry[0], len(entry[2]), entry[1])
+            entry = None
+        if entry is None:
+            entry = self._pending[src] = [sync_id, int(total), set(), now, 0]
+        entry[2].add(int(seq))
+        entry[4] += fixtures
+        if len(entry[2]) >= entry[1]:
+            del self._pending[src]
+            return (sync_id, entry[1], entry[4], now - entry[3]), dropped
+        return None, dropped
@@ -0,0 +1,191 @@
+# fichier: src/io_/traffic_log.py
+"""
+Journal binaire du trafic OSC (append-only) : enregistrement et rejeu.
+
+Fichier : en-tête MAGIC + version, puis une suite de records
+    t f64 (perf_counter) | sens u8 (0 = reçu, 1 = envoyé) | ip 4 octets | port u16 | longueur u32 | datagramme
+
+- TrafficRecorder : les records s'accumulent dans un tampon mémoire écrit d'un bloc
+  (≥ FLUSH_BYTES, ou tampon plus vieux que FLUSH_S) : pas d'appel système par message,
+  et au plus FLUSH_S de trafic perdu sur un arrêt brutal. Thread-safe (réception et
+  envoi écrivent depuis des threads différents).
+- TrafficLog : lecture via mmap (aucune copie du fichier), itération sur les records.
+- replay() : réinjecte les datagrammes reçus dans un dispatcher python-osc, en temps
+  réel (speed=1), accéléré (speed>1) ou aussi vite que possible (speed=0).
+"""
+
+import mmap
+import socket
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Tuple
+
+MAGIC = b"SBOSCLOG"
+VERSION = 1
+_FILE_HEADER = struct.Struct("<8sH")
+_RECORD = struct.Struct("<dB4sHI")
+FLUSH_BYTES = 256 * 1024
+FLUSH_S = 0.5
+
+IN, OUT = 0, 1
+
+
+class TrafficRecorder:
+    def __init__(self, path, flush_bytes: int = FLUSH_BYTES, flush_s: float = FLUSH_S):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        new = not self.path.exists() or self.path.stat().st_size == 0
+        self._f = open(self.path, "ab", buffering=0)
+        if new:
+            self._f.write(_FILE_HEADER.pack(MAGIC, VERSION))
+        self._buf = bytearray()
+        self._flush_bytes = int(flush_bytes)
+        self._flush_s = float(flush_s)
+        self._flushed_at = time.perf_counter()
+        self._lock = threading.Lock()
+        self.records = 0
+
+    def write(self, direction: int, data: bytes, peer: Optional[Tuple[str, int]] = None) -> None:
+        ip, port = peer if peer else ("0.0.0.0", 0)
+        try:
+            ip_b = socket.inet_aton(ip)
+        except OSError:
+            ip_b = b"\0\0\0\0"
+        now = time.perf_counter()
+        head = _RECORD.pack(now, direction, ip_b, port & 0xFFFF, len(data))
+        with self._lock:
+            if self._f is None:
+                return
+            self._buf += head
+            self._buf += data
+            self.records += 1
+            if len(self._buf) >= self._flush_bytes or now - self._flushed_at >= self._flush_s:
+                self._flush_locked(now)
+
+    def _flush_locked(self, now: Optional[float] = None) -> None:
+        self._flushed_at = time.perf_counter() if now is None else now
+        if self._buf:
+            self._f.write(self._buf)
+            self._buf.clear()
+
+    def flush_due(self) -> None:
+        """Écrit le tampon s'il a plus de flush_s (trafic arrêté) ; appelé à chaque tick."""
+        now = time.perf_counter()
+        if now - self._flushed_at < self._flush_s or not self._buf:
+            return
+        with self._lock:
+            if self._f is not None:
+                self._flush_locked(now)
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._f is not None:
+                self._flush_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._f is None:
+                return
+            self._flush_locked()
+            self._f.close()
+            self._f = None
+
+
+class TrafficLog:
+    """Lecture d'un journal (mmap). Un record tronqué en fin de fichier (arrêt brutal) est ignoré."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._f = open(self.path, "rb")
+        size = self.path.stat().st_size
+        if size < _FILE_HEADER.size:
+            raise ValueError(f"{self.path}: journal vide ou tronqué")
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = _FILE_HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{self.path}: pas un journal OSC (ou version {version} inconnue)")
+
+    def __iter__(self) -> Iterator[Tuple[float, int, Tuple[str, int], memoryview]]:
+        mm = self._mm
+        view = memoryview(mm)
+        end = len(mm)
+        pos = _FILE_HEADER.size
+        unpack = _RECORD.unpack_from
+        rec = _RECORD.size
+        try:
+            while pos + rec <= end:
+                t, direction, ip_b, port, n = unpack(mm, pos)
+                pos += rec
+                if pos + n > end:
+                    break
+                yield t, direction, (socket.inet_ntoa(ip_b), port), view[pos:pos + n]
+                pos += n
+        finally:
+            view.release()
+
+    def close(self) -> None:
+        try:
+            self._mm.close()
+        except Exception:
+            pass
+        self._f.close()
+
+
+def replay(path, handle: Callable[[bytes, Tuple[str, int]], None], speed: float = 1.0,
+           stop: Optional[threading.Event] = None, direction: int = IN) -> int:
+    """
+    Rejoue les datagrammes `direction` du journal via handle(data, peer)
+    (ex. dispatcher.call_handlers_for_packet). Renvoie le nombre de records rejoués.
+    """
+    log = TrafficLog(path)
+    count = 0
+    t0_log = None
+    t0 = time.perf_counter()
+    try:
+        for t, d, peer, data in log:
+            if d != direction:
+                continue
+            if stop is not None and stop.is_set():
+                break
+            if speed > 0:
+                if t0_log is None:
+                    t0_log = t
+                delay = (t - t0_log) / speed - (time.perf_counter() - t0)
+                if delay > 0:
+                    time.sleep(delay)
+            handle(bytes(data), peer)
+            count += 1
+    finally:
+        log.close()
+    return count
+
+
+def attach(recorder: TrafficRecorder, dispatcher=None, client=None) -> None:
+    """
+    Branche l'enregistreur sur un dispatcher python-osc (datagrammes reçus, avant
+    décodage) et/ou un SimpleUDPClient (datagrammes envoyés, déjà encodés).
+    Remplacement de méthode d'instance : aucune copie ni ré-encodage.
+    Pendant un rejeu, ne pas passer le dispatcher : les datagrammes rejoués seraient
+    réenregistrés comme reçus.
+    """
+    if dispatcher is not None:
+        handle = dispatcher.call_handlers_for_packet
+
+        def call_handlers_for_packet(data, client_address):
+            recorder.write(IN, data, client_address)
+            return handle(data, client_address)
+
+        dispatcher.call_handlers_for_packet = call_handlers_for_packet
+
+    if client is not None:
+        send = client.send
+        peer = (client._address, client._port)
+
+        def recording_send(content):
+            recorder.write(OUT, content.dgram, peer)
+            send(content)
+
+        client.send = recording_send
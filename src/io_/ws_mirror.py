@@ -0,0 +1,302 @@
+# fichier: src/io_/ws_mirror.py
+"""
+Miroir de l'état des fixtures pour tableaux de bord navigateur (section `mirror:` de io.yml).
+
+Serveur asyncio (stdlib seule, dans son propre thread) :
+- GET /        → petite page HTML qui affiche la grille de fixtures
+- GET /ws      → WebSocket : instantané complet à la connexion, puis uniquement
+                 les fixtures modifiées, en binaire, à la fréquence choisie par le
+                 client (`/ws?rate=10`, ou message texte `rate=10`)
+
+La boucle principale appelle publish() une fois par tick : simple remplacement
+d'une référence, jamais bloquant. Chaque client a sa propre tâche qui, à son
+rythme, compare le dernier état publié à ce qu'il a déjà envoyé : les mises à
+jour intermédiaires sont fusionnées, et un client lent ne retarde ni la boucle
+principale ni les autres clients.
+
+Format binaire (little-endian) :
+    en-tête  : type u8 (0 = instantané, 1 = delta) | version u32 | nb u16
+    record   : id u16 | r g b a w dimmer strobe u16 (valeur × 65535)
+"""
+
+import asyncio
+import base64
+import hashlib
+import struct
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC11B85"
+_HEADER = struct.Struct("<BIH")
+_RECORD = struct.Struct("<H7H")
+_WIDTH = 7
+SNAPSHOT, DELTA = 0, 1
+
+
+class _Snapshot:
+    """Un état publié, encodé paresseusement (une seule fois, quel que soit le nombre de clients)."""
+
+    __slots__ = ("version", "ids", "values", "_records")
+
+    def __init__(self, version: int, ids: Tuple[int, ...], values: List[float]):
+        self.version = version
+        self.ids = ids
+        self.values = values
+        self._records: Optional[List[bytes]] = None
+
+    def records(self) -> List[bytes]:
+        if self._records is None:
+            pack = _RECORD.pack
+            vals = self.values
+            out = []
+            for k, fid in enumerate(self.ids):
+                q = [int(65535 * (0.0 if v < 0.0 else 1.0 if v > 1.0 else v))
+                     for v in vals[k * _WIDTH:(k + 1) * _WIDTH]]
+                out.append(pack(fid & 0xFFFF, *q))
+            self._records = out
+        return self._records
+
+
+class StateMirror:
+    def __init__(self, host: str = "0.0.0.0", port: int = 8080,
+                 default_rate_hz: float = 15.0, max_rate_hz: float = 60.0):
+        self.host = host
+        self.port = int(port)
+        self.max_rate_hz = max(1.0, float(max_rate_hz))
+        self.default_rate_hz = max(1.0, min(float(default_rate_hz), self.max_rate_hz))
+
+        self._latest = _Snapshot(0, (), [])
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._server = None
+        self._clients = 0
+
+    @classmethod
+    def from_config(cls, cfg: Optional[dict]) -> "StateMirror":
+        cfg = cfg or {}
+        return cls(
+            host=str(cfg.get("host", "0.0.0.0")),
+            port=int(cfg.get("port", 8080)),
+            default_rate_hz=float(cfg.get("default_rate_hz", 15)),
+            max_rate_hz=float(cfg.get("max_rate_hz", 60)),
+        )
+
+    @property
+    def client_count(self) -> int:
+        return self._clients
+
+    # ------------------------------------------------------------------
+    # Côté boucle principale
+    # ------------------------------------------------------------------
+    def publish(self, ids: Sequence[int], values: List[float]) -> None:
+        """Nouvel état (ids + 7 valeurs par fixture). Ignoré s'il est identique au précédent."""
+        latest = self._latest
+        ids = tuple(ids)
+        if ids == latest.ids and values == latest.values:
+            return
+        self._latest = _Snapshot(latest.version + 1, ids, list(values))
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        ready = threading.Event()
+
+        def run():
+            loop = self._loop = asyncio.new_event_loop()
+            try:
+                self._server = loop.run_until_complete(
+                    asyncio.start_server(self._handle, self.host, self.port)
+                )
+                logger.info("State mirror on http://%s:%s/", self.host, self.port)
+            except Exception as e:
+                logger.error("State mirror start failed: %s", e)
+                ready.set()
+                loop.close()
+                return
+            ready.set()
+            try:
+                loop.run_forever()
+            finally:
+                self._server.close()
+                loop.run_until_complete(self._server.wait_closed())
+                tasks = asyncio.all_tasks(loop)
+                for task in tasks:
+                    task.cancel()
+                loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+                loop.close()
+
+        self._thread = threading.Thread(target=run, name="StateMirror", daemon=True)
+        self._thread.start()
+        ready.wait(timeout=2.0)
+
+    def stop(self) -> None:
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self._thread = None
+        self._loop = None
+
+    # ------------------------------------------------------------------
+    # HTTP / WebSocket (thread asyncio)
+    # ------------------------------------------------------------------
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=5.0)
+            lines = head.decode("latin-1").split("\r\n")
+            method, target, _ = lines[0].split(" ", 2)
+            headers = {}
+            for line in lines[1:]:
+                if ":" in line:
+                    k, v = line.split(":", 1)
+                    headers[k.strip().lower()] = v.strip()
+            url = urlsplit(target)
+
+            if method != "GET":
+                await self._http(writer, 405, "text/plain", b"method not allowed")
+            elif url.path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                await self._websocket(reader, writer, headers, parse_qs(url.query))
+            elif url.path in ("/", "/index.html"):
+                await self._http(writer, 200, "text/html; charset=utf-8", _PAGE.encode("utf-8"))
+            else:
+                await self._http(writer, 404, "text/plain", b"not found")
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, asyncio.CancelledError,
+                ConnectionError, ValueError):
+            pass                                # client parti / arrêt du serveur
+        except Exception as e:
+            logger.error("State mirror client error: %s", e)
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _http(writer, status: int, ctype: str, body: bytes) -> None:
+        reason = {200: "OK", 404: "Not Found", 405: "Method Not Allowed"}.get(status, "")
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\nContent-Type: {ctype}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+
+    async def _websocket(self, reader, writer, headers: Dict[str, str], query: Dict[str, list]) -> None:
+        key = headers.get("sec-websocket-key", "")
+        accept = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode("ascii")).digest()).decode("ascii")
+        writer.write(
+            "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n".encode("latin-1")
+        )
+        await writer.drain()
+
+        client = {"rate": self._clamp_rate(query.get("rate", [self.default_rate_hz])[0])}
+        self._clients += 1
+        sender = asyncio.ensure_future(self._send_loop(writer, client))
+        try:
+            await self._recv_loop(reader, writer, client)
+        finally:
+            self._clients -= 1
+            sender.cancel()
+
+    def _clamp_rate(self, value) -> float:
+        try:
+            return max(1.0, min(self.max_rate_hz, float(value)))
+        except (TypeError, ValueError):
+            return self.default_rate_hz
+
+    async def _send_loop(self, writer, client: dict) -> None:
+        sent_version = -1
+        sent_ids: Tuple[int, ...] = ()
+        sent_records: List[bytes] = []
+        try:
+            while True:
+                snap = self._latest
+                if snap.version != sent_version:
+                    records = snap.records()
+                    if snap.ids != sent_ids:
+                        kind, payload = SNAPSHOT, records
+                    else:
+                        kind = DELTA
+                        payload = [rec for rec, old in zip(records, sent_records) if rec != old]
+                    if payload or kind == SNAPSHOT:
+                        msg = _HEADER.pack(kind, snap.version & 0xFFFFFFFF, len(payload)) + b"".join(payload)
+                        writer.write(_ws_frame(0x2, msg))
+                        await writer.drain()       # un client lent n'attend que lui-même
+                    sent_version, sent_ids, sent_records = snap.version, snap.ids, records
+                await asyncio.sleep(1.0 / client["rate"])
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+
+    async def _recv_loop(self, reader, writer, client: dict) -> None:
+        while True:
+            b0, b1 = await reader.readexactly(2)
+            opcode, length = b0 & 0x0F, b1 & 0x7F
+            if length == 126:
+                length = struct.unpack("!H", await reader.readexactly(2))[0]
+            elif length == 127:
+                length = struct.unpack("!Q", await reader.readexactly(8))[0]
+            if length > 4096:
+                return
+            mask = await reader.readexactly(4) if b1 & 0x80 else b"\0\0\0\0"
+            data = bytes(c ^ mask[i % 4] for i, c in enumerate(await reader.readexactly(length)))
+
+            if opcode == 0x8:                   # close
+                writer.write(_ws_frame(0x8, data[:2]))
+                await writer.drain()
+                return
+            if opcode == 0x9:                   # ping → pong
+                writer.write(_ws_frame(0xA, data))
+            elif opcode == 0x1:                 # texte : "rate=10"
+                name, _, value = data.decode("utf-8", "replace").partition("=")
+                if name.strip() == "rate":
+                    client["rate"] = self._clamp_rate(value)
+
+
+def _ws_frame(opcode: int, payload: bytes) -> bytes:
+    n = len(payload)
+    if n < 126:
+        head = struct.pack("!BB", 0x80 | opcode, n)
+    elif n < 65536:
+        head = struct.pack("!BBH", 0x80 | opcode, 126, n)
+    else:
+        head = struct.pack("!BBQ", 0x80 | opcode, 127, n)
+    return head + payload
+
+
+_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Showbuddy — état</title>
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<style>
+body{background:#111;color:#ddd;font:14px sans-serif;margin:12px}
+#grid{display:grid;grid-template-columns:repeat(auto-fill,minmax(90px,1fr));gap:8px}
+.fx{border-radius:6px;height:70px;padding:4px;box-sizing:border-box;text-shadow:0 0 3px #000}
+</style></head>
+<body><div id="info">connexion…</div><div id="grid"></div>
+<script>
+const grid = document.getElementById("grid"), info = document.getElementById("info");
+const cells = new Map();
+const rate = new URLSearchParams(location.search).get("rate") || 15;
+const ws = new WebSocket(`ws://${location.host}/ws?rate=${rate}`);
+ws.binaryType = "arraybuffer";
+ws.onopen = () => info.textContent = `connecté — ${rate} Hz`;
+ws.onclose = () => info.textContent = "déconnecté";
+ws.onmessage = (ev) => {
+  const v = new DataView(ev.data);
+  const kind = v.getUint8(0), n = v.getUint16(5, true);
+  if (kind === 0) { grid.textContent = ""; cells.clear(); }
+  for (let i = 0, o = 7; i < n; i++, o += 16) {
+    const id = v.getUint16(o, true), c = [];
+    for (let k = 0; k < 7; k++) c.push(v.getUint16(o + 2 + 2 * k, true) / 65535);
+    let el = cells.get(id);
+    if (!el) { el = document.createElement("div"); el.className = "fx"; grid.appendChild(el); cells.set(id, el); }
+    const d = c[5], w = c[4];
+    const ch = (x) => Math.round(255 * Math.min(1, (x + w) * d));
+    el.style.background = `rgb(${ch(c[0] + c[3])},${ch(c[1] + 0.5 * c[3])},${ch(c[2])})`;
+    el.textContent = `#${id} ${Math.round(d * 100)}%`;
+  }
+};
+</script></body></html>
+"""
@@ -0,0 +1,324 @@
+# fichier: src/tools/bench.py
+"""
+Benchmarks hors ligne des chemins chauds (aucun réseau, aucun écran) :
+
+- encode : OscClient.send_frame + encodage OSC du /frame (comme le thread expéditeur)
+- decode : datagramme /frame → dispatcher python-osc → on_frame → file d'événements
+- drain  : Engine.drain_events (MainWindow._drain_events) pour N messages par tick
+- build  : Engine.build_frame (MainWindow._build_frame_from_state)
+- output : masters + étage de sortie sur le /frame construit
+- sharded : même étage de sortie réparti sur 1, 2, 4… processus (core.shard), pour
+  mesurer le passage à l'échelle avec le nombre de cœurs
+- render : FixturesView.render sur un canvas factice (compte les appels create_*)
+
+Chaque cas est paramétré par le nombre de fixtures ; les résultats sont écrits
+en JSON pour comparer deux versions (`--compare ancien.json`).
+
+    python app.py --bench [--bench-fixtures 4,20,100] [--bench-out bench_output.json]
+                          [--bench-workers 1,2,4]
+"""
+
+import json
+import os
+import platform
+import queue
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from core.state import CHANNELS, FRAME_STRIDE
+
+DEFAULT_FIXTURES = (4, 20, 100, 500)
+DEFAULT_MSGS_PER_TICK = (10, 100, 1000)
+DEFAULT_OUT = "bench_output.json"
+DEFAULT_WORKERS = (1, 2, 4)
+_OUTPUT_CFG = {
+    "profiles": {"led": {"dimmer_curve": "square", "gamma": 2.2, "bits": 8}},
+    "default_profile": "led",
+}
+
+
+# ----------------------------------------------------------------------
+# Mesure
+# ----------------------------------------------------------------------
+def measure(fn: Callable[[], None], min_time_s: float = 0.2, repeat: int = 5) -> dict:
+    """
+    Chronomètre fn() : calibre un nombre d'appels par lot (≥ min_time_s / repeat),
+    puis `repeat` lots. Temps par appel en µs (médiane, min, moyenne).
+    """
+    fn()                                  # échauffement (caches, imports paresseux)
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        dt = time.perf_counter() - t0
+        if dt >= min_time_s / repeat or number >= 1 << 20:
+            break
+        number *= 2
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - t0) / number * 1e6)
+    return {
+        "calls": number * repeat,
+        "median_us": statistics.median(samples),
+        "min_us": min(samples),
+        "mean_us": statistics.fmean(samples),
+    }
+
+
+def _flat_frame(n: int, phase: float = 0.0) -> List[float]:
+    flat: List[float] = []
+    for fid in range(1, n + 1):
+        v = ((fid * 0.37 + phase) % 1.0)
+        flat.append(fid)
+        flat.extend((v, 1.0 - v, v * 0.5, 0.0, 0.1, v, 0.0))
+    return flat
+
+
+def _make_engine(n: int, tmpdir: Path):
+    from core.engine import Engine
+
+    io_cfg = {"listen_port": 0, "send_port": 0, "remote_ip": "127.0.0.1", "max_rate_hz": 60,
+              "jitter_latency_ms": 0}
+    fx_cfg = {"count": 4, "show_file": str(tmpdir / "bench.show"), "output": {}, "groups": {}}
+    engine = Engine(io_cfg, fx_cfg)
+    for fid in range(1, n + 1):          # au-delà de FIXTURE_COUNT_MAX : directement dans l'état
+        engine.state.ensure_fixture(fid)
+    return engine
+
+
+# ----------------------------------------------------------------------
+# Cas
+# ----------------------------------------------------------------------
+def bench_encode(n: int) -> dict:
+    from pythonosc import udp_client
+    from io_.osc_client import OscClient
+
+    class _Capture(udp_client.SimpleUDPClient):
+        """Même chemin d'encodage que l'envoi réel, sans socket."""
+        def send(self, content):
+            self.last = content.dgram
+
+    osc = OscClient(0, "127.0.0.1", 9, queue.Queue())
+    client = _Capture("127.0.0.1", 9)
+    flat = _flat_frame(n)
+
+    def run():
+        osc.send_frame(1.0, flat, throttle=False)
+        addr, args = osc._outbox.get_nowait()
+        client.send_message(addr, args)
+
+    res = measure(run)
+    res["bytes"] = len(client.last)
+    return res
+
+
+def bench_decode(n: int) -> dict:
+    from pythonosc import udp_client
+    from io_.osc_client import OscClient
+
+    class _Capture(udp_client.SimpleUDPClient):
+        def send(self, content):
+            self.last = content.dgram
+
+    q: queue.Queue = queue.Queue()
+    osc = OscClient(0, "127.0.0.1", 9, q)
+    disp = osc._setup_dispatcher()
+    client = _Capture("127.0.0.1", 9)
+    client.send_message("/frame", [1.0, *_flat_frame(n)])
+    dgram = client.last
+    addr = ("127.0.0.1", 9000)
+
+    def run():
+        disp.call_handlers_for_packet(dgram, addr)
+        q.get_nowait()
+
+    return measure(run)
+
+
+def bench_drain(n: int, msgs: int, tmpdir: Path) -> dict:
+    engine = _make_engine(n, tmpdir)
+    q = engine.event_queue
+    events = []
+    for k in range(msgs):
+        fid = 1 + k % n
+        if k % 3 == 0:
+            events.append(("fixture_color", {"id": fid, "r": 0.5, "g": 0.2, "b": 0.1, "a": 0.0, "w": 0.0,
+                                             "src": "bench"}))
+        elif k % 3 == 1:
+            events.append(("fixture_dimmer", {"id": fid, "value": 0.7, "src": "bench"}))
+        else:
+            events.append(("fixture_strobe", {"id": fid, "rate": 0.1, "src": "bench"}))
+    put = q.put_nowait
+
+    def run():
+        for ev in events:
+            put(ev)
+        engine.drain_events()
+
+    res = measure(run, min_time_s=0.3)
+    res["msgs_per_s_capacity"] = msgs / (res["median_us"] / 1e6)
+    engine.stop()
+    return res
+
+
+def bench_build(n: int, tmpdir: Path) -> dict:
+    engine = _make_engine(n, tmpdir)
+    res = measure(engine.build_frame)
+    engine.stop()
+    return res
+
+
+def bench_output(n: int, tmpdir: Path) -> dict:
+    from core.masters import MasterSection
+    from core.output import OutputProcessor
+
+    masters = MasterSection({"front": range(1, n // 2 + 1), "back": range(n // 2, n + 1)})
+    masters.set_level("front", 0.8)
+    output = OutputProcessor.from_config(_OUTPUT_CFG)
+    flat = _flat_frame(n)
+    return measure(lambda: output.process(masters.apply(flat)))
+
+
+def bench_sharded(n: int, workers: int) -> dict:
+    from core.shard import ShardedOutput
+
+    # Échéance longue : on mesure le débit, pas le repli sur la frame précédente
+    output = ShardedOutput(_OUTPUT_CFG, workers=workers, deadline_ms=1000, min_fixtures=1, capacity=n)
+    output.start()
+    try:
+        flat = _flat_frame(n)
+        res = measure(lambda: output.process(flat))
+        res["workers"] = workers
+        res["late_shards"] = output.late_shards
+        return res
+    finally:
+        output.close()
+
+
+class _StubCanvas:
+    """Canvas factice : compte les items créés, sans Tk ni affichage."""
+
+    def __init__(self, width: int = 900, height: int = 700):
+        self._w, self._h = width, height
+        self.items = 0
+
+    def winfo_width(self):
+        return self._w
+
+    def winfo_height(self):
+        return self._h
+
+    def delete(self, *_args):
+        self.items = 0
+
+    def _create(self, *_args, **_kw):
+        self.items += 1
+        return self.items
+
+    create_rectangle = create_text = create_line = create_oval = create_image = _create
+
+
+def bench_render(n: int, tmpdir: Path) -> Optional[dict]:
+    try:
+        from ui.fixtures_view import FixturesView
+    except ImportError:                  # tkinter absent : cas ignoré
+        return None
+    engine = _make_engine(n, tmpdir)
+    engine.state.selection.set(range(1, min(n, 3) + 1))
+
+    # Pas de Tk : on n'appelle pas __init__, seul l'état lu par render() est posé
+    view = FixturesView.__new__(FixturesView)
+    view.canvas = _StubCanvas()
+    view._cell_bbox = {}
+    view._selected_id = None
+    view._selection_count = 0
+    view._band = None
+    view._last_fixture_ids = []
+
+    res = measure(lambda: view.render(engine.state))
+    res["canvas_items"] = view.canvas.items
+    engine.stop()
+    return res
+
+
+# ----------------------------------------------------------------------
+# Suite
+# ----------------------------------------------------------------------
+def run_suite(fixture_counts: Sequence[int] = DEFAULT_FIXTURES,
+              msgs_per_tick: Sequence[int] = DEFAULT_MSGS_PER_TICK,
+              workers: Sequence[int] = DEFAULT_WORKERS) -> dict:
+    results = []
+
+    def record(name: str, n: int, res: Optional[dict], **params):
+        if res is None:
+            return
+        entry = {"name": name, "fixtures": n, **params, **res}
+        results.append(entry)
+        extra = "".join(f" {k}={v}" for k, v in params.items())
+        print(f"{name:<8} fixtures={n:<5}{extra:<11} median {res['median_us']:10.1f} µs", flush=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmpdir = Path(tmp)
+        for n in fixture_counts:
+            record("encode", n, bench_encode(n))
+            record("decode", n, bench_decode(n))
+            for msgs in msgs_per_tick:
+                record("drain", n, bench_drain(n, msgs, tmpdir), msgs=msgs)
+            record("build", n, bench_build(n, tmpdir))
+            record("output", n, bench_output(n, tmpdir))
+            for w in workers:
+                record("sharded", n, bench_sharded(n, w), workers=w)
+            record("render", n, bench_render(n, tmpdir))
+
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "channels": list(CHANNELS),
+            "frame_stride": FRAME_STRIDE,
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def _key(entry: dict) -> tuple:
+    return entry["name"], entry["fixtures"], entry.get("msgs"), entry.get("workers")
+
+
+def compare(old: dict, new: dict) -> List[str]:
+    """Lignes 'cas : ancien → nouveau (ratio)' pour les cas présents des deux côtés."""
+    before: Dict[tuple, dict] = {_key(e): e for e in old.get("results", [])}
+    lines = []
+    for e in new.get("results", []):
+        o = before.get(_key(e))
+        if o is None:
+            continue
+        ratio = e["median_us"] / o["median_us"] if o["median_us"] else float("inf")
+        flag = "  ← plus lent" if ratio > 1.10 else "  ← plus rapide" if ratio < 0.90 else ""
+        label = f"{e['name']} n={e['fixtures']}" + "".join(
+            f" {k}={e[k]}" for k in ("msgs", "workers") if e.get(k))
+        lines.append(f"{label:<28} {o['median_us']:10.1f} → {e['median_us']:10.1f} µs  ×{ratio:.2f}{flag}")
+    return lines
+
+
+def main(fixture_counts: Optional[Sequence[int]] = None, out: str = DEFAULT_OUT,
+         compare_with: Optional[str] = None, workers: Optional[Sequence[int]] = None) -> int:
+    report = run_suite(fixture_counts or DEFAULT_FIXTURES, workers=workers or DEFAULT_WORKERS)
+    Path(out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"→ {out}")
+    if compare_with:
+        old = json.loads(Path(compare_with).read_text(encoding="utf-8"))
+        print("\n".join(compare(old, report)))
+    return 0
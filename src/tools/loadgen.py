@@ -0,0 +1,223 @@
+# fichier: src/tools/loadgen.py
+"""
+Générateur de charge en boucle locale : remplaçant de Max pour tester l'app.
+
+- envoie /app/hello (heartbeat), puis des /frame (ou des messages /fixture/<id>/*)
+  vers listen_port, pour N fixtures à la fréquence choisie
+- reçoit les /frame que l'app renvoie sur send_port (l'app doit être en WRITE,
+  ex. `python app.py --headless --mode write`)
+- rapporte messages reçus/s, taux de perte et percentiles de latence
+
+Latences mesurées (le strobe de la première fixture porte un marqueur d'envoi,
+perf_counter() modulo STAMP_PERIOD_S, que l'app renvoie tel quel) :
+- sortie      : envoi d'une frame ici → premier /frame de l'app qui la reflète
+                (marqueur ≥ le sien ; le tampon de gigue de l'app peut interpoler).
+                Les instants d'envoi sont gardés ici en float64 : aucune dépendance
+                au t du /frame de l'app (perf_counter en float32 : ~0,25 ms de pas
+                après 1 h de fonctionnement de la machine, ~8 ms après un jour)
+- aller-retour : marqueur de chaque /frame reçu → réception, y compris les frames
+                 que l'app renvoie sans nouvelle entrée
+Les deux processus doivent tourner sur la même machine. Les mesures supposent un
+étage de sortie neutre pour le strobe (pas de quantification sur la première fixture).
+
+    python app.py --loadgen [--fixtures 100] [--rate 60] [--duration 10] [--messages frame|fixture]
+"""
+
+import json
+import socket
+import statistics
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, List, Optional
+
+HELLO_INTERVAL_S = 1.0
+STAMP_PERIOD_S = 10.0        # le strobe code perf_counter() modulo cette période (∈ [0, 1[)
+PENDING_MAX_S = 1.0          # frames sans reflet oubliées au-delà (perdues)
+
+
+def _percentiles(values: List[float]) -> dict:
+    if not values:
+        return {}
+    values = sorted(values)
+    n = len(values)
+
+    def pct(p):
+        return values[min(n - 1, int(p / 100.0 * n))] * 1000.0
+
+    return {"count": n, "p50_ms": pct(50), "p90_ms": pct(90), "p99_ms": pct(99),
+            "max_ms": values[-1] * 1000.0, "mean_ms": statistics.fmean(values) * 1000.0}
+
+
+class LoadGenerator:
+    def __init__(self, target_ip: str, listen_port: int, recv_port: int,
+                 fixtures: int = 20, rate_hz: float = 60.0, messages: str = "frame"):
+        if messages not in ("frame", "fixture"):
+            raise ValueError("messages doit valoir 'frame' ou 'fixture'")
+        self.target_ip = target_ip
+        self.listen_port = int(listen_port)
+        self.recv_port = int(recv_port)
+        self.fixtures = max(1, int(fixtures))
+        self.rate_hz = max(1.0, float(rate_hz))
+        self.messages = messages
+
+        self.sent_frames = 0
+        self.sent_msgs = 0
+        self.recv_frames = 0
+        self.recv_other = 0
+        self._recv_times: List[float] = []
+        self._out_latency: List[float] = []
+        self._rtt: List[float] = []
+        self._pending: Deque[float] = deque()     # instants d'envoi (float64) pas encore reflétés
+
+    # ------------------------------------------------------------------
+    # Envoi (Max → app)
+    # ------------------------------------------------------------------
+    def _send_tick(self, client, k: int) -> None:
+        now = time.perf_counter()
+        stamp = (now % STAMP_PERIOD_S) / STAMP_PERIOD_S
+        pending = self._pending
+        pending.append(now)
+        while now - pending[0] > PENDING_MAX_S:
+            pending.popleft()
+        phase = (k / self.rate_hz) % 1.0
+        if self.messages == "frame":
+            flat: List[float] = []
+            for fid in range(1, self.fixtures + 1):
+                v = (fid * 0.37 + phase) % 1.0
+                flat.extend((fid, v, 1.0 - v, 0.5 * v, 0.0, 0.0, 1.0, stamp if fid == 1 else 0.0))
+            client.send_message("/frame", [now, *flat])
+            self.sent_msgs += 1
+        else:
+            for fid in range(1, self.fixtures + 1):
+                v = (fid * 0.37 + phase) % 1.0
+                client.send_message(f"/fixture/{fid}/color", [v, 1.0 - v, 0.5 * v, 0.0, 0.0])
+                client.send_message(f"/fixture/{fid}/dimmer", [1.0])
+                client.send_message(f"/fixture/{fid}/strobe", [stamp if fid == 1 else 0.0])
+            self.sent_msgs += 3 * self.fixtures
+        self.sent_frames += 1
+
+    # ------------------------------------------------------------------
+    # Réception (app → Max)
+    # ------------------------------------------------------------------
+    def _on_datagram(self, data: bytes, now: float) -> None:
+        from pythonosc.osc_message import OscMessage
+
+        try:
+            msg = OscMessage(data)
+        except Exception:
+            return
+        if msg.address != "/frame":
+            self.recv_other += 1
+            return
+        args = msg.params
+        self.recv_frames += 1
+        self._recv_times.append(now)
+        if len(args) >= 9:
+            sent_phase = float(args[8]) * STAMP_PERIOD_S          # strobe de la 1re fixture
+            rtt = (now % STAMP_PERIOD_S) - sent_phase
+            if rtt < 0:
+                rtt += STAMP_PERIOD_S
+            # < 1 s : écarte les valeurs interpolées à travers le rebouclage de la période
+            if sent_phase > 0 and rtt < 1.0:
+                self._rtt.append(rtt)
+                # Frames envoyées jusqu'au marqueur reçu : ce /frame est leur premier reflet
+                # (1 µs de marge : pas du float32 sur [0, 1[ × STAMP_PERIOD_S ≈ 0,6 µs)
+                reflected = now - rtt + 1e-6
+                pending = self._pending
+                while pending and pending[0] <= reflected:
+                    self._out_latency.append(now - pending.popleft())
+
+    # ------------------------------------------------------------------
+    # Boucle
+    # ------------------------------------------------------------------
+    def run(self, duration_s: float = 10.0) -> dict:
+        from pythonosc import udp_client
+
+        client = udp_client.SimpleUDPClient(self.target_ip, self.listen_port)
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        sock.bind(("0.0.0.0", self.recv_port))
+
+        interval = 1.0 / self.rate_hz
+        t_start = time.perf_counter()
+        t_end = t_start + duration_s
+        next_send = t_start
+        next_hello = t_start
+        k = 0
+        try:
+            while True:
+                now = time.perf_counter()
+                if now >= t_end:
+                    break
+                if now >= next_hello:
+                    client.send_message("/app/hello", [])
+                    next_hello += HELLO_INTERVAL_S
+                if now >= next_send:
+                    self._send_tick(client, k)
+                    k += 1
+                    next_send += interval
+                    if next_send < now:             # retard : on ne rattrape pas en rafale
+                        next_send = now + interval
+                sock.settimeout(max(0.0005, min(next_send, next_hello, t_end) - time.perf_counter()))
+                try:
+                    data = sock.recv(65535)
+                except socket.timeout:
+                    continue
+                self._on_datagram(data, time.perf_counter())
+        finally:
+            sock.close()
+        return self.report(time.perf_counter() - t_start)
+
+    def report(self, elapsed_s: float) -> dict:
+        # Pertes estimées : trous dans le flux reçu (> 1,5 × l'intervalle médian)
+        gaps = [b - a for a, b in zip(self._recv_times, self._recv_times[1:])]
+        missing = 0
+        if len(gaps) >= 2:
+            typical = statistics.median(gaps)
+            if typical > 0:
+                missing = sum(int(round(g / typical)) - 1 for g in gaps if g > 1.5 * typical)
+        received = self.recv_frames
+        return {
+            "fixtures": self.fixtures,
+            "rate_hz": self.rate_hz,
+            "messages": self.messages,
+            "duration_s": elapsed_s,
+            "sent_frames_per_s": self.sent_frames / elapsed_s,
+            "sent_msgs_per_s": self.sent_msgs / elapsed_s,
+            "recv_frames_per_s": received / elapsed_s,
+            "recv_frames": received,
+            "drop_rate": missing / (received + missing) if received + missing else 0.0,
+            "output_latency": _percentiles(self._out_latency),
+            "round_trip": _percentiles(self._rtt),
+        }
+
+
+def _print_report(rep: dict) -> None:
+    print(f"Envoyé : {rep['sent_frames_per_s']:.1f} frames/s ({rep['sent_msgs_per_s']:.0f} msg/s, "
+          f"{rep['fixtures']} fixtures, mode {rep['messages']})")
+    print(f"Reçu   : {rep['recv_frames_per_s']:.1f} /frame/s — pertes estimées {rep['drop_rate'] * 100:.2f} %")
+    for label, key in (("Latence sortie", "output_latency"), ("Aller-retour", "round_trip")):
+        p = rep[key]
+        if p:
+            print(f"{label:<15}: p50 {p['p50_ms']:.2f} ms | p90 {p['p90_ms']:.2f} ms | "
+                  f"p99 {p['p99_ms']:.2f} ms | max {p['max_ms']:.2f} ms ({p['count']} échantillons)")
+        else:
+            print(f"{label:<15}: aucun échantillon")
+    if not rep["recv_frames"]:
+        print("Aucun /frame reçu : l'app est-elle en WRITE et remote_ip pointe-t-il sur cette machine ?")
+
+
+def main(io_cfg: dict, fixtures: int = 20, rate_hz: float = 60.0, duration_s: float = 10.0,
+         messages: str = "frame", out: Optional[str] = None) -> int:
+    gen = LoadGenerator("127.0.0.1", io_cfg["listen_port"], io_cfg["send_port"],
+                        fixtures=fixtures, rate_hz=rate_hz, messages=messages)
+    try:
+        rep = gen.run(duration_s)
+    except OSError as e:
+        print(f"Port {io_cfg['send_port']} indisponible : {e}")
+        return 1
+    _print_report(rep)
+    if out:
+        Path(out).write_text(json.dumps(rep, indent=2), encoding="utf-8")
+    return 0
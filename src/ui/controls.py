@@ -23,7 +23,8 @@ def _clamp01(x: float) -> float:
 class ControlsPanel(ttk.Frame):
     """
     Panneau de sliders pour la fixture sélectionnée (R,G,B,A,W,Dimmer,Strobe).
-    - on_change(param_name: str, value: float) est appelé à chaque changement.
+    - on_change(param_name: str, value: float) est appelé par flush_changes(), une fois par
+      tick et par paramètre modifié (un glissé rapide ne produit qu'une écriture par tick).
     - set_mode(write: bool) active/désactive les contrôles selon le mode.
     - load_from_fixture(fid, fx) affiche les valeurs de la fixture sélectionnée.
     """
@@ -33,6 +34,8 @@ class ControlsPanel(ttk.Frame):
         self._on_change = on_change
         self._selected_id: Optional[int] = None
         self._updating = False  # évite boucle lors du chargement
+        self._pending = {}      # name -> valeur, en attente du prochain tick
+        self._dragging: Optional[str] = None   # slider tenu à la souris : pas de retour d'état
 
         # Titre
         self._title_var = tk.StringVar(value="No fixture selected")
@@ -54,6 +57,8 @@ class ControlsPanel(ttk.Frame):
                 self, from_=0.0, to=1.0, orient=tk.HORIZONTAL, variable=var,
                 command=lambda _v, n=name: self._on_scale(n)
             )
+            scale.bind("<ButtonPress-1>", lambda _e, n=name: self._on_drag(n))
+            scale.bind("<ButtonRelease-1>", lambda _e: self._on_drag(None))
             scale.grid(row=row, column=1, sticky="ew", padx=6, pady=4)
             self.columnconfigure(1, weight=1)
 
@@ -88,24 +93,36 @@ class ControlsPanel(ttk.Frame):
         else:
             self._title_var.set(f"Fixture {fid}")
 
-    def load_from_fixture(self, fid: int, fx) -> None:
-        """Charge les valeurs de la fixture dans les sliders (sans déclencher les callbacks)."""
+    def load_from_fixture(self, fid: int, fx, count: int = 1) -> None:
+        """
+        Charge les valeurs de la fixture dans les sliders (sans déclencher les callbacks).
+        count > 1 : multi-sélection, `fid` est la fixture de référence.
+        """
         self._selected_id = fid
-        self._title_var.set(f"Fixture {fid}")
+        self._title_var.set(f"Fixture {fid}" if count <= 1 else f"{count} fixtures (ref. {fid})")
         self._updating = True
         try:
-            # Met à jour les seven vars
-            self._vars["r"].set(_clamp01(getattr(fx, "r", 0.0)))
-            self._vars["g"].set(_clamp01(getattr(fx, "g", 0.0)))
-            self._vars["b"].set(_clamp01(getattr(fx, "b", 0.0)))
-            self._vars["a"].set(_clamp01(getattr(fx, "a", 0.0)))
-            self._vars["w"].set(_clamp01(getattr(fx, "w", 0.0)))
-            self._vars["dimmer"].set(_clamp01(getattr(fx, "dimmer", 0.0)))
-            self._vars["strobe"].set(_clamp01(getattr(fx, "strobe", 0.0)))
-            self._refresh_value_labels()
+            # Seules les vars qui changent sont réécrites ; le slider tenu et les valeurs
+            # pas encore appliquées gardent ce que l'utilisateur est en train de régler
+            for name, var in self._vars.items():
+                if name == self._dragging or name in self._pending:
+                    continue
+                v = _clamp01(getattr(fx, name, 0.0))
+                if abs(var.get() - v) > 1e-6:
+                    var.set(v)
+                    self._value_labels[name].set(f"{v:.2f}")
         finally:
             self._updating = False
 
+    def flush_changes(self) -> None:
+        """Applique les valeurs accumulées depuis le tick précédent (une par paramètre)."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        if self._on_change:
+            for name, v in pending.items():
+                self._on_change(name, v)
+
     # ------------------------------------------------------------------
     # Internes
     # ------------------------------------------------------------------
@@ -120,11 +137,13 @@ class ControlsPanel(ttk.Frame):
         for name, var in self._vars.items():
             self._value_labels[name].set(f"{var.get():.2f}")
 
+    def _on_drag(self, name: Optional[str]):
+        self._dragging = name
+
     def _on_scale(self, name: str):
+        # Appelé à chaque pixel de glissé : on mémorise seulement, flush_changes() applique
         if self._updating:
             return
         v = _clamp01(self._vars[name].get())
-        self._vars[name].set(v)
         self._value_labels[name].set(f"{v:.2f}")
-        if self._on_change:
-            self._on_change(name, v)
\ No newline at end of file
+        self._pending[name] = v
@@ -18,7 +18,8 @@ class ControlsListView(ttk.Frame):
     """
     Panneau scrollable contenant un groupe de 7 sliders pour chaque fixture.
     - Appeler render(state) à chaque tick (léger).
-    - Callback on_change(fid:int, name:str, value:float) pour propager les modifications.
+    - Callback on_change(fid:int, name:str, value:float) pour propager les modifications,
+      appelé par flush_changes() une fois par tick et par slider modifié.
     - La vue se régénère si l'ensemble des fixture IDs a changé.
     """
 
@@ -41,6 +42,8 @@ class ControlsListView(ttk.Frame):
         # state
         self._built_for_ids = []
         self._widgets = {}   # fid -> { name -> (scale, var, labelVar) }
+        self._pending = {}   # (fid, name) -> valeur, en attente du prochain tick
+        self._dragging = None  # (fid, name) du slider tenu à la souris
 
     # ------------------------------------------------------------------
     def render(self, state) -> None:
@@ -55,6 +58,8 @@ class ControlsListView(ttk.Frame):
                 continue
             wmap = self._widgets.get(fid, {})
             for short, name in PARAMS:
+                if (fid, name) == self._dragging or (fid, name) in self._pending:
+                    continue
                 var = wmap.get(name, {}).get("var")
                 valLabel = wmap.get(name, {}).get("val")
                 if var is None or valLabel is None:
@@ -86,6 +91,8 @@ class ControlsListView(ttk.Frame):
                 var = tk.DoubleVar(value=_clamp01(getattr(fx, name if name!="dim" else "dimmer", getattr(fx, name, 0.0)) if fx else 0.0))
                 scale = ttk.Scale(group, from_=0.0, to=1.0, orient=tk.HORIZONTAL, variable=var,
                                   command=lambda _v, _fid=fid, _n=name, _var=var: self._on_scale(_fid, _n, _var))
+                scale.bind("<ButtonPress-1>", lambda _e, _key=(fid, name): self._on_drag(_key))
+                scale.bind("<ButtonRelease-1>", lambda _e: self._on_drag(None))
                 scale.grid(row=r2, column=1, sticky="ew", padx=6, pady=2)
                 valVar = tk.StringVar(value=f"{var.get():.2f}")
                 ttk.Label(group, textvariable=valVar, width=6).grid(row=r2, column=2, sticky="e", pady=2)
@@ -97,8 +104,22 @@ class ControlsListView(ttk.Frame):
 
         self._built_for_ids = ids
 
+    def flush_changes(self) -> None:
+        """Applique les valeurs accumulées depuis le tick précédent (une par slider)."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        if self._on_change:
+            for (fid, name), v in pending.items():
+                self._on_change(fid, name, v)
+
+    def _on_drag(self, key):
+        self._dragging = key
+
     def _on_scale(self, fid: int, name: str, var: tk.DoubleVar):
+        # Appelé à chaque pixel de glissé : on mémorise seulement, flush_changes() applique
         v = _clamp01(var.get())
-        var.set(v)
-        if self._on_change:
-            self._on_change(fid, name, v)
\ No newline at end of file
+        label = self._widgets.get(fid, {}).get(name, {}).get("val")
+        if label is not None:
+            label.set(f"{v:.2f}")
+        self._pending[(fid, name)] = v
\ No newline at end of file
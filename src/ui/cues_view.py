@@ -1,2 +1,75 @@
-# Placeholder for future Cue/Timeline UI (Step 4)
-# Intentionally left minimal in Step 1.
+# fichier: src/ui/cues_view.py
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Iterable, Optional
+
+
+class CuesView(ttk.Frame):
+    """
+    Petit panneau de cues :
+    - liste des cues du fichier show
+    - champ numéro + boutons Store / Recall
+
+    Callbacks attendus (MainWindow):
+      - on_store(cue_id:int)
+      - on_recall(cue_id:int)
+    """
+
+    def __init__(
+        self,
+        parent,
+        on_store: Optional[Callable[[int], None]] = None,
+        on_recall: Optional[Callable[[int], None]] = None,
+    ):
+        super().__init__(parent, padding=10)
+        self._on_store = on_store
+        self._on_recall = on_recall
+
+        ttk.Label(self, text="Cues", font=("Segoe UI", 10, "bold")).grid(
+            row=0, column=0, columnspan=3, sticky="w", pady=(0, 8)
+        )
+
+        self.listbox = tk.Listbox(self, height=10, width=14, exportselection=False)
+        self.listbox.grid(row=1, column=0, columnspan=3, sticky="nsew")
+        self.listbox.bind("<<ListboxSelect>>", self._on_list_select)
+        self.listbox.bind("<Double-Button-1>", lambda _e: self._on_recall_click())
+        self.rowconfigure(1, weight=1)
+
+        self.cue_var = tk.IntVar(value=1)
+        ttk.Spinbox(self, from_=1, to=99999, textvariable=self.cue_var, width=6).grid(
+            row=2, column=0, sticky="w", pady=(6, 0)
+        )
+        ttk.Button(self, text="Store", command=self._on_store_click).grid(row=2, column=1, padx=(6, 0), pady=(6, 0))
+        ttk.Button(self, text="Recall", command=self._on_recall_click).grid(row=2, column=2, padx=(6, 0), pady=(6, 0))
+
+    # ------------------------------------------------------------------
+    # API pour MainWindow
+    # ------------------------------------------------------------------
+    def set_cues(self, cue_ids: Iterable[int]) -> None:
+        self.listbox.delete(0, tk.END)
+        for cid in cue_ids:
+            self.listbox.insert(tk.END, str(cid))
+
+    # ------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------
+    def _current_cue(self) -> Optional[int]:
+        try:
+            return max(1, int(self.cue_var.get()))
+        except Exception:
+            return None
+
+    def _on_list_select(self, _evt=None):
+        sel = self.listbox.curselection()
+        if sel:
+            self.cue_var.set(int(self.listbox.get(sel[0])))
+
+    def _on_store_click(self):
+        cid = self._current_cue()
+        if cid is not None and self._on_store:
+            self._on_store(cid)
+
+    def _on_recall_click(self):
+        cid = self._current_cue()
+        if cid is not None and self._on_recall:
+            self._on_recall(cid)
@@ -1,14 +1,16 @@
 # fichier: src/ui/fixtures_view.py
 import tkinter as tk
 from tkinter import ttk
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, List, Optional
+
+from core.state import GRID_COLS
 
 BAR_HEIGHT = 10          # hauteur d'une barre (rgba, w, dimmer, strobe)
 BAR_SPACING = 4          # espace vertical entre barres
 CELL_PADDING = 8         # marge intérieure d'une cellule
 CELL_W = 160             # largeur d'une cellule (fixe, grille auto)
 CELL_H = 140             # hauteur d'une cellule
-COLS = 5                 # nombre de colonnes pour l'auto-grid
+COLS = GRID_COLS         # nombre de colonnes pour l'auto-grid
 
 # Couleurs de barres
 COLOR_R = "#ff4040"
@@ -23,6 +25,14 @@ COLOR_STROBE = "#b36bff"  # violet
 # Contour sélection
 SELECT_OUTLINE = "#00c8ff"
 SELECT_WIDTH = 3
+SELECT_OUTLINE_MULTI = "#0088b0"   # autres fixtures de la sélection
+SELECT_WIDTH_MULTI = 2
+BAND_OUTLINE = "#00c8ff"           # rectangle de sélection (drag)
+DRAG_THRESHOLD = 4                 # px avant de considérer un drag
+
+# Modificateurs (event.state)
+_MOD_SHIFT = 0x0001
+_MOD_CTRL = 0x0004
 
 def _clamp01(x: float) -> float:
     try:
@@ -34,12 +44,23 @@ class FixturesView(ttk.Frame):
     """
     Vue principale qui dessine les fixtures en grille.
     Chaque fixture est une cellule avec 7 barres : R G B A W | Dimmer | Strobe
-    - on_select(fid: int | None) est appelé quand l'utilisateur clique une cellule
+    - on_select(fid: int | None) est appelé sur un clic simple
+    - on_select_many(ids, mode) : mode "toggle" (Ctrl+clic), "range" (Maj+clic),
+      "replace" / "add" (rectangle de sélection, Maj pour ajouter)
+    - on_selection_slot(slot, store) : touches 1..9 rappellent un jeu, Ctrl+1..9 l'enregistrent
     - render(state) est appelé depuis la boucle UI pour redessiner.
     """
-    def __init__(self, parent, on_select: Optional[Callable[[Optional[int]], None]] = None):
+    def __init__(
+        self,
+        parent,
+        on_select: Optional[Callable[[Optional[int]], None]] = None,
+        on_select_many: Optional[Callable[[List[int], str], None]] = None,
+        on_selection_slot: Optional[Callable[[int, bool], None]] = None,
+    ):
         super().__init__(parent)
         self._on_select = on_select
+        self._on_select_many = on_select_many
+        self._on_selection_slot = on_selection_slot
 
         # Canvas pour dessiner la grille
         self.canvas = tk.Canvas(self, bg="#151515", highlightthickness=0)
@@ -48,9 +69,17 @@ class FixturesView(ttk.Frame):
         # Données de placement (id -> bbox)
         self._cell_bbox: Dict[int, tuple[int, int, int, int]] = {}
         self._selected_id: Optional[int] = None
-
-        # Binding clic
-        self.canvas.bind("<Button-1>", self._on_click)
+        self._selection_count = 0
+
+        # Clic / rectangle de sélection / jeux de sélection (clavier)
+        self._press = None          # (x, y, state) au ButtonPress
+        self._band = None           # (x0, y0, x1, y1) pendant un drag
+        self.canvas.bind("<ButtonPress-1>", self._on_press)
+        self.canvas.bind("<B1-Motion>", self._on_drag)
+        self.canvas.bind("<ButtonRelease-1>", self._on_release)
+        for digit in range(1, 10):
+            self.canvas.bind(f"<Key-{digit}>", lambda _e, d=digit: self._on_slot_key(d, False))
+            self.canvas.bind(f"<Control-Key-{digit}>", lambda _e, d=digit: self._on_slot_key(d, True))
 
         # Mise à l'échelle responsive
         self.bind("<Configure>", self._on_resize)
@@ -121,6 +150,15 @@ class FixturesView(ttk.Frame):
 
         # Sélection visuelle si existante
         self._selected_id = state.selected_fixture
+        self._selection_count = len(state.selection)
+        for fid in state.selection:
+            if fid == self._selected_id or fid not in self._cell_bbox:
+                continue
+            x0, y0, x1, y1 = self._cell_bbox[fid]
+            self.canvas.create_rectangle(
+                x0 + 2, y0 + 2, x1 - 2, y1 - 2,
+                outline=SELECT_OUTLINE_MULTI, width=SELECT_WIDTH_MULTI
+            )
         if self._selected_id in self._cell_bbox:
             x0, y0, x1, y1 = self._cell_bbox[self._selected_id]
             self.canvas.create_rectangle(
@@ -128,6 +166,10 @@ class FixturesView(ttk.Frame):
                 outline=SELECT_OUTLINE, width=SELECT_WIDTH
             )
 
+        # Rectangle de sélection en cours
+        if self._band is not None:
+            self.canvas.create_rectangle(*self._band, outline=BAND_OUTLINE, dash=(4, 2))
+
         self._last_fixture_ids = fixture_ids
 
     # ----------------------------------------------------------------------
@@ -205,25 +247,79 @@ class FixturesView(ttk.Frame):
     # ----------------------------------------------------------------------
     # Interaction
     # ----------------------------------------------------------------------
-    def _on_click(self, event) -> None:
-        # Trouver la cellule cliquée
-        x, y = event.x, event.y
-        clicked_id = None
+    def _cell_at(self, x: int, y: int) -> Optional[int]:
         for fid, (x0, y0, x1, y1) in self._cell_bbox.items():
             if x0 <= x <= x1 and y0 <= y <= y1:
-                clicked_id = fid
-                break
-
-        # Toggle si on reclique la même cellule -> désélection
-        if clicked_id is not None:
-            if self._selected_id == clicked_id:
-                self._selected_id = None
-                if self._on_select:
-                    self._on_select(None)
-            else:
-                self._selected_id = clicked_id
-                if self._on_select:
-                    self._on_select(clicked_id)
+                return fid
+        return None
+
+    def _on_press(self, event) -> None:
+        self.canvas.focus_set()   # pour les touches 1..9
+        self._press = (event.x, event.y, event.state)
+        self._band = None
+
+    def _on_drag(self, event) -> None:
+        if self._press is None:
+            return
+        px, py, _ = self._press
+        if self._band is None and abs(event.x - px) < DRAG_THRESHOLD and abs(event.y - py) < DRAG_THRESHOLD:
+            return
+        self._band = (min(px, event.x), min(py, event.y), max(px, event.x), max(py, event.y))
+        # Retour visuel immédiat (le prochain render le redessinera aussi)
+        self.canvas.delete("band")
+        self.canvas.create_rectangle(*self._band, outline=BAND_OUTLINE, dash=(4, 2), tags="band")
+
+    def _on_release(self, event) -> None:
+        if self._press is None:
+            return
+        _, _, mods = self._press
+        self._press = None
+
+        if self._band is not None:
+            bx0, by0, bx1, by1 = self._band
+            self._band = None
+            self.canvas.delete("band")
+            ids = [
+                fid for fid, (x0, y0, x1, y1) in self._cell_bbox.items()
+                if x0 <= bx1 and bx0 <= x1 and y0 <= by1 and by0 <= y1
+            ]
+            if self._on_select_many:
+                self._on_select_many(sorted(ids), "add" if mods & _MOD_SHIFT else "replace")
+            return
+
+        self._on_click(event, mods)
+
+    def _on_click(self, event, mods: int = 0) -> None:
+        # Trouver la cellule cliquée
+        clicked_id = self._cell_at(event.x, event.y)
+        if clicked_id is None:
+            return
+
+        if mods & _MOD_CTRL and self._on_select_many:
+            self._on_select_many([clicked_id], "toggle")
+            return
+        if mods & _MOD_SHIFT and self._on_select_many:
+            self._on_select_many([clicked_id], "range")
+            return
+
+        # Toggle si on reclique la seule cellule sélectionnée -> désélection
+        if self._selected_id == clicked_id and self._selection_count <= 1:
+            self._selected_id = None
+            if self._on_select:
+                self._on_select(None)
+        else:
+            self._selected_id = clicked_id
+            if self._on_select:
+                self._on_select(clicked_id)
+
+    def _on_slot_key(self, slot: int, store: bool) -> str:
+        if self._on_selection_slot:
+            self._on_selection_slot(slot, store)
+        return "break"
+
+    def display_order(self) -> List[int]:
+        """Ids dans l'ordre de la grille (pour les plages Maj+clic)."""
+        return list(self._last_fixture_ids)
 
     def _on_resize(self, _event) -> None:
         # Redessiner lors de changements de taille (le prochain render mettra à jour)
@@ -2,9 +2,6 @@
 
 import tkinter as tk
 from tkinter import ttk
-import queue
-from pathlib import Path
-import yaml
 
 from core.scheduler import Scheduler
 from utils.log import get_logger
@@ -12,22 +9,66 @@ from ui.fixtures_view import FixturesView
 from ui.toolbar import Toolbar
 from ui.controls import ControlsPanel
 from ui.controls_list import ControlsListView
-from core.modes import READ, normalize_mode
-from core.state import AppState
-from io_.osc_client import OscClient  # IMPORTANT : 'io_' (et non 'io')
+from ui.cues_view import CuesView
+from ui.masters import MastersPanel
+from ui.scope_view import ScopeView
+from ui.toolbar import VIEW_MODES
+from core.config import load_io_config, load_fixtures_config
+from core.engine import Engine
+from core.history import ChannelHistory
+from utils.startup import startup
+from utils.alloc_profile import alloc_profiler
 
 logger = get_logger(__name__)
 
 class MainWindow:
     def __init__(self):
-        self.root = tk.Tk()
-        self.root.title('Lighting Viz — Views & Fixture Count')
-        self.root.minsize(1100, 650)
+        with startup.phase("tk"):
+            self.root = tk.Tk()
+            self.root.title('Lighting Viz — Views & Fixture Count')
+            self.root.minsize(1100, 650)
+
+        # Charger configs + moteur (état, OSC, cues)
+        with startup.phase("config"):
+            self._io_cfg = load_io_config()
+            self._fx_cfg = load_fixtures_config()
+        with startup.phase("engine"):
+            self.engine = Engine(self._io_cfg, self._fx_cfg)
 
         # État global
-        self.state = AppState()
-        self._view_mode = "color"   # "color" | "sliders"
+        self.state = self.engine.state
+        self.event_queue = self.engine.event_queue
+        self.osc = self.engine.osc
+        self.cues = self.engine.cues
+        self._view_mode = "color"   # "color" | "sliders" | "scope"
+        self._panel_dirty = False    # panneau sliders à recharger (une fois par tick)
+
+        with startup.phase("ui"):
+            self._build_ui()
+
+        # Démarrage OSC (READY + mode initial) après le premier affichage
+        self.root.after_idle(self._start_io)
+        self.cues_view.set_cues(self.cues.cue_ids())
+        self.controls_panel.set_mode(self.state.mode)
+        self.toolbar.set_fixture_count_value(len(self.state.fixtures))
+        self.toolbar.set_view_mode_value(self._view_mode)
+
+        # Scheduler (~30 FPS)
+        self._tick_ms = 33
+        # Historique des canaux (vue scope), alimenté à chaque tick même hors de la vue
+        self.history = ChannelHistory.from_config(self._fx_cfg.get("history"), 1000 / self._tick_ms)
+        self.scheduler = Scheduler(self.root, interval_ms=self._tick_ms, on_tick=self.on_tick)
+        self.scheduler.start()
+
+        # Veille : tick ralenti au repos ; clavier / souris réveillent immédiatement.
+        # Une entrée OSC réveille au tick de veille suivant (le thread OSC ne touche pas à Tk).
+        self.engine.idle.on_idle_changed = self._on_idle_changed
+        for sequence in ("<Motion>", "<ButtonPress>", "<KeyPress>", "<MouseWheel>"):
+            self.root.bind_all(sequence, self._on_user_input, add="+")
 
+        self.root.protocol('WM_DELETE_WINDOW', self.on_close)
+
+    def _build_ui(self):
         # --- Toolbar ---
         self.toolbar = Toolbar(
             self.root,
@@ -43,13 +84,27 @@ class MainWindow:
         self.main_frame.pack(fill=tk.BOTH, expand=True)
 
         # Grille de fixtures (aperçu couleur / barres)
-        self.fixtures_view = FixturesView(self.main_frame, on_select=self.on_fixture_select)
+        self.fixtures_view = FixturesView(
+            self.main_frame,
+            on_select=self.on_fixture_select,
+            on_select_many=self.on_fixture_select_many,
+            on_selection_slot=self.on_selection_slot,
+        )
 
         # Panneau sliders par fixture sélectionnée (droite)
         self.controls_panel = ControlsPanel(self.main_frame, on_change=self.on_controls_change)
 
-        # Vue sliders "toutes fixtures"
-        self.controls_list = ControlsListView(self.main_frame, on_change=self.on_controls_list_change)
+        # Vue sliders "toutes fixtures" : construite au premier passage en vue sliders
+        self.controls_list = None
+        # Oscilloscope d'un canal : construit au premier passage en vue scope
+        self.scope_view = None
+
+        # Panneau cues (fichier show)
+        self.cues_view = CuesView(self.main_frame, on_store=self.on_cue_store, on_recall=self.on_cue_recall)
+
+        # Masters (grand master + groupes)
+        self.masters_panel = MastersPanel(self.main_frame, on_change=self.on_master_change)
+        self.masters_panel.set_groups(self.engine.masters.group_names)
 
         # Layout par défaut (mode color): grille à gauche + sliders sélection à droite
         self._layout_color_mode()
@@ -61,49 +116,18 @@ class MainWindow:
         self.status_bar = ttk.Label(self.root, textvariable=self.status_var, anchor='w')
         self.status_bar.pack(fill=tk.X, side=tk.BOTTOM)
 
-        # Queue pour événements OSC
-        self.event_queue = queue.Queue()
-
-        # Charger configs
-        self._io_cfg = self._load_io_config()
-        self._fx_cfg = self._load_fixtures_config()
-
-        # Client OSC
-        self.osc = OscClient(
-            listen_port=self._io_cfg["listen_port"],
-            remote_ip=self._io_cfg["remote_ip"],
-            send_port=self._io_cfg["send_port"],
-            event_queue=self.event_queue
-        )
-        self.osc.start()
-
-        # Fréquence d'envoi
-        try:
-            self.osc._max_rate_hz = int(self._io_cfg.get("max_rate_hz", 60))
-        except Exception:
-            self.osc._max_rate_hz = 60
-
-        # READY + mode initial
-        self.osc.send_app_ready()
-        self.osc.send_mode(self.state.mode)
-        self.controls_panel.set_mode(self.state.mode)
-        self.toolbar.set_fixture_count_value(int(self._fx_cfg.get("count", 4)))
-        self.toolbar.set_view_mode_value(self._view_mode)
-
-        # Pré-allouer des fixtures
-        self._ensure_fixture_count(int(self._fx_cfg.get("count", 4)))
-
-        # Scheduler (~30 FPS)
-        self.scheduler = Scheduler(self.root, interval_ms=33, on_tick=self.on_tick)
-        self.scheduler.start()
-
-        self.root.protocol('WM_DELETE_WINDOW', self.on_close)
+    def _start_io(self):
+        with startup.phase("osc"):
+            self.engine.start()
 
     # ----------------------------------------------------------------------
     # Layout helpers
     # ----------------------------------------------------------------------
     def _clear_main(self):
-        for w in (self.fixtures_view, self.controls_panel, self.controls_list):
+        for w in (self.fixtures_view, self.controls_panel, self.cues_view, self.masters_panel, self.controls_list,
+                  self.scope_view):
+            if w is None:
+                continue
             try:
                 w.pack_forget()
             except Exception:
@@ -114,36 +138,54 @@ class MainWindow:
         self._clear_main()
         self.fixtures_view.pack(fill=tk.BOTH, expand=True, side=tk.LEFT)
         self.controls_panel.pack(fill=tk.Y, side=tk.RIGHT, padx=(6,6), pady=(6,6))
+        self.cues_view.pack(fill=tk.Y, side=tk.RIGHT, pady=(6,6))
+        self.masters_panel.pack(fill=tk.Y, side=tk.RIGHT, pady=(6,6))
 
     def _layout_sliders_mode(self):
         # Vue sliders "toutes fixtures" en plein
         self._clear_main()
+        if self.controls_list is None:
+            self.controls_list = ControlsListView(self.main_frame, on_change=self.on_controls_list_change)
         self.controls_list.pack(fill=tk.BOTH, expand=True, side=tk.LEFT)
 
+    def _layout_scope_mode(self):
+        # Oscilloscope en plein
+        self._clear_main()
+        if self.scope_view is None:
+            self.scope_view = ScopeView(self.main_frame)
+        self.scope_view.pack(fill=tk.BOTH, expand=True, side=tk.LEFT)
+
     # ----------------------------------------------------------------------
     # Tick
     # ----------------------------------------------------------------------
     def on_tick(self):
-        self._drain_events()
+        prof = alloc_profiler
+        with prof.phase("drain"):
+            self._flush_slider_input()
+            self._drain_events()
+            self._refresh_controls_panel()
+            self.history.sample(self.state)
 
         # Redessiner selon le mode d'affichage
-        if self._view_mode == "color":
-            self.fixtures_view.render(self.state)
-        else:
-            self.controls_list.render(self.state)
+        with prof.phase("render"):
+            if self._view_mode == "color":
+                self.fixtures_view.render(self.state)
+                self.masters_panel.sync(self.engine.masters)
+            elif self._view_mode == "scope":
+                self.scope_view.render(self.history, self.state.selection.primary)
+            else:
+                self.controls_list.render(self.state)
 
         # WRITE: envoi automatique d'un /frame (throttle côté OscClient)
-        if self.state.mode == "write":
-            try:
-                t, fixtures_flat = self._build_frame_from_state()
-                if fixtures_flat:
-                    self.osc.send_frame(t, fixtures_flat, throttle=True)
-            except Exception as e:
-                logger.error("send_frame failed: %s", e)
+        with prof.phase("output"):
+            self.engine.send_output()
+            self.engine.publish_state()
 
         # KPIs + statut
         self.state.fps = self.scheduler.fps
         connected_text = "Connected" if self.state.connected else "Not connected"
+        if self.engine.idle.idle:
+            connected_text += " (idle)"
         self.toolbar.set_connected(self.state.connected)
         self.toolbar.set_status_text(connected_text)
         nb_fixtures = len(self.state.fixtures)
@@ -152,89 +194,57 @@ class MainWindow:
             f"{connected_text} | "
             f"FPS: {self.state.fps:.0f} | "
             f"Msg/s: {self.state.msgs_per_sec:.0f} | "
+            f"Out: {self.state.out_effective_hz:.0f}/{self.state.out_rate_hz:.0f} Hz"
+            f" ({self.state.out_drops} drops) | "
             f"Fixtures: {nb_fixtures}"
         )
+        startup.mark_first_frame()
+        prof.end_tick()
+
+    def _on_user_input(self, _event=None):
+        self.engine.idle.note_activity()
+
+    def _on_idle_changed(self, idle: bool):
+        idle_ms = int(1000 / self.engine.idle.idle_tick_hz)
+        self.scheduler.set_interval(max(self._tick_ms, idle_ms) if idle else self._tick_ms)
+        if not idle:
+            self.scheduler.wake()
+
+    def _flush_slider_input(self):
+        """Sliders : les valeurs glissées depuis le dernier tick, appliquées en une passe."""
+        self.controls_panel.flush_changes()
+        if self.controls_list is not None:
+            self.controls_list.flush_changes()
 
     def _drain_events(self):
-        try:
-            while True:
-                etype, payload = self.event_queue.get_nowait()
-
-                if etype == "hello":
-                    self.state.connected = True
-                    self.state.last_hello_ts = self._now()
-
-                elif etype == "error":
-                    msg = payload.get("message", "")
-                    self.state.last_error = msg
-                    logger.error("OSC error: %s", msg)
-
-                elif etype == "fixture_color":
-                    fid = int(payload["id"])
-                    r = float(payload["r"]); g = float(payload["g"]); b = float(payload["b"])
-                    a = float(payload["a"]); w = float(payload["w"])
-                    fx = self.state.ensure_fixture(fid)
-                    fx.set_color(r, g, b, a, w)
-                    if self.state.selected_fixture == fid and self._view_mode == "color":
-                        self.controls_panel.load_from_fixture(fid, fx)
-
-                elif etype == "fixture_dimmer":
-                    fid = int(payload["id"])
-                    val = float(payload["value"])
-                    fx = self.state.ensure_fixture(fid)
-                    fx.set_dimmer(val)
-                    if self.state.selected_fixture == fid and self._view_mode == "color":
-                        self.controls_panel.load_from_fixture(fid, fx)
-
-                elif etype == "fixture_strobe":
-                    fid = int(payload["id"])
-                    rate = float(payload["rate"])
-                    fx = self.state.ensure_fixture(fid)
-                    fx.set_strobe(rate)
-                    if self.state.selected_fixture == fid and self._view_mode == "color":
-                        self.controls_panel.load_from_fixture(fid, fx)
-
-                elif etype == "frame":
-                    for item in payload.get("fixtures", []):
-                        fid = int(item["id"])
-                        fx = self.state.ensure_fixture(fid)
-                        fx.set_color(float(item["r"]), float(item["g"]), float(item["b"]), float(item["a"]), float(item["w"]))
-                        fx.set_dimmer(float(item["dimmer"]))
-                        fx.set_strobe(float(item["strobe"]))
-                        if self.state.selected_fixture == fid and self._view_mode == "color":
-                            self.controls_panel.load_from_fixture(fid, fx)
-
-                self.state.on_msg_received()
-        except queue.Empty:
-            pass
+        self.engine.drain_events(on_fixture_changed=self._on_fixture_changed)
+
+    def _on_fixture_changed(self, fid: int, fx):
+        if self.state.selected_fixture == fid:
+            self._panel_dirty = True
+
+    def _refresh_controls_panel(self):
+        """Recharge le panneau sliders au plus une fois par tick (sélection entière)."""
+        if not self._panel_dirty or self._view_mode != "color":
+            return
+        self._panel_dirty = False
+        fid = self.state.selected_fixture
+        if fid is None or fid not in self.state.fixtures:
+            self.controls_panel.set_selected_id(None)
+            return
+        self.controls_panel.load_from_fixture(fid, self.state.fixtures[fid], count=len(self.state.selection))
 
     # ----------------------------------------------------------------------
     # Construction d'un /frame
     # ----------------------------------------------------------------------
     def _build_frame_from_state(self):
-        import time as _t
-        t = _t.perf_counter()
-        flat = []
-        for fid in sorted(self.state.fixtures.keys()):
-            fx = self.state.fixtures[fid]
-            flat.extend([
-                int(fid),
-                float(fx.r), float(fx.g), float(fx.b), float(fx.a), float(fx.w),
-                float(fx.dimmer), float(fx.strobe),
-            ])
-        return t, flat
+        return self.engine.build_frame()
 
     # ----------------------------------------------------------------------
     # Toolbar callbacks
     # ----------------------------------------------------------------------
     def on_mode_changed(self, mode: str):
-        mode = normalize_mode(mode)
-        if self.state.mode != mode:
-            self.state.mode = mode
-            try:
-                self.osc.send_mode(mode)
-            except Exception as e:
-                logger.exception("Failed to send mode: %s", e)
+        mode = self.engine.set_mode(mode)
         self.controls_panel.set_mode(mode)
 
     def on_send_test(self):
@@ -256,19 +266,14 @@ class MainWindow:
     def on_apply_fixture_count(self, count: int):
         # Ajuste l'état à 'count' fixtures
         self._ensure_fixture_count(count)
-        # MàJ interface
-        if self._view_mode == "color" and self.state.selected_fixture:
-            # Relire sliders de la fixture sélectionnée si elle existe toujours
-            if self.state.selected_fixture in self.state.fixtures:
-                fx = self.state.ensure_fixture(self.state.selected_fixture)
-                self.controls_panel.load_from_fixture(self.state.selected_fixture, fx)
-            else:
-                self.state.selected_fixture = None
-                self.controls_panel.set_selected_id(None)
+        # MàJ interface : retirer de la sélection les fixtures disparues
+        self.state.selection.discard_missing(self.state.fixtures)
+        self.history.forget_missing(self.state.fixtures)
+        self._panel_dirty = True
 
     def on_view_mode_changed(self, view_mode: str):
         vm = (view_mode or "color").lower()
-        if vm not in ("color","sliders"):
+        if vm not in VIEW_MODES:
             vm = "color"
         if vm == self._view_mode:
             return
@@ -276,39 +281,89 @@ class MainWindow:
         # Ajuster le layout
         if self._view_mode == "color":
             self._layout_color_mode()
+            self._panel_dirty = True
+        elif self._view_mode == "scope":
+            self._layout_scope_mode()
         else:
             self._layout_sliders_mode()
 
+    # ----------------------------------------------------------------------
+    # Masters
+    # ----------------------------------------------------------------------
+    def on_master_change(self, name: str, value: float):
+        self.engine.set_master(name, value)
+
+    # ----------------------------------------------------------------------
+    # Cues
+    # ----------------------------------------------------------------------
+    def on_cue_store(self, cue_id: int):
+        try:
+            self.cues.store(cue_id, self.state)
+            self.cues.save()
+            self.cues_view.set_cues(self.cues.cue_ids())
+            self.toolbar.set_status_text(f"Cue {cue_id} stored")
+        except Exception as e:
+            self.toolbar.set_status_text("Store failed")
+            logger.exception("Cue store failed: %s", e)
+
+    def on_cue_recall(self, cue_id: int):
+        if not self.engine.recall_cue(cue_id):
+            self.toolbar.set_status_text(f"Cue {cue_id} not found")
+            return
+        self._panel_dirty = True
+        self.toolbar.set_status_text(f"Cue {cue_id} recalled")
+
     # ----------------------------------------------------------------------
     # Sélection & sliders callbacks
     # ----------------------------------------------------------------------
     def on_fixture_select(self, fixture_id):
         if self._view_mode != "color":
             return  # en vue "sliders (toutes)", le clic sur la grille n'est pas utilisé
-        if fixture_id is None:
-            self.state.selected_fixture = None
-            self.controls_panel.set_selected_id(None)
-            try:
-                self.osc.send_select(-1)
-            except Exception as e:
-                logger.error("send_select(-1) failed: %s", e)
+        self.state.selected_fixture = None if fixture_id is None else int(fixture_id)
+        self._on_selection_changed()
+
+    def on_fixture_select_many(self, ids, mode: str):
+        if self._view_mode != "color":
+            return
+        sel = self.state.selection
+        if mode == "toggle":
+            for fid in ids:
+                sel.toggle(fid)
+        elif mode == "range":
+            sel.select_range(ids[0], self.fixtures_view.display_order())
+        elif mode == "add":
+            sel.add(ids)
         else:
-            self.state.selected_fixture = int(fixture_id)
-            self.controls_panel.set_selected_id(self.state.selected_fixture)
-            try:
-                self.osc.send_select(self.state.selected_fixture)
-            except Exception as e:
-                logger.error("send_select(%s) failed: %s", self.state.selected_fixture, e)
-            fx = self.state.ensure_fixture(self.state.selected_fixture)
-            self.controls_panel.load_from_fixture(self.state.selected_fixture, fx)
+            sel.set(ids)
+        self._on_selection_changed()
+
+    def on_selection_slot(self, slot: int, store: bool):
+        if store:
+            self.state.selection.store(slot)
+            self.toolbar.set_status_text(f"Selection {slot} stored")
+        elif self.state.selection.recall(slot):
+            self.state.selection.discard_missing(self.state.fixtures)
+            self._on_selection_changed()
+            self.toolbar.set_status_text(f"Selection {slot} recalled")
+
+    def _on_selection_changed(self):
+        sel = self.state.selection
+        self._panel_dirty = True
+        self._refresh_controls_panel()
+        try:
+            self.osc.send_select(-1 if sel.primary is None else sel.primary)
+            self.osc.send_selection(sel.ids)
+        except Exception as e:
+            logger.error("send_select(%s) failed: %s", sel.primary, e)
 
     def on_controls_change(self, name: str, value: float):
         if self._view_mode != "color":
             return
-        fid = self.state.selected_fixture
-        if fid is None:
+        ids = self.state.selection.ids
+        if not ids:
             return
-        self._apply_param_to_fixture(fid, name, value)
+        # Une seule écriture groupée pour toute la sélection
+        self.state.set_param(ids, name, max(0.0, min(1.0, float(value))))
 
     def on_controls_list_change(self, fid: int, name: str, value: float):
         if fid not in self.state.fixtures:
@@ -316,91 +371,28 @@ class MainWindow:
         self._apply_param_to_fixture(fid, name, value)
 
     def _apply_param_to_fixture(self, fid: int, name: str, value: float):
-        fx = self.state.ensure_fixture(fid)
-        v = max(0.0, min(1.0, float(value)))
-        if name == "r":   fx.r = v
-        elif name == "g": fx.g = v
-        elif name == "b": fx.b = v
-        elif name == "a": fx.a = v
-        elif name == "w": fx.w = v
-        elif name == "dimmer": fx.dimmer = v
-        elif name == "strobe": fx.strobe = v
-        # Si la fixture est sélectionnée en mode color, refléter sur le panneau
-        if self._view_mode == "color" and self.state.selected_fixture == fid:
-            self.controls_panel.load_from_fixture(fid, fx)
+        self.state.set_param((fid,), name, max(0.0, min(1.0, float(value))))
+        # Si la fixture est sélectionnée, le panneau sera rafraîchi au prochain tick
+        if self.state.selected_fixture == fid:
+            self._panel_dirty = True
 
     # ----------------------------------------------------------------------
     # Helpers
     # ----------------------------------------------------------------------
     def _ensure_fixture_count(self, count: int):
-        count = max(4, min(20, int(count)))
-        # Ajouter les manquantes
-        for fid in range(1, count + 1):
-            self.state.ensure_fixture(fid)
-        # Supprimer celles au-delà
-        to_remove = [fid for fid in self.state.fixtures.keys() if fid > count]
-        for fid in to_remove:
-            try:
-                del self.state.fixtures[fid]
-            except Exception:
-                pass
+        count = self.engine.ensure_fixture_count(count)
         # MàJ spin si besoin
         try:
             self.toolbar.set_fixture_count_value(count)
         except Exception:
             pass
 
-    def _load_io_config(self):
-        path = Path(__file__).resolve().parents[2] / "config" / "io.yml"
-        defaults = {"listen_port": 9000, "send_port": 9001, "remote_ip": "127.0.0.1"}
-        try:
-            if path.exists():
-                with path.open("r", encoding="utf-8") as f:
-                    data = yaml.safe_load(f) or {}
-                return {
-                    "listen_port": int(data.get("listen_port", defaults["listen_port"])),
-                    "send_port": int(data.get("send_port", defaults["send_port"])),
-                    "remote_ip": str(data.get("remote_ip", defaults["remote_ip"])),
-                    "max_rate_hz": int(data.get("max_rate_hz", 60)),
-                }
-            else:
-                return defaults
-        except Exception:
-            return defaults
-
-    def _load_fixtures_config(self):
-        path = Path(__file__).resolve().parents[2] / "config" / "fixtures.yml"
-        defaults = {
-            "count": 4,
-            "defaults": {"color": [0, 0, 0, 0, 0], "dimmer": 0.0, "strobe": 0.0},
-        }
-        try:
-            if path.exists():
-                with path.open("r", encoding="utf-8") as f:
-                    data = yaml.safe_load(f) or {}
-                fx = data.get("fixtures", {}) or {}
-                return {
-                    "count": int(fx.get("count", defaults["count"])),
-                    "defaults": fx.get("defaults", defaults["defaults"]) or defaults["defaults"],
-                }
-            else:
-                return defaults
-        except Exception:
-            return defaults
-
-    def _now(self):
-        import time
-        return time.monotonic()
-
     def on_close(self):
         try:
             self.scheduler.stop()
         except Exception:
             pass
-        try:
-            self.osc.stop()
-        except Exception:
-            pass
+        self.engine.stop()
         self.root.destroy()
 
     def run(self):
@@ -0,0 +1,72 @@
+# fichier: src/ui/masters.py
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Iterable, Optional
+
+from core.masters import GRAND_MASTER
+
+
+class MastersPanel(ttk.Frame):
+    """
+    Faders verticaux : grand master + un master par groupe.
+    - on_change(name: str, value: float) est appelé à chaque mouvement
+    - set_groups(names) reconstruit les faders de groupes
+    """
+
+    def __init__(self, parent, on_change: Optional[Callable[[str, float], None]] = None):
+        super().__init__(parent, padding=10)
+        self._on_change = on_change
+        self._vars = {}     # name -> tk.DoubleVar
+        self._updating = False
+
+        ttk.Label(self, text="Masters", font=("Segoe UI", 10, "bold")).grid(
+            row=0, column=0, columnspan=2, sticky="w", pady=(0, 8)
+        )
+        self.rowconfigure(1, weight=1)
+        self.set_groups([])
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+    def set_groups(self, names: Iterable[str]) -> None:
+        for child in self.grid_slaves():
+            if int(child.grid_info().get("row", 0)) > 0:
+                child.destroy()
+        self._vars.clear()
+        for col, name in enumerate([GRAND_MASTER, *names]):
+            var = tk.DoubleVar(value=1.0)
+            self._vars[name] = var
+            # from_=1 en haut : fader "à la console"
+            ttk.Scale(
+                self, from_=1.0, to=0.0, orient=tk.VERTICAL, variable=var,
+                command=lambda _v, n=name: self._on_scale(n)
+            ).grid(row=1, column=col, sticky="ns", padx=4)
+            ttk.Label(self, text="GM" if name == GRAND_MASTER else name, width=6, anchor="center").grid(
+                row=2, column=col, pady=(4, 0)
+            )
+
+    def set_level(self, name: str, value: float) -> None:
+        var = self._vars.get(name)
+        if var is None:
+            return
+        self._updating = True
+        try:
+            var.set(max(0.0, min(1.0, float(value))))
+        finally:
+            self._updating = False
+
+    def sync(self, masters) -> None:
+        """Reflète les niveaux de core.masters.MasterSection (ex. changés via OSC)."""
+        for name, var in self._vars.items():
+            level = masters.level(name)
+            if abs(var.get() - level) > 1e-6:
+                self.set_level(name, level)
+
+    # ------------------------------------------------------------------
+    # Internes
+    # ------------------------------------------------------------------
+    def _on_scale(self, name: str):
+        if self._updating:
+            return
+        if self._on_change:
+            self._on_change(name, max(0.0, min(1.0, self._vars[name].get())))
@@ -0,0 +1,107 @@
+# fichier: src/ui/scope_view.py
+import tkinter as tk
+from tkinter import ttk
+from typing import Optional
+
+from core.state import CHANNELS
+
+SPANS_S = (5, 10, 30, 60)        # fenêtres proposées (secondes)
+MARGIN = 30                      # marge gauche (graduations) / haut / bas
+COLOR_BG = "#151515"
+COLOR_GRID = "#2a2a2a"
+COLOR_TEXT = "#888"
+CHANNEL_COLORS = {
+    "r": "#ff4040", "g": "#40ff40", "b": "#4040ff", "a": "#aaaaaa",
+    "w": "#ffffff", "dimmer": "#ffffff", "strobe": "#b36bff",
+}
+
+
+class ScopeView(ttk.Frame):
+    """
+    Oscilloscope d'un canal de fixture (core.history.ChannelHistory) :
+    - choix de la fixture, du canal et de la fenêtre de temps
+    - render(history, selected) est appelé depuis la boucle UI : décimation min/max
+      à la largeur du canvas, puis une seule polyligne mise à jour par coords()
+      (aucun item créé ni détruit par tick, coût proportionnel à la largeur)
+    """
+
+    def __init__(self, parent):
+        super().__init__(parent)
+
+        bar = ttk.Frame(self)
+        bar.pack(fill=tk.X, side=tk.TOP)
+        ttk.Label(bar, text="Fixture:").pack(side=tk.LEFT, padx=(8, 4), pady=6)
+        self.fixture_var = tk.StringVar(value="")
+        self.fixture_combo = ttk.Combobox(bar, textvariable=self.fixture_var, width=6, state="readonly")
+        self.fixture_combo.pack(side=tk.LEFT, padx=(0, 8))
+        ttk.Label(bar, text="Canal:").pack(side=tk.LEFT, padx=(8, 4))
+        self.channel_var = tk.StringVar(value="dimmer")
+        ttk.Combobox(bar, textvariable=self.channel_var, values=CHANNELS, width=8,
+                     state="readonly").pack(side=tk.LEFT, padx=(0, 8))
+        ttk.Label(bar, text="Fenêtre (s):").pack(side=tk.LEFT, padx=(8, 4))
+        self.span_var = tk.StringVar(value=str(SPANS_S[-1]))
+        ttk.Combobox(bar, textvariable=self.span_var, values=SPANS_S, width=4,
+                     state="readonly").pack(side=tk.LEFT, padx=(0, 8))
+        self.follow_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(bar, text="Suivre la sélection", variable=self.follow_var).pack(side=tk.LEFT, padx=8)
+
+        self.canvas = tk.Canvas(self, bg=COLOR_BG, highlightthickness=0)
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+        self._trace = None
+        self._size = (0, 0)
+        self._fixture_ids = []
+        self.canvas.bind("<Configure>", lambda _e: self._draw_grid())
+
+    # ----------------------------------------------------------------------
+    # Public API
+    # ----------------------------------------------------------------------
+    def render(self, history, selected: Optional[int] = None) -> None:
+        ids = history.fixture_ids()
+        if ids != self._fixture_ids:
+            self._fixture_ids = ids
+            self.fixture_combo.configure(values=ids)
+        if self.follow_var.get() and selected in ids:
+            self.fixture_var.set(str(selected))
+        elif self.fixture_var.get() not in {str(i) for i in ids}:
+            self.fixture_var.set(str(ids[0]) if ids else "")
+        if not self.fixture_var.get():
+            return
+
+        w, h = self._size
+        plot_w = w - 2 * MARGIN
+        plot_h = h - 2 * MARGIN
+        if plot_w < 2 or plot_h < 2:
+            return
+        channel = self.channel_var.get()
+        columns = history.minmax(int(self.fixture_var.get()), channel, plot_w, float(self.span_var.get()))
+
+        # Polyligne en zigzag min → max par colonne : un trait vertical par pixel
+        coords = []
+        y0 = MARGIN + plot_h
+        for x, mm in enumerate(columns, start=MARGIN):
+            if mm is None:
+                continue
+            lo, hi = mm
+            coords.extend((x, y0 - lo * plot_h, x, y0 - hi * plot_h))
+        if len(coords) < 4:
+            coords = [MARGIN, y0, MARGIN, y0]
+        self.canvas.coords(self._trace, *coords)
+        self.canvas.itemconfigure(self._trace, fill=CHANNEL_COLORS.get(channel, "#ffffff"))
+
+    # ----------------------------------------------------------------------
+    # Internes
+    # ----------------------------------------------------------------------
+    def _draw_grid(self) -> None:
+        """Fond (graduations 0 / 0.5 / 1) redessiné seulement au redimensionnement."""
+        w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
+        self._size = (w, h)
+        self.canvas.delete("all")
+        plot_h = h - 2 * MARGIN
+        for level in (0.0, 0.25, 0.5, 0.75, 1.0):
+            y = MARGIN + plot_h - level * plot_h
+            self.canvas.create_line(MARGIN, y, w - MARGIN, y, fill=COLOR_GRID)
+            if level in (0.0, 0.5, 1.0):
+                self.canvas.create_text(MARGIN - 4, y, text=f"{level:g}", fill=COLOR_TEXT, anchor="e",
+                                        font=("Segoe UI", 8))
+        self._trace = self.canvas.create_line(MARGIN, MARGIN + plot_h, MARGIN, MARGIN + plot_h,
+                                              fill=COLOR_GRID, width=1)
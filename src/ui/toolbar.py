@@ -4,12 +4,14 @@ from tkinter import ttk
 from typing import Optional, Callable
 from core.modes import READ
 
+VIEW_MODES = ("color", "sliders", "scope")
+
 class Toolbar(ttk.Frame):
     """
     Barre d'outils avec :
     - Mode READ/WRITE
     - Contrôle "Fixture count" (4..20) + bouton Apply
-    - Toggle d'affichage: "Color preview" / "All sliders"
+    - Toggle d'affichage: "Color preview" / "All sliders" / "Scope"
     - Bouton "Send test frame"
     - Indicateur de connexion + texte statut
 
@@ -17,7 +19,7 @@ class Toolbar(ttk.Frame):
       - on_mode_changed(mode:str)
       - on_send_test()
       - on_apply_fixture_count(count:int)
-      - on_view_mode_changed(view_mode:str)  # "color" | "sliders"
+      - on_view_mode_changed(view_mode:str)  # "color" | "sliders" | "scope"
     """
 
     def __init__(
@@ -54,10 +56,10 @@ class Toolbar(ttk.Frame):
         self.mode_combo.grid(row=0, column=1, padx=(0,8), pady=6, sticky="w")
         self.mode_combo.bind("<<ComboboxSelected>>", self._on_mode_combo)
 
-        # View mode (Color preview / All sliders)
+        # View mode (Color preview / All sliders / Scope)
         ttk.Label(self, text="View:").grid(row=0, column=2, padx=(8,4), pady=6, sticky="w")
         self.view_mode_var = tk.StringVar(value="color")
-        self.view_combo = ttk.Combobox(self, textvariable=self.view_mode_var, values=("color","sliders"), width=9, state="readonly")
+        self.view_combo = ttk.Combobox(self, textvariable=self.view_mode_var, values=VIEW_MODES, width=9, state="readonly")
         self.view_combo.grid(row=0, column=3, padx=(0,8), pady=6, sticky="w")
         self.view_combo.bind("<<ComboboxSelected>>", self._on_view_combo)
 
@@ -95,7 +97,7 @@ class Toolbar(ttk.Frame):
 
     def _on_view_combo(self, _evt=None):
         vm = (self.view_mode_var.get() or "").strip().lower()
-        if vm not in ("color","sliders"):
+        if vm not in VIEW_MODES:
             vm = "color"
             self.view_mode_var.set(vm)
         if self._on_view_mode_changed:
@@ -134,6 +136,6 @@ class Toolbar(ttk.Frame):
 
     def set_view_mode_value(self, mode: str):
         mode = (mode or "color").lower()
-        if mode not in ("color","sliders"):
+        if mode not in VIEW_MODES:
             mode = "color"
         self.view_mode_var.set(mode)
\ No newline at end of file
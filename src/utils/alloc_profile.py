@@ -0,0 +1,276 @@
+# fichier: src/utils/alloc_profile.py
+"""
+Profil d'allocations par phase de tick (optionnel : `python app.py --alloc-profile`).
+
+- tracemalloc : pour chaque phase (drain, render, output…), octets alloués
+  transitoirement (pic - départ) et retenus (fin - départ), moyenne et pire tick
+- gc.callbacks : nombre et durée des pauses GC par génération (0/1/2), et phase
+  pendant laquelle elles se déclenchent
+- un tick sur `sample_every`, chaque phase est échantillonnée : snapshot tracemalloc
+  à l'entrée, puis au pic de la phase (crochet sys.setprofile sur les retours de
+  fonction, nouveau snapshot quand la mémoire tracée dépasse le pic précédent) ;
+  l'écart pic - entrée est attribué aux lignes source et cumulé par phase. Les
+  allocations transitoires (dicts des handlers, tuples de file, listes de
+  build_frame…) apparaissent donc même si elles sont libérées avant la fin de phase
+- toutes les `report_s` secondes : rapport loggé, pires lignes par phase, et lignes
+  dont la mémoire vivante a le plus augmenté depuis le rapport précédent (fuites)
+
+Désactivé, phase() renvoie un contexte nul partagé : coût quasi nul dans la boucle.
+tracemalloc ralentit fortement l'app : les durées mesurées sous profil sont relatives.
+Les compteurs sont globaux au processus : une phase inclut aussi ce qu'allouent en
+parallèle les threads OSC (réception, envoi).
+"""
+
+import fnmatch
+import gc
+import sys
+import time
+import tracemalloc
+from contextlib import nullcontext
+from typing import Dict, List, Optional
+
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+_NULL = nullcontext()
+# Nouveau snapshot de pic seulement si la mémoire dépasse le précédent d'au moins
+# max(_PEAK_STEP, 1/8 du transitoire déjà vu) : quelques snapshots par phase échantillonnée
+_PEAK_STEP = 1024
+
+
+class _PhaseStats:
+    __slots__ = ("ticks", "sampled", "transient", "transient_max", "net", "net_max", "gc_pauses")
+
+    def __init__(self):
+        self.ticks = 0
+        self.sampled = 0        # ticks échantillonnés (hors moyennes : les snapshots les faussent)
+        self.transient = 0
+        self.transient_max = 0
+        self.net = 0
+        self.net_max = 0
+        self.gc_pauses = 0
+
+
+class _PeakSampler:
+    """
+    Snapshot tracemalloc au pic d'une phase : crochet sys.setprofile sur les retours de
+    fonction (les variables locales sont encore vivantes), nouveau snapshot à chaque
+    nouveau pic significatif. La mémoire des snapshots eux-mêmes est déduite.
+    """
+
+    __slots__ = ("base", "peak", "_start", "_best", "_overhead", "_previous")
+
+    def __init__(self):
+        self.base = None
+        self.peak = None
+
+    def start(self) -> None:
+        self.peak = None
+        self.base = AllocProfiler._take_snapshot()
+        self._start = self._best = tracemalloc.get_traced_memory()[0]
+        self._overhead = 0
+        self._previous = sys.getprofile()
+        sys.setprofile(self._hook)
+
+    def _hook(self, _frame, event, _arg):
+        if event != "return" and event != "c_return":
+            return
+        current = tracemalloc.get_traced_memory()[0] - self._overhead
+        if current < self._best + max(_PEAK_STEP, (self._best - self._start) >> 3):
+            return
+        sys.setprofile(None)
+        self.peak = None                                     # libère le snapshot précédent
+        before = tracemalloc.get_traced_memory()[0]
+        self.peak = AllocProfiler._take_snapshot()
+        self._overhead += tracemalloc.get_traced_memory()[0] - before
+        self._best = current
+        sys.setprofile(self._hook)
+
+    def stop(self) -> list:
+        """Écarts par ligne (pic - entrée), croissants seulement ; libère les snapshots."""
+        sys.setprofile(self._previous)
+        diffs = []
+        if self.peak is not None:
+            diffs = [d for d in self.peak.compare_to(self.base, "lineno") if d.size_diff > 0]
+        self.base = self.peak = None
+        return diffs
+
+
+class _Phase:
+    """Contexte réutilisable (pas de générateur : une allocation de moins par phase)."""
+
+    __slots__ = ("_prof", "_name", "_start", "_sampler")
+
+    def __init__(self, prof: "AllocProfiler", name: str):
+        self._prof = prof
+        self._name = name
+        self._start = 0
+        self._sampler: Optional[_PeakSampler] = None
+
+    def __enter__(self):
+        prof = self._prof
+        prof._current = self._name
+        st = prof._phases[self._name]
+        if prof.sample_every and (st.ticks + st.sampled) % prof.sample_every == 0:
+            self._sampler = prof._sampler
+            self._sampler.start()
+        tracemalloc.reset_peak()
+        self._start = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def __exit__(self, *_exc):
+        current, peak = tracemalloc.get_traced_memory()
+        st = self._prof._phases[self._name]
+        self._prof._current = None
+        if self._sampler is not None:
+            self._prof._add_peak_lines(self._name, self._sampler.stop())
+            self._sampler = None
+            st.sampled += 1
+            return False
+        st.ticks += 1
+        transient = peak - self._start
+        net = current - self._start
+        st.transient += transient
+        st.net += net
+        if transient > st.transient_max:
+            st.transient_max = transient
+        if net > st.net_max:
+            st.net_max = net
+        return False
+
+
+class AllocProfiler:
+    def __init__(self):
+        self.enabled = False
+        self.report_s = 10.0
+        self.top = 10
+        self.sample_every = 50
+        self._sampler = _PeakSampler()
+        self._lines: Dict[str, Dict[str, List[int]]] = {}   # phase -> "fichier:ligne" -> [octets, blocs]
+        self._phases: Dict[str, _PhaseStats] = {}
+        self._contexts: Dict[str, _Phase] = {}
+        self._current: Optional[str] = None
+        self._gc_t0 = 0.0
+        self._gc: Dict[int, List[float]] = {}       # génération -> [nb, total s, max s]
+        self._snapshot = None
+        self._last_report = 0.0
+
+    # ------------------------------------------------------------------
+    # Activation
+    # ------------------------------------------------------------------
+    def enable(self, nframes: int = 1, report_s: float = 10.0, top: int = 10, sample_every: int = 50) -> None:
+        """sample_every : un tick sur N par phase attribué aux lignes source (0 = jamais)."""
+        if self.enabled:
+            return
+        self.report_s = float(report_s)
+        self.top = int(top)
+        self.sample_every = max(0, int(sample_every))
+        tracemalloc.start(nframes)
+        gc.callbacks.append(self._on_gc)
+        self._snapshot = self._take_snapshot()
+        self._last_report = time.monotonic()
+        self.enabled = True
+        logger.info("Allocation profiler enabled (tracemalloc, report every %.0f s)", self.report_s)
+
+    def disable(self) -> None:
+        if not self.enabled:
+            return
+        self.enabled = False
+        try:
+            gc.callbacks.remove(self._on_gc)
+        except ValueError:
+            pass
+        tracemalloc.stop()
+
+    # ------------------------------------------------------------------
+    # Boucle
+    # ------------------------------------------------------------------
+    def phase(self, name: str):
+        if not self.enabled:
+            return _NULL
+        ctx = self._contexts.get(name)
+        if ctx is None:
+            ctx = self._contexts[name] = _Phase(self, name)
+            self._phases[name] = _PhaseStats()
+        return ctx
+
+    def end_tick(self) -> None:
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        if now - self._last_report >= self.report_s:
+            self._last_report = now
+            logger.info("Allocations:\n%s", self.report())
+
+    def _add_peak_lines(self, name: str, diffs: list) -> None:
+        lines = self._lines.setdefault(name, {})
+        for d in diffs:
+            frame = d.traceback[0]
+            acc = lines.setdefault(f"{frame.filename}:{frame.lineno}", [0, 0])
+            acc[0] += d.size_diff
+            acc[1] += d.count_diff
+
+    def _on_gc(self, phase: str, info: dict) -> None:
+        if phase == "start":
+            self._gc_t0 = time.perf_counter()
+            return
+        dt = time.perf_counter() - self._gc_t0
+        st = self._gc.setdefault(int(info.get("generation", 0)), [0, 0.0, 0.0])
+        st[0] += 1
+        st[1] += dt
+        if dt > st[2]:
+            st[2] = dt
+        if self._current is not None:
+            self._phases[self._current].gc_pauses += 1
+
+    # ------------------------------------------------------------------
+    # Rapport
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _take_snapshot():
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, fnmatch.__file__),          # filtrage des snapshots lui-même
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+
+    def report(self) -> str:
+        lines = ["phase        ticks   transient moy/max (o)   retenu moy/max (o)   GC"]
+        for name, st in self._phases.items():
+            n = max(1, st.ticks)
+            lines.append(
+                f"{name:<12} {st.ticks:>6}   {st.transient / n:>9.0f} / {st.transient_max:<9}"
+                f"   {st.net / n:>8.0f} / {st.net_max:<8}   {st.gc_pauses}"
+            )
+        for gen in sorted(self._gc):
+            count, total, worst = self._gc[gen]
+            lines.append(f"GC gen{gen}: {count} pauses, moy {total / count * 1000:.3f} ms, "
+                         f"max {worst * 1000:.3f} ms")
+
+        for name, per_line in self._lines.items():
+            n = max(1, self._phases[name].sampled)
+            lines.append(f"[{name}] top {self.top} lignes au pic de phase (moyenne sur {n} ticks échantillonnés) :")
+            ranked = sorted(per_line.items(), key=lambda item: item[1][0], reverse=True)
+            for where, (size, count) in ranked[:self.top]:
+                lines.append(f"  {where}  {size / n:.0f} o  {count / n:.0f} blocs")
+
+        snapshot = self._take_snapshot()
+        if self._snapshot is not None:
+            lines.append(f"Top {self.top} lignes (croissance de la mémoire vivante depuis le dernier rapport, fuites) :")
+            diffs = [d for d in snapshot.compare_to(self._snapshot, "lineno") if d.size_diff > 0]
+            for d in diffs[:self.top]:
+                frame = d.traceback[0]
+                lines.append(f"  {frame.filename}:{frame.lineno}  +{d.size_diff} o  +{d.count_diff} blocs")
+        self._snapshot = snapshot
+        return "\n".join(lines)
+
+    def dump(self) -> None:
+        if self.enabled:
+            logger.info("Allocations (final):\n%s", self.report())
+
+
+# Instance de processus (comme utils.startup) ; activée par app.py --alloc-profile
+alloc_profiler = AllocProfiler()
@@ -1,10 +1,26 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, Optional
 
 _configured = False
+_listener: Optional[logging.handlers.QueueListener] = None
+
+# Fenêtre d'agrégation des erreurs répétées (ErrorAggregator)
+ERROR_INTERVAL_S = 5.0
+
 
 def _configure_root_logger():
-    global _configured
+    """
+    Les appels de log ne font qu'empiler l'enregistrement (QueueHandler) ; le formatage et
+    l'écriture console se font dans le thread du QueueListener : une console lente ne
+    bloque ni le tick ni les threads OSC.
+    """
+    global _configured, _listener
     if _configured:
         return
     level_name = os.getenv('LOG_LEVEL', 'INFO').upper()
@@ -12,11 +28,54 @@ def _configure_root_logger():
     fmt = '%(asctime)s | %(levelname)s | %(name)s | %(message)s'
     handler = logging.StreamHandler()
     handler.setFormatter(logging.Formatter(fmt))
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(records, handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)          # vide la file avant la sortie
     root = logging.getLogger()
     root.setLevel(level)
-    root.addHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(records))
     _configured = True
 
+
 def get_logger(name: str) -> logging.Logger:
     _configure_root_logger()
-    return logging.getLogger(name)
\ No newline at end of file
+    return logging.getLogger(name)
+
+
+class ErrorAggregator:
+    """
+    Déduplication des erreurs répétées : la première occurrence d'une clé est émise
+    aussitôt, les suivantes sont seulement comptées, puis résumées une fois par
+    intervalle par flush() (« message (+N identiques en 5 s) »). Une rafale d'erreurs
+    coûte un verrou et un incrément par occurrence. Thread-safe.
+    """
+
+    def __init__(self, emit: Callable[[str, int], None], interval_s: float = ERROR_INTERVAL_S):
+        self._emit = emit                    # emit(message, occurrences)
+        self.interval_s = float(interval_s)
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._seen: Dict[str, list] = {}     # clé -> [dernier message, répétitions non émises]
+
+    def report(self, key: str, message: str) -> None:
+        with self._lock:
+            entry = self._seen.get(key)
+            if entry is not None:
+                entry[0] = message
+                entry[1] += 1
+                return
+            self._seen[key] = [message, 0]
+        self._emit(message, 1)
+
+    def flush(self, now: Optional[float] = None) -> None:
+        """À appeler régulièrement (ex. à chaque tick) : résume la fenêtre écoulée."""
+        now = time.monotonic() if now is None else now
+        if now - self._window_start < self.interval_s:
+            return
+        with self._lock:
+            seen, self._seen = self._seen, {}
+            self._window_start = now
+        for message, repeats in seen.values():
+            if repeats:
+                self._emit(f"{message} (+{repeats} identiques en {self.interval_s:g} s)", repeats)
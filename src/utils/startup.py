@@ -0,0 +1,43 @@
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class StartupTimer:
+    """
+    Chronométrage du démarrage par phase (imports, config, moteur, UI…)
+    jusqu'à la première frame ; le rapport est loggé une seule fois.
+    """
+
+    def __init__(self):
+        self._t0 = time.perf_counter()
+        self._phases: List[Tuple[str, float]] = []
+        self._first_frame_ms = None
+
+    @contextmanager
+    def phase(self, name: str):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._phases.append((name, (time.perf_counter() - t) * 1000.0))
+
+    def mark_first_frame(self) -> None:
+        if self._first_frame_ms is not None:
+            return
+        self._first_frame_ms = (time.perf_counter() - self._t0) * 1000.0
+        logger.info("Startup: %s", self.report())
+
+    def report(self) -> str:
+        parts = [f"{name} {ms:.1f} ms" for name, ms in self._phases]
+        if self._first_frame_ms is not None:
+            parts.append(f"first frame @ {self._first_frame_ms:.1f} ms")
+        return " | ".join(parts)
+
+
+# Instance de processus : créée au premier import (le plus tôt possible dans app.py)
+startup = StartupTimer()
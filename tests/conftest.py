@@ -0,0 +1,8 @@
+# fichier: tests/conftest.py
+# Comme app.py : src/ dans le chemin pour les imports "core.*", "io_.*", "utils.*"
+import sys
+from pathlib import Path
+
+src_path = Path(__file__).resolve().parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
@@ -0,0 +1,34 @@
+# fichier: tests/test_showfile.py
+from core.showfile import CueLibrary
+from core.state import AppState
+
+
+def _state(ids):
+    state = AppState()
+    for fid in ids:
+        state.ensure_fixture(fid).set_values([fid / 10.0] * 7)
+    return state
+
+
+def test_store_after_fixture_count_change_keeps_saved_cues(tmp_path):
+    path = tmp_path / "show.sbsh"
+    lib = CueLibrary(path).open()
+    state = _state([1, 2])
+    lib.store(1, state)
+    lib.store(2, state)
+    lib.save()
+
+    # Le patch change : les cues déjà sur disque (mmap) sont ré-échantillonnées
+    state.ensure_fixture(5).set_values([0.5] * 7)
+    lib.store(3, state)
+    lib.save()
+
+    reopened = CueLibrary(path).open()
+    assert reopened.cue_ids() == [1, 2, 3]
+    assert reopened.fixture_ids == [1, 2, 5]
+    cue1 = list(reopened.recall(1))
+    assert all(abs(v - 0.1) < 1e-6 for v in cue1[:7])
+    assert cue1[14:] == [0.0] * 7                     # fixture 5 absente de la cue 1
+    assert all(abs(v - 0.5) < 1e-6 for v in list(reopened.recall(3))[14:])
+    reopened.close()
+    lib.close()